@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+"""Scanning throughput of the Kotlin analyzer.
+
+Generates a synthetic Kotlin file of validator classes (guards, predicates,
+``require`` calls, throwing ``if`` blocks, ``val`` assignments, strings and
+comments) and reports the best of several runs for tokenizing, building the
+function index, and the full rule extraction.
+
+Run from the repository root::
+
+    python -m benchmarks.kotlin_scan --lines 100000
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from src.analyzers.kotlin_analyzer import _parse_functions, analyze_kotlin_file
+from src.analyzers.kotlin_lexer import tokenize
+from src.source_files import SourceBuffer
+
+
+def build_source(lines: int) -> str:
+    """Validator classes repeated until the file has at least ``lines`` lines."""
+
+    out = ["package com.example.validation", ""]
+    index = 0
+    while len(out) < lines:
+        out += [
+            f"class Validator{index}(private val config: Config) {{",
+            f"    fun validate(request: Request{index}) {{",
+            "        // Guarded channel check.",
+            f"        if (shouldValidate{index}(request.channel)) {{",
+            f"            validateChannel(request.target, request.medium)",
+            "        }",
+            f'        require(request.id.isNotBlank()) {{ "id is required for {index}" }}',
+            "    }",
+            "",
+            f"    private fun shouldValidate{index}(channel: Channel): Boolean =",
+            '        config.region(channel.siteId) == "wr" && config.enabled',
+            "",
+            "    fun validateChannel(target: String, medium: String) {",
+            "        val key = target.lowercase()",
+            "        val allowed = config.mediums[key] ?: emptySet()",
+            "        /* Mediums are matched case-insensitively. */",
+            "        if (medium.uppercase() !in allowed) {",
+            '            throw IllegalArgumentException("Invalid medium ${medium} for $target")',
+            "        }",
+            "        when (medium) {",
+            '            "sms" -> if (target.length > 15) throw IllegalStateException("too long")',
+            "            else -> log(medium)",
+            "        }",
+            "    }",
+            "}",
+            "",
+        ]
+        index += 1
+    return "\n".join(out) + "\n"
+
+
+def best_of(repeat: int, action: Callable[[], object]) -> float:
+    timings: List[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        action()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Scanning throughput of the Kotlin analyzer.")
+    parser.add_argument("--lines", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "Validators.kt"
+        path.write_text(build_source(args.lines))
+        with SourceBuffer(path) as lines:
+            text = lines.text()
+            line_count = len(lines)
+
+            def run_tokenize() -> None:
+                for _ in tokenize(text, runs=True):
+                    pass
+
+            tokens = sum(1 for _ in tokenize(text, runs=True))
+            tokenize_time = best_of(args.repeat, run_tokenize)
+            parse_time = best_of(args.repeat, lambda: _parse_functions(lines))
+        analyze_time = best_of(args.repeat, lambda: analyze_kotlin_file(path))
+        rules = len(analyze_kotlin_file(path))
+
+    print(f"source:             {line_count:8d} lines, {tokens} tokens")
+    print(f"tokenize:           {tokenize_time:8.3f} s ({line_count / tokenize_time:,.0f} lines/s)")
+    print(f"function index:     {parse_time:8.3f} s")
+    print(f"rule extraction:    {analyze_time:8.3f} s ({rules} rules)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+"""Memory footprint of parsed OpenAPI trees.
+
+Generates a synthetic specification, parses it with the selected backend and
+reports, via :mod:`tracemalloc`, the peak allocation during the parse and the
+size of the resulting tree. For comparison the tree is copied into the
+previous layout (a ``__dict__``-backed node per value and a separate string
+object per key and scalar) and measured the same way.
+
+Run from the repository root::
+
+    python -m benchmarks.openapi_tree_memory --endpoints 2000
+"""
+
+import argparse
+import gc
+import tempfile
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.analyzers.yaml_parser import YAML_PARSERS, YamlNode, parse_yaml_lines
+from src.source_files import SourceBuffer
+
+
+@dataclass
+class _DictNode:
+    value: object
+    start_line: int
+    end_line: int
+
+
+def build_spec(endpoints: int) -> str:
+    """A spec with one path, request schema and response schema per endpoint."""
+
+    lines = ["openapi: 3.0.0", "info:", "  title: Synthetic", "  version: 1.0.0", "paths:"]
+    for index in range(endpoints):
+        lines += [
+            f"  /items/{index}:",
+            "    post:",
+            "      requestBody:",
+            "        required: true",
+            "        content:",
+            "          application/json:",
+            "            schema:",
+            f"              $ref: '#/components/schemas/Item{index}'",
+            "      responses:",
+            "        '200':",
+            "          description: OK",
+            "          content:",
+            "            application/json:",
+            "              schema:",
+            f"                $ref: '#/components/schemas/Item{index}'",
+        ]
+    lines += ["components:", "  schemas:"]
+    for index in range(endpoints):
+        lines += [
+            f"    Item{index}:",
+            "      type: object",
+            "      required: [ id, name ]",
+            "      properties:",
+            "        id:",
+            "          type: string",
+            "          format: uuid",
+            "        name:",
+            "          type: string",
+            "          maxLength: 64",
+            "        status:",
+            "          type: string",
+            "          enum: [ active, inactive ]",
+            "        tags:",
+            "          type: array",
+            "          items:",
+            "            type: string",
+        ]
+    return "\n".join(lines) + "\n"
+
+
+def _copy_string(text: str) -> str:
+    return "".join([text[:1], text[1:]]) if len(text) > 1 else text
+
+
+def to_dict_nodes(node: YamlNode) -> _DictNode:
+    """Copy ``node`` into unslotted nodes with private key and scalar strings."""
+
+    value = node.value
+    if isinstance(value, dict):
+        value = {_copy_string(key): to_dict_nodes(child) for key, child in value.items()}
+    elif isinstance(value, list):
+        value = [to_dict_nodes(item) if isinstance(item, YamlNode) else item for item in value]
+    elif isinstance(value, str):
+        value = _copy_string(value)
+    return _DictNode(value, node.start_line, node.end_line)
+
+
+def measure(path: Path, parser: str) -> dict:
+    with SourceBuffer(path) as lines:
+        len(lines)  # Build the line index outside the measurement.
+        tracemalloc.start()
+        tree = parse_yaml_lines(lines, parser)
+        parse_peak = tracemalloc.get_traced_memory()[1]
+        gc.collect()  # Drop the backend's intermediate objects before sizing the tree.
+        tree_size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        legacy = to_dict_nodes(tree)
+        legacy_size = tracemalloc.get_traced_memory()[0] - tree_size
+        tracemalloc.stop()
+    del tree, legacy
+    return {"parse_peak": parse_peak, "tree": tree_size, "legacy_tree": legacy_size}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Memory footprint of parsed OpenAPI trees.")
+    parser.add_argument("--endpoints", type=int, default=2000)
+    parser.add_argument("--yaml-parser", choices=YAML_PARSERS, default="builtin")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "spec.yml"
+        path.write_text(build_spec(args.endpoints))
+        size = path.stat().st_size
+        result = measure(path, args.yaml_parser)
+
+    mib = 1024 * 1024
+    print(f"spec size:          {size / mib:8.1f} MiB ({args.endpoints} endpoints)")
+    print(f"parse peak:         {result['parse_peak'] / mib:8.1f} MiB")
+    print(f"compact tree:       {result['tree'] / mib:8.1f} MiB")
+    print(f"dict-node tree:     {result['legacy_tree'] / mib:8.1f} MiB")
+    print(f"reduction:          {1 - result['tree'] / result['legacy_tree']:8.0%}")
+
+
+if __name__ == "__main__":
+    main()
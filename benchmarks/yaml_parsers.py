@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+"""Parse time of the YAML backends.
+
+Parses the synthetic specification of :mod:`benchmarks.openapi_tree_memory`
+with every backend in :data:`~src.analyzers.yaml_parser.YAML_PARSERS` and
+reports the best of several runs. The ``ruamel`` row is skipped when
+ruamel.yaml is not installed.
+
+Run from the repository root::
+
+    python -m benchmarks.yaml_parsers --endpoints 2000
+"""
+
+import argparse
+import importlib.util
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from benchmarks.openapi_tree_memory import build_spec
+from src.analyzers.yaml_parser import YAML_PARSERS, parse_yaml_lines
+from src.source_files import SourceBuffer
+
+
+def best_of(repeat: int, action: Callable[[], object]) -> float:
+    timings: List[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        action()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Parse time of the YAML backends.")
+    parser.add_argument("--endpoints", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "spec.yml"
+        path.write_text(build_spec(args.endpoints))
+        with SourceBuffer(path) as lines:
+            print(f"spec:               {len(lines):8d} lines ({args.endpoints} endpoints)")
+            for backend in YAML_PARSERS:
+                if backend == "ruamel" and importlib.util.find_spec("ruamel") is None:
+                    print(f"{backend + ':':20s}  not installed")
+                    continue
+                elapsed = best_of(args.repeat, lambda: parse_yaml_lines(lines, backend))
+                print(f"{backend + ':':20s}{elapsed:8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
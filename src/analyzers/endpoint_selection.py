@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+"""Selection of OpenAPI endpoints by path pattern and HTTP method."""
+
+import re
+from dataclasses import dataclass, field
+from fnmatch import translate
+from typing import Iterable, Optional, Pattern, Tuple
+
+
+HTTP_METHODS = ("get", "post", "put", "delete", "patch")
+
+# Path patterns are globs unless they carry this prefix.
+REGEX_PREFIX = "re:"
+
+
+@dataclass(frozen=True)
+class EndpointSelector:
+    """Choose which endpoints of an OpenAPI document are analyzed.
+
+    ``paths`` holds glob patterns such as ``/orders/*`` or, prefixed with
+    ``re:``, regular expressions matched against the whole path. ``methods``
+    lists HTTP methods. An empty tuple selects everything.
+    """
+
+    paths: Tuple[str, ...] = ()
+    methods: Tuple[str, ...] = ()
+    _path_regex: Optional[Pattern[str]] = field(
+        init=False, default=None, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_path_regex", _compile_path_patterns(self.paths))
+
+    @classmethod
+    def build(
+        cls, paths: Optional[Iterable[str]] = None, methods: Optional[Iterable[str]] = None
+    ) -> Optional["EndpointSelector"]:
+        """Return a selector, or ``None`` when nothing is filtered.
+
+        Raises ``ValueError`` for unknown methods or invalid regular expressions.
+        """
+
+        path_patterns = tuple(pattern for pattern in paths or () if pattern)
+        method_names = tuple(method.strip().lower() for method in methods or () if method.strip())
+        unknown = [method for method in method_names if method not in HTTP_METHODS]
+        if unknown:
+            raise ValueError(f"Unsupported HTTP method filter: {', '.join(unknown)}")
+        if not path_patterns and not method_names:
+            return None
+        return cls(path_patterns, method_names)
+
+    def matches_path(self, path: str) -> bool:
+        return self._path_regex is None or self._path_regex.fullmatch(path) is not None
+
+    def matches_method(self, method: str) -> bool:
+        return not self.methods or method.lower() in self.methods
+
+
+def _compile_path_patterns(patterns: Tuple[str, ...]) -> Optional[Pattern[str]]:
+    """Compile all path patterns into a single alternation."""
+
+    if not patterns:
+        return None
+    parts = []
+    for pattern in patterns:
+        if pattern.startswith(REGEX_PREFIX):
+            parts.append(f"(?:{pattern[len(REGEX_PREFIX):]})")
+        else:
+            parts.append(translate(pattern))
+    try:
+        return re.compile("|".join(parts))
+    except re.error as exc:
+        raise ValueError(f"Invalid endpoint path pattern: {exc}") from exc
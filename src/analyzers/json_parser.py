@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+"""JSON front end for the OpenAPI analyzer.
+
+JSON documents are decoded by the C decoder of the :mod:`json` module. A line
+map, the line of every token in document order, is built next to it, and a
+single walk over the decoded values pairs them with their lines to produce the
+same :class:`~src.analyzers.yaml_parser.YamlNode` trees as YAML input. As in
+the YAML parsers, a mapping value starts on the line of its key; containers
+end on the line of their closing bracket.
+"""
+
+import json
+import re
+from array import array
+from itertools import chain, count, repeat
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from src.analyzers.yaml_parser import YamlNode, YamlParseError, intern_scalar
+
+
+class JsonParseError(YamlParseError):
+    """Raised when a JSON document is malformed."""
+
+
+class _Pairs:
+    """The key/value pairs of a decoded object, repeated keys included."""
+
+    __slots__ = ("pairs",)
+
+    def __init__(self, pairs: List[Tuple[str, object]]) -> None:
+        self.pairs = pairs
+
+    def items(self) -> List[Tuple[str, object]]:
+        return self.pairs
+
+
+def _reject_constant(name: str) -> None:
+    raise JsonParseError(f"Invalid JSON literal {name!r}")
+
+
+# Numbers are kept as their source text, like YAML scalars. Objects decode to
+# dicts; only a document with repeated keys is decoded again with every pair
+# kept, so that each key still lines up with its token.
+_DECODER = json.JSONDecoder(parse_float=str, parse_int=str, parse_constant=_reject_constant)
+_PAIRS_DECODER = json.JSONDecoder(
+    object_pairs_hook=_Pairs, parse_float=str, parse_int=str, parse_constant=_reject_constant
+)
+_CONTAINERS = (dict, list, _Pairs)
+
+# Once strings are collapsed and blanks dropped, each run of anything else
+# but line breaks, brackets, commas and quotes is one number or literal.
+_SCALAR = re.compile(r'[^\n{}\[\],"]+')
+_BLANKS = str.maketrans("", "", " \t\r:")
+_COMMAS = str.maketrans("", "", ",")
+_CHUNK_CHARS = 1 << 20
+
+# Example payloads are never inspected by the analyzer but are often most of
+# a generated spec, so they are kept as plain Python values. A key only holds
+# an example where it does not name a property, path or other entry, i.e.
+# where its parent mapping is not the value of one of these keys.
+_OPAQUE_KEYS = frozenset({"example", "examples"})
+_NAMED_ENTRIES = frozenset(
+    {
+        "$defs",
+        "callbacks",
+        "content",
+        "definitions",
+        "dependentSchemas",
+        "encoding",
+        "headers",
+        "links",
+        "mapping",
+        "parameters",
+        "paths",
+        "patternProperties",
+        "properties",
+        "requestBodies",
+        "responses",
+        "schemas",
+        "securitySchemes",
+        "variables",
+    }
+)
+
+
+def parse_json(text: str) -> YamlNode:
+    """Parse a JSON document into a ``YamlNode`` tree.
+
+    Numbers are kept as their source text, like YAML scalars. The values of
+    ``example`` and ``examples`` keys are plain Python values rather than
+    nested nodes, unless the key names a property, path or other entry.
+    """
+
+    if not text.strip():
+        raise JsonParseError("Empty JSON content")
+    lines = _token_lines(text)
+    # Only the walk holds the decoded values, so they can be released early.
+    root, used = _build(_decode(text, _DECODER), lines)
+    if used != len(lines):
+        # A repeated key collapsed into one dict entry and left tokens unused.
+        root, used = _build(_decode(text, _PAIRS_DECODER), lines)
+    return root
+
+
+def _decode(text: str, decoder: json.JSONDecoder) -> object:
+    try:
+        return decoder.decode(text)
+    except json.JSONDecodeError as exc:
+        if exc.pos >= len(text.rstrip()):
+            raise JsonParseError(f"Unterminated JSON content at line {exc.lineno}") from exc
+        raise JsonParseError(f"Invalid JSON at line {exc.lineno}: {exc.msg}") from exc
+    except RecursionError as exc:
+        raise JsonParseError("JSON document is nested too deeply") from exc
+
+
+def _token_lines(text: str) -> Sequence[int]:
+    """Return the line of every token but ``:`` and ``,`` of a valid document.
+
+    Escapes are dropped and every string is collapsed to a single quote, which
+    leaves only brackets, quotes and runs of numbers and literals; each run
+    then becomes one character. The length of each remaining line is its token
+    count, so no Python code runs per token. Strings never span lines, so the
+    text is processed in chunks that end on a line break.
+    """
+
+    lines = array("q")
+    line = 1
+    start = 0
+    while start < len(text):
+        end = text.find("\n", start + _CHUNK_CHARS) + 1
+        if end == 0:
+            end = len(text)
+        chunk = text[start:end]
+        if "\\" in chunk:
+            chunk = chunk.replace("\\\\", "").replace('\\"', "")
+        outside = '"'.join(chunk.split('"')[::2]).translate(_BLANKS)
+        marks = _SCALAR.sub("x", outside).translate(_COMMAS).split("\n")
+        if end < len(text):
+            # The chunk ends on a line break; the next line starts the next chunk.
+            marks.pop()
+        lines.extend(chain.from_iterable(map(repeat, count(line), map(len, marks))))
+        line += len(marks)
+        start = end
+    return lines
+
+
+def _build(value: object, lines: Sequence[int]) -> Tuple[YamlNode, int]:
+    """Pair decoded values with their token lines.
+
+    Returns the root node and the number of tokens used.
+    """
+
+    line = lines[0]
+    if not isinstance(value, _CONTAINERS):
+        return YamlNode(_scalar(value), line, line), 1
+
+    root = node = YamlNode(None, line, line)
+    # Open containers as (node, remaining items, key of the node, decoded
+    # value). Decoded dicts drop each nested container once it is walked, so
+    # the decoded document is released while its nodes are built.
+    stack: List[Tuple[YamlNode, Iterator, Optional[str], object]] = []
+    key: Optional[str] = None
+    index = 1
+
+    while True:
+        if type(value) is list:
+            node.value = []
+            stack.append((node, iter(value), key, value))
+        else:
+            node.value = {}
+            stack.append((node, iter(value.items()), key, value))
+        while stack:
+            parent, items, parent_key, source = stack[-1]
+            children = parent.value
+            if type(children) is dict:
+                opaque = parent_key not in _NAMED_ENTRIES
+                for key, value in items:
+                    key = intern_scalar(key)
+                    line = lines[index]
+                    if opaque and key in _OPAQUE_KEYS:
+                        value, tokens = _plain(value)
+                        children[key] = YamlNode(value, line, lines[index + tokens])
+                        index += tokens + 1
+                    elif isinstance(value, _CONTAINERS):
+                        if type(source) is dict:
+                            source[key] = None  # still referenced by ``value``
+                        node = children[key] = YamlNode(None, line, line)
+                        index += 2
+                        break
+                    else:
+                        children[key] = YamlNode(_scalar(value), line, lines[index + 1])
+                        index += 2
+                else:
+                    parent.end_line = lines[index]
+                    index += 1
+                    stack.pop()
+                    continue
+            else:
+                for value in items:
+                    line = lines[index]
+                    index += 1
+                    if isinstance(value, _CONTAINERS):
+                        node = YamlNode(None, line, line)
+                        children.append(node)
+                        key = None
+                        break
+                    children.append(YamlNode(_scalar(value), line, line))
+                else:
+                    parent.end_line = lines[index]
+                    index += 1
+                    stack.pop()
+                    continue
+            break
+        else:
+            return root, index
+
+
+def _scalar(value: object) -> object:
+    return intern_scalar(value) if type(value) is str else value
+
+
+def _plain(value: object) -> Tuple[object, int]:
+    """Return a decoded value as plain Python values and its token count."""
+
+    if type(value) is list:
+        items = []
+        tokens = 2
+        for item in value:
+            item, item_tokens = _plain(item)
+            items.append(item)
+            tokens += item_tokens
+        return items, tokens
+    if isinstance(value, _CONTAINERS):
+        entries = {}
+        tokens = 2
+        for key, item in value.items():
+            entries[key], item_tokens = _plain(item)
+            tokens += item_tokens + 1
+        return entries, tokens
+    return value, 1
@@ -1,291 +1,1061 @@
 from __future__ import annotations
 
+import logging
+import mmap
+import multiprocessing
+import os
 import re
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 from ..description import describe_kotlin_if_throw, describe_kotlin_require
 from ..models import Rule, SourceType
+from ..source_files import SourceBuffer, TextLines
+from .kotlin_lexer import (
+    CLOSE_BRACKETS,
+    CONDITION,
+    IDENT,
+    OPEN_BRACKETS,
+    RUN,
+    STRING,
+    SYMBOL,
+    Token,
+    split_run,
+    tokenize,
+)
+from .kotlin_symbols import SymbolIndex, SymbolKey
 
 
-@dataclass
+@dataclass(eq=False)
+class Block:
+    """A node of a function's block tree.
+
+    ``kind`` is ``function`` for the root; ``if``, ``else`` and ``when``
+    blocks nest below it, and ``require(...)`` calls are leaves whose body is
+    their message lambda. ``condition`` is the parenthesized condition (or
+    ``when`` subject) with comments dropped and whitespace collapsed,
+    ``predicate`` the first ``should*`` identifier in it, and ``end_line`` is
+    the last line of the body.
+
+    The remaining fields summarize the body, including nested blocks: its
+    first string literal, its first function call and the number of
+    arguments passed to it, whether it throws and the exception type of its
+    first ``throw``.
+    """
+
+    kind: str
+    line: int
+    end_line: int
+    condition: str = ""
+    predicate: Optional[str] = None
+    children: List[Block] = field(default_factory=list)
+    message: Optional[str] = None
+    first_call: Optional[str] = None
+    first_call_arity: Optional[int] = None
+    throws: bool = False
+    exception: Optional[str] = None
+
+    def walk(self) -> Iterator[Block]:
+        """This block and all blocks below it, in source order."""
+
+        pending = [self]
+        while pending:
+            block = pending.pop()
+            yield block
+            pending.extend(reversed(block.children))
+
+
+@dataclass(eq=False)
 class FunctionInfo:
     name: str
     start_line: int
     header_end_line: int
     end_line: int
-    lines: List[str]
+    # A view of the function's lines; each line is sliced from the shared
+    # source text only when read.
+    lines: Sequence[str]
+    # The body of an expression function (``fun f() = ...``).
+    expression: Optional[str] = None
+    body: Optional[Block] = None
+    # The enclosing class, dotted for nested classes; ``None`` at top level.
+    owner: Optional[str] = None
+    arity: int = 0
 
+    @property
+    def key(self) -> SymbolKey:
+        return (self.owner, self.name, self.arity)
 
-_FUN_DEF_RE = re.compile(r"\s*(?:[A-Za-z]+\s+)*fun\s+(?P<name>[A-Za-z_][A-Za-z0-9_]*)\s*\(")
-_IF_RE = re.compile(r"if\s*\((?P<condition>.*)\)")
-_REQUIRE_RE = re.compile(r"require\s*\((?P<condition>.*?)\)\s*")
-_THROW_RE = re.compile(r"throw\s+(?P<exception>[A-Za-z0-9_.]+)")
+    def blocks(self) -> Iterator[Block]:
+        return self.body.walk() if self.body is not None else iter(())
 
 
 class KotlinAnalyzerError(RuntimeError):
     """Raised when the Kotlin analyzer cannot proceed."""
 
 
-def analyze_kotlin_file(path: str | Path) -> List[Rule]:
+# Byte sequences without which a file cannot produce a rule: ``require``
+# calls, ``throw`` statements and ``should*`` guard predicates.
+_TRIGGERS = (b"require", b"throw", b"should")
+
+
+def analyze_kotlin_file(path: str | Path, *, logger: logging.Logger | None = None) -> List[Rule]:
+    return list(iter_kotlin_rules(path, logger=logger))
+
+
+def iter_kotlin_rules(path: str | Path, *, logger: logging.Logger | None = None) -> Iterator[Rule]:
+    """Yield the rules of a Kotlin file function by function.
+
+    A file whose raw bytes contain none of ``require``, ``throw`` or
+    ``should`` is skipped without being decoded, and the skip is logged for
+    the run summary.
+
+    Functions are analyzed as the scanner closes them and their block trees
+    are dropped once their rules are out, so memory beyond the source text
+    is bounded by the functions' signatures and the guard tables. A guard
+    whose called function is declared further down is held back, together
+    with the rules after it, until that function is seen or the class
+    around the guard closes, so rules keep the order and IDs of a batch run.
+
+    Rules are not changed once yielded. A throw rule depends on the guards
+    calling its function that were resolved before it was yielded, which
+    includes every guard in its own class; see ``_RuleStream``.
+    """
+
     path = Path(path)
-    lines = path.read_text().splitlines()
-    functions = _parse_functions(lines)
-    predicate_bodies = _extract_predicates(functions)
+    with SourceBuffer(path) as lines:
+        if not _has_triggers(lines.data):
+            _log_skipped(logger or logging.getLogger("valid_builder"), 1)
+            return
+        text = lines.text()
+    stream = _RuleStream()
+    for func in _iter_functions(text):
+        yield from stream.add(func, path.name)
+    yield from stream.finish()
 
-    rules: List[Rule] = []
-    guard_dependencies: Dict[str, int] = {}
-    internal_id = 1
 
-    for func in sorted(functions.values(), key=lambda f: f.start_line):
-        internal_id += _collect_require_rules(
-            func, path.name, rules, internal_id
-        )
-        created, guard_dep = _collect_guard_rules(
-            func, path.name, predicate_bodies, functions, rules, internal_id
-        )
-        if created:
-            internal_id += created
-            guard_dependencies.update(guard_dep)
-            continue
+def analyze_kotlin_project(
+    roots: str | Path | Iterable[str | Path],
+    *,
+    jobs: int = 1,
+    logger: logging.Logger | None = None,
+) -> List[Rule]:
+    """Extract validation rules from every ``.kt`` file under ``roots``.
 
-        created = _collect_throw_rules(
-            func, path.name, rules, internal_id, guard_dependencies
-        )
-        internal_id += created
-
-    return rules
-
-
-def _parse_functions(lines: List[str]) -> Dict[str, FunctionInfo]:
-    functions: Dict[str, FunctionInfo] = {}
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-        match = _FUN_DEF_RE.match(line)
-        if not match:
-            i += 1
-            continue
-
-        name = match.group("name")
-        header_end = i
-        while header_end < len(lines):
-            current = lines[header_end]
-            if "{" in current or "=" in current:
-                break
-            header_end += 1
-        end_line = header_end
-        brace_balance = 0
-        if "{" in lines[header_end]:
-            brace_balance += lines[header_end].count("{")
-            brace_balance -= lines[header_end].count("}")
-            while brace_balance > 0 and end_line + 1 < len(lines):
-                end_line += 1
-                brace_balance += lines[end_line].count("{")
-                brace_balance -= lines[end_line].count("}")
-        functions[name] = FunctionInfo(
-            name=name,
-            start_line=i + 1,
-            header_end_line=header_end + 1,
-            end_line=end_line + 1,
-            lines=lines[i : end_line + 1],
-        )
-        i = end_line + 1
+    Each file is parsed exactly once; ``jobs`` greater than one parses files
+    in that many worker processes (``0`` uses every CPU). The functions of all
+    files form one project index, so guards resolve predicates and validator
+    functions declared in other files. A name is looked up in the caller's
+    own file first. Rules are numbered in file order and their source file is
+    the path relative to its root.
+
+    Files without ``require``, ``throw`` or ``should`` in their raw bytes are
+    skipped before decoding and counted in the log. Functions they declare
+    are not indexed, so a guard calling one keeps its own line range.
+    """
+
+    logger = logger or logging.getLogger("valid_builder")
+    if isinstance(roots, (str, Path)):
+        roots = [roots]
+    files = _find_kotlin_files(roots)
+    if not files:
+        raise KotlinAnalyzerError("No Kotlin files found under the given roots")
+    logger.info("Analyzing %d Kotlin files", len(files))
+    indexes = _parse_files([path for path, _ in files], jobs)
+    parsed = [
+        (source_file, functions)
+        for (_, source_file), functions in zip(files, indexes)
+        if functions is not None
+    ]
+    if len(parsed) < len(files):
+        _log_skipped(logger, len(files) - len(parsed))
+
+    project = SymbolIndex()
+    for _, functions in parsed:
+        project.update(functions)
+    collector = _RuleCollector()
+    for source_file, functions in parsed:
+        functions.parent = project
+        for func in functions:
+            collector.collect(func, source_file, functions)
+    return collector.finish()
+
+
+def _find_kotlin_files(roots: Iterable[str | Path]) -> List[Tuple[Path, str]]:
+    """Kotlin files under ``roots`` with their display names, without duplicates."""
+
+    files: List[Tuple[Path, str]] = []
+    seen = set()
+    for root in map(Path, roots):
+        if root.is_file():
+            found = [(root, root.name)]
+        elif root.is_dir():
+            found = sorted(
+                (path, path.relative_to(root).as_posix())
+                for path in root.rglob("*.kt")
+                if path.is_file()
+            )
+        else:
+            raise FileNotFoundError(root)
+        for path, name in found:
+            resolved = path.resolve()
+            if resolved not in seen:
+                seen.add(resolved)
+                files.append((path, name))
+    return files
+
+
+def _parse_files(paths: List[Path], jobs: int) -> List[Optional[SymbolIndex]]:
+    workers = min(jobs if jobs > 0 else os.cpu_count() or 1, len(paths))
+    if workers <= 1:
+        return [_parse_file(path) for path in paths]
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context()) as pool:
+        return list(pool.map(_parse_file, paths))
+
+
+def _pool_context() -> multiprocessing.context.BaseContext:
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+
+def _parse_file(path: Path) -> Optional[SymbolIndex]:
+    """The functions of ``path``, or ``None`` when it has no trigger bytes."""
+
+    with SourceBuffer(path) as lines:
+        if not _has_triggers(lines.data):
+            return None
+        return _parse_functions(lines)
+
+
+def _has_triggers(data: bytes | mmap.mmap) -> bool:
+    return any(data.find(trigger) != -1 for trigger in _TRIGGERS)
+
+
+def _log_skipped(logger: logging.Logger, count: int) -> None:
+    logger.info(
+        "Skipped %d Kotlin file(s) without require, throw or should* constructs",
+        count,
+        extra={"skipped_files": count},
+    )
+
+
+def _parse_functions(lines: Sequence[str]) -> SymbolIndex:
+    text = lines.text() if isinstance(lines, SourceBuffer) else "\n".join(lines)
+    functions = SymbolIndex()
+    for function in _iter_functions(text):
+        functions.add(function)
     return functions
 
 
-def _extract_predicates(functions: Dict[str, FunctionInfo]) -> Dict[str, str]:
-    predicates: Dict[str, str] = {}
-    for func in functions.values():
-        header_line = func.lines[0]
-        if "=" in header_line:
-            expression = header_line.split("=", 1)[1].strip()
-            predicates[func.name] = expression
-    return predicates
-
-
-def _collect_require_rules(
-    func: FunctionInfo,
-    source_file: str,
-    rules: List[Rule],
-    internal_id_start: int,
-) -> int:
-    created = 0
-    for offset, line in enumerate(func.lines):
-        if "require" not in line:
-            continue
-        condition = _extract_parenthesized_condition(line, "require")
-        if not condition:
-            continue
-        message = _extract_message([line])
-        rule = Rule(
-            internal_id=internal_id_start + created,
-            description=describe_kotlin_require(condition, message=message),
-            source_file=source_file,
-            start_line=func.start_line + offset,
-            end_line=func.start_line + offset,
-            source_type=SourceType.KOTLIN,
-        )
-        rules.append(rule)
-        created += 1
-    return created
-
-
-def _collect_guard_rules(
-    func: FunctionInfo,
-    source_file: str,
-    predicate_bodies: Dict[str, str],
-    functions: Dict[str, FunctionInfo],
-    rules: List[Rule],
-    internal_id: int,
-) -> Tuple[int, Dict[str, int]]:
-    guard_dependencies: Dict[str, int] = {}
-    for offset, line in enumerate(func.lines):
-        if "if" not in line:
-            continue
-        if_match = _IF_RE.search(line)
-        if not if_match:
-            continue
-        condition = if_match.group("condition").strip()
-        block_end = _find_block_end(func.lines, offset)
-        body_lines = func.lines[offset : block_end + 1]
-        called = _find_first_function_call(body_lines)
-        predicate_call = _find_predicate_name(condition)
-        if not called or not predicate_call:
-            continue
-
-        description = _describe_guard_rule(
-            condition,
-            predicate_call,
-            called,
-            predicate_bodies.get(predicate_call),
-        )
-        target_func = functions.get(called)
-        end_line = func.start_line + block_end
-        if target_func:
-            end_line = max(target_func.header_end_line - 1, end_line)
-        rule = Rule(
-            internal_id=internal_id,
-            description=description,
-            source_file=source_file,
-            start_line=func.start_line,
-            end_line=end_line,
-            source_type=SourceType.KOTLIN,
-        )
-        rules.append(rule)
-        guard_dependencies[called] = rule.internal_id
-        return 1, guard_dependencies
-    return 0, guard_dependencies
-
-
-def _collect_throw_rules(
-    func: FunctionInfo,
-    source_file: str,
-    rules: List[Rule],
-    internal_id: int,
-    guard_dependencies: Dict[str, int],
-) -> int:
-    assignments = _collect_assignments(func.lines)
-    created = 0
-    for offset, line in enumerate(func.lines):
-        if "if" not in line:
-            continue
-        if_match = _IF_RE.search(line)
-        if not if_match:
-            continue
-        condition = if_match.group("condition").strip()
-        block_end = _find_block_end(func.lines, offset)
-        body_lines = func.lines[offset : block_end + 1]
-        throw_line = _find_throw_line(body_lines)
-        if throw_line is None:
-            continue
-
-        description = _describe_throw_rule(
-            condition, body_lines, assignments, func.name
+def _iter_functions(text: str) -> Iterator[FunctionInfo]:
+    """Yield the functions of ``text`` as soon as the scanner closes them."""
+
+    parser = _StructureParser(TextLines(text))
+    feed = parser.feed
+    closed = parser.closed
+    for token in tokenize(text, runs=True):
+        feed(token)
+        if closed:
+            yield from closed
+            closed.clear()
+    parser.finish()
+    yield from closed
+
+
+# Keywords that start a new declaration; one at the start of a line ends a
+# function header that has no body.
+_DECLARATION_KEYWORDS = frozenset(
+    {
+        "fun", "val", "var", "class", "interface", "object", "typealias", "init",
+        "constructor", "companion", "private", "protected", "public", "internal",
+        "override", "open", "abstract", "final", "suspend", "inline", "data",
+        "enum", "sealed", "annotation", "lateinit", "const", "operator",
+    }
+)
+# Operators that continue an expression on the next line when they end a line
+# or, for the second set, start one.
+_TRAILING_OPERATORS = frozenset(
+    {
+        "=", "&&", "||", "+", "-", "*", "/", "%", ".", "?.", "?:", ",", "->",
+        "==", "!=", "===", "!==", "<", ">", "<=", ">=", ":", "::", "..", "!",
+    }
+)
+_LEADING_OPERATORS = frozenset({".", "?.", "?:", "&&", "||", "::", "->"})
+_MATCHING_BRACKETS = {")": "(", "}": "{", "]": "["}
+
+
+@dataclass(slots=True)
+class _Frame:
+    """An open bracket and what it delimits."""
+
+    bracket: str
+    role: Optional[str] = None
+    block: Optional[Block] = None
+    tokens: List[Token] = field(default_factory=list)
+    # For the arguments of a call: the blocks whose first call it is.
+    callers: List[Block] = field(default_factory=list)
+    arguments: int = 0
+    expects_argument: bool = True
+    # For a parameter list: the header it belongs to, which a later ``fun``
+    # may already have replaced when the list is unbalanced.
+    header: Optional[_Header] = None
+
+
+@dataclass
+class _Header:
+    """A ``fun`` declaration between the keyword and its body."""
+
+    line: int
+    name: Optional[str] = None
+    depth: int = 0
+    in_parameters: bool = False
+    after_parameters: bool = False
+    arity: int = 0
+    expects_parameter: bool = True
+    # Name and parameter count read from a run; see ``_StructureParser._splits``.
+    signature: Optional[Tuple[str, int]] = None
+
+
+@dataclass
+class _ClassHeader:
+    """A ``class``, ``interface`` or ``object`` declaration before its body.
+
+    Companion objects keep ``name`` unset: their members are called without
+    qualification from the enclosing class, so they share its scope.
+    """
+
+    depth: int
+    companion: bool = False
+    name: Optional[str] = None
+    expects_name: bool = True
+
+
+@dataclass
+class _Statement:
+    """A statement without braces whose extent is found by line breaks.
+
+    Used for expression function bodies and ``if``/``else`` bodies without
+    braces.
+    """
+
+    depth: int
+    last: Token
+    on_end: Callable[[Token], None]
+    stop_at_else: bool = False
+
+
+# Identifiers followed by ``(`` that are not function calls.
+_NOT_CALLS = frozenset({"if", "require", "check", "when", "while", "for", "catch"})
+# Inside runs and conditions (see ``tokenize``): an identifier, one opening a
+# call, a ``should*`` name, a property declaration and bracketed groups, which
+# nest at most two levels deep.
+_IDENT = re.compile(r"[^\W\d]\w*")
+_CALL = re.compile(r"(?<!\w)([^\W\d]\w*)[ \t]*\(")
+_PREDICATE = re.compile(r"(?<!\w)should\w*")
+_PROPERTY = re.compile(r"\bva[lr]\b")
+_FLAT_GROUP = re.compile(r"[(\[][^()\[\]]*[)\]]")
+_GROUP = re.compile(r"[(\[](?:[^()\[\]]|[(\[][^()\[\]]*[)\]])*[)\]]")
+
+
+class _StructureParser:
+    """Builds functions and their block trees from the tokens.
+
+    Bracket nesting is tracked on a stack, so a block's extent is known as
+    soon as its closing bracket is reached, and the facts collected for a
+    block (first call, throw, message) are filled in as the tokens pass by.
+    The source is read once and no block is rescanned. Closed functions,
+    with their enclosing class and parameter count, are queued on ``closed``
+    for the caller to take.
+    """
+
+    def __init__(self, source: TextLines) -> None:
+        self.source = source
+        self.text = source.text
+        self.closed: List[FunctionInfo] = []
+        self.stack: List[_Frame] = []
+        self.conditions: List[_Frame] = []
+        self.statements: List[_Statement] = []
+        self.header: Optional[_Header] = None
+        self.class_header: Optional[_ClassHeader] = None
+        self.scopes: List[str] = []
+        self.function: Optional[FunctionInfo] = None
+        self.open_blocks: List[Block] = []
+        self.previous: Optional[Token] = None
+        self.pending_keyword: Optional[Token] = None
+        self.after_condition: Optional[Block] = None
+        self.closed_if: Optional[Block] = None
+        self.throw_name: Optional[List[str]] = None
+        # Open blocks still waiting for their first string literal, call,
+        # throw and thrown exception type.
+        self.awaiting_message: List[Block] = []
+        self.awaiting_call: List[Block] = []
+        self.awaiting_throw: List[Block] = []
+        self.awaiting_exception: List[Block] = []
+
+    def feed(self, token: Token) -> None:
+        if self.statements:
+            self._end_statements(token)
+        if (token.kind == RUN or token.kind == CONDITION) and self._splits(token):
+            # Ending statements only looks at where the run starts, so
+            # feeding its first token repeats what was just done.
+            for part in split_run(self.text, token):
+                self.feed(part)
+            return
+        if self.conditions:
+            for frame in self.conditions:
+                frame.tokens.append(token)
+        self._dispatch(token)
+        if self.statements:
+            for statement in self.statements:
+                statement.last = token
+        self.previous = token
+
+    def _splits(self, run: Token) -> bool:
+        """Whether the parser needs the single tokens of a run or condition.
+
+        Outside its groups a run holds no bracket, string or keyword the
+        parser reacts to, so it mostly counts as one token, like a single
+        identifier. Calls inside it, a condition and a function name with its
+        parameters are read from the text; other header parts, the token
+        after a condition and a thrown type still take the tokens one by one.
+        """
+
+        if self.throw_name is not None or self.after_condition is not None:
+            return True
+        if self.statements and len(self.stack) < self.statements[-1].depth:
+            return True  # A closing bracket in the run would end a statement.
+        if run.kind == CONDITION:
+            return self.function is None
+        header = self.header
+        if header is not None and not header.in_parameters:
+            if header.after_parameters:
+                return True
+            header.signature = self._signature(run)
+            return header.signature is None
+        class_header = self.class_header
+        if class_header is not None and len(self.stack) <= class_header.depth:
+            if len(self.stack) < class_header.depth:
+                return True  # A closing bracket in the run would end the header.
+            return not self._class_run(run, class_header)
+        return False
+
+    def finish(self) -> None:
+        self._end_throw()
+        while self.statements:
+            statement = self.statements.pop()
+            statement.on_end(statement.last)
+        if self.function is not None and self.previous is not None:
+            self._close_function(self.previous.end_line)
+
+    def _dispatch(self, token: Token) -> None:
+        kind = token.kind
+        keyword = self.pending_keyword
+        self.pending_keyword = None
+        closed_if = self.closed_if
+        self.closed_if = None
+        if self.throw_name is not None:
+            if kind == IDENT or (kind == SYMBOL and token.text == "."):
+                self.throw_name.append(token.text)
+            else:
+                self._end_throw()
+        if self.stack and self.stack[-1].role == "call":
+            frame = self.stack[-1]
+            if kind == SYMBOL and token.text == ",":
+                frame.expects_argument = True
+            elif frame.expects_argument and kind != ")":
+                frame.arguments += 1
+                frame.expects_argument = False
+
+        block = self.after_condition
+        if block is not None:
+            self.after_condition = None
+            if block.kind == "else" and kind == SYMBOL and token.text == "->":
+                # A ``when`` branch, not the ``else`` of the preceding ``if``.
+                self.open_blocks[-1].children.pop()
+                return
+            if kind == "{":
+                self._push(token, "lambda" if block.kind == "require" else "body", block)
+                self._open_block(block)
+                return
+            if block.kind in ("if", "else"):
+                self._open_block(block)
+                self.statements.append(
+                    _Statement(
+                        len(self.stack), token, self._body_end(block), stop_at_else=block.kind == "if"
+                    )
+                )
+
+        if self.header is not None and self._header_token(token):
+            return
+        if self.class_header is not None and self._class_token(token):
+            return
+        if kind in OPEN_BRACKETS:
+            if kind == "(" and keyword is not None:
+                block = self._add_block(keyword.text, keyword)
+                frame = self._push(token, "condition", block)
+                self.conditions.append(frame)
+                return
+            if kind == "{" and keyword is not None and keyword.text == "when":
+                block = self._add_block("when", keyword)
+                self._push(token, "body", block)
+                self._open_block(block)
+                return
+            previous = self.previous
+            if kind == "(" and self.awaiting_call and previous is not None:
+                if previous.kind == RUN:
+                    *_, previous = split_run(self.text, previous)
+                if previous.kind == IDENT and previous.text not in _NOT_CALLS:
+                    frame = self._push(token, "call")
+                    frame.callers = list(self.awaiting_call)
+                    self._resolve(self.awaiting_call, "first_call", previous.text)
+                    return
+            self._push(token)
+        elif kind in CLOSE_BRACKETS:
+            self._close(token)
+        elif kind == IDENT:
+            text = token.text
+            if self.function is None:
+                if text == "fun":
+                    self.header = _Header(token.line)
+                elif text in ("class", "interface", "object") and not (
+                    self.previous is not None and self.previous.text == "::"
+                ):
+                    companion = self.previous is not None and self.previous.text == "companion"
+                    self.class_header = _ClassHeader(len(self.stack), companion)
+                return
+            elif text in ("if", "require", "when"):
+                self.pending_keyword = token
+            elif text == "else" and closed_if is not None:
+                self.after_condition = self._add_block("else", token)
+            elif text.startswith("throw"):
+                if self.awaiting_throw:
+                    self._resolve(self.awaiting_throw, "throws", True)
+                if text == "throw":
+                    self.throw_name = []
+        elif kind == STRING and self.awaiting_message:
+            self._resolve(self.awaiting_message, "message", _string_content(token.text))
+        elif kind == RUN and self.awaiting_call and "(" in token.text:
+            self._first_call(token.start, token.end)
+        elif kind == CONDITION:
+            self._condition(token)
+
+    def _condition(self, token: Token) -> None:
+        opening = self.text.index("(", token.start)
+        block = self._add_block(_IDENT.match(token.text).group(), token)
+        inner = self.text[opening + 1 : token.end - 1]
+        block.condition = " ".join(inner.split())
+        predicate = _PREDICATE.search(inner)
+        block.predicate = predicate.group() if predicate is not None else None
+        if self.awaiting_call:
+            self._first_call(opening + 1, token.end - 1)
+        self.after_condition = block
+
+    def _first_call(self, start: int, end: int) -> None:
+        """Resolve the first call in a run's text for the blocks awaiting one."""
+
+        for match in _CALL.finditer(self.text, start, end):
+            if match.group(1) not in _NOT_CALLS:
+                _, arguments = _arguments(self.text, match.end() - 1)
+                for block in self.awaiting_call:
+                    block.first_call_arity = arguments
+                self._resolve(self.awaiting_call, "first_call", match.group(1))
+                return
+
+    def _signature(self, run: Token) -> Optional[Tuple[str, int]]:
+        """The name and parameter count of a function header held by ``run``."""
+
+        match = _CALL.match(self.text, run.start, run.end)
+        if match is None:
+            return None
+        end, parameters = _arguments(self.text, match.end() - 1)
+        if "=" in self.text[end : run.end]:
+            return None  # An expression body starts inside the run.
+        return match.group(1), parameters
+
+    def _class_run(self, run: Token, header: _ClassHeader) -> bool:
+        """Whether ``run`` can be taken whole while a class header is open."""
+
+        if header.expects_name and not _IDENT.match(self.text, run.start):
+            return False
+        outside = _GROUP.sub(" ", self.text[run.start : run.end])
+        return _PROPERTY.search(outside) is None
+
+    def _add_block(self, kind: str, token: Token) -> Block:
+        block = Block(kind, token.line, token.end_line)
+        self.open_blocks[-1].children.append(block)
+        return block
+
+    def _open_block(self, block: Block) -> None:
+        self.open_blocks.append(block)
+        self.awaiting_message.append(block)
+        if block.kind != "require":
+            self.awaiting_call.append(block)
+            self.awaiting_throw.append(block)
+            self.awaiting_exception.append(block)
+
+    def _body_end(self, block: Block) -> Callable[[Token], None]:
+        def on_end(last: Token) -> None:
+            block.end_line = last.end_line
+            for index in range(len(self.open_blocks) - 1, 0, -1):
+                if self.open_blocks[index] is block:
+                    del self.open_blocks[index]
+                    break
+            for awaiting in (
+                self.awaiting_message,
+                self.awaiting_call,
+                self.awaiting_throw,
+                self.awaiting_exception,
+            ):
+                if awaiting:
+                    awaiting[:] = [waiting for waiting in awaiting if waiting is not block]
+            if block.kind == "if":
+                self.closed_if = block
+
+        return on_end
+
+    @staticmethod
+    def _resolve(awaiting: List[Block], attribute: str, value: object) -> None:
+        for block in awaiting:
+            setattr(block, attribute, value)
+        awaiting.clear()
+
+    def _end_throw(self) -> None:
+        parts = self.throw_name
+        self.throw_name = None
+        if parts and self.awaiting_exception:
+            self._resolve(self.awaiting_exception, "exception", "".join(parts))
+
+    def _header_token(self, token: Token) -> bool:
+        """Advance the open function header; ``True`` when ``token`` was consumed."""
+
+        header = self.header
+        kind = token.kind
+        if header.in_parameters:
+            if len(self.stack) == header.depth + 1:
+                if kind == SYMBOL and token.text == ",":
+                    header.expects_parameter = True
+                elif header.expects_parameter and kind != ")":
+                    header.arity += 1
+                    header.expects_parameter = False
+            return False
+        if not header.after_parameters:
+            if kind == IDENT:
+                header.name = token.text
+                return True
+            if kind == RUN:
+                header.name, header.arity = header.signature
+                header.depth = len(self.stack)
+                header.after_parameters = True
+                return True
+            if kind == "(" and header.name:
+                header.depth = len(self.stack)
+                header.in_parameters = True
+                self._push(token, "parameters").header = header
+                return True
+            if kind == SYMBOL and token.text in ("<", ">", ".", ",", ":", "?", "*"):
+                return True
+            self.header = None  # Not a named function, e.g. ``fun interface``.
+            return False
+        if len(self.stack) > header.depth:
+            return False
+        if kind == "{":
+            self.header = None
+            self._open_function(header, token)
+            self._push(token, "function")
+            return True
+        if kind == SYMBOL and token.text == "=":
+            self.header = None
+            function = self._open_function(header, token)
+            function.expression = ""
+            start = token.end
+
+            def end_expression(last: Token) -> None:
+                function.expression = self.text[start : last.end].strip()
+                self._close_function(last.end_line)
+
+            self.statements.append(_Statement(len(self.stack), token, end_expression))
+            return True
+        if token.line > self.previous.end_line and (
+            kind in CLOSE_BRACKETS or (kind == IDENT and token.text in _DECLARATION_KEYWORDS)
+        ):
+            # A declaration without a body.
+            self.header = None
+            self._open_function(header, self.previous)
+            self._close_function(self.previous.end_line)
+        return False
+
+    def _class_token(self, token: Token) -> bool:
+        """Advance the open class header; ``True`` when ``token`` was consumed."""
+
+        header = self.class_header
+        kind = token.kind
+        if len(self.stack) > header.depth:
+            return False  # Constructor parameters or supertype arguments.
+        if header.expects_name:
+            header.expects_name = False
+            if kind == IDENT or kind == RUN:
+                if not header.companion:
+                    header.name = _IDENT.match(token.text).group()
+                return True
+        if kind == "{":
+            self.class_header = None
+            if header.name is None:
+                return False
+            self.scopes.append(f"{self.scopes[-1]}.{header.name}" if self.scopes else header.name)
+            self._push(token, "class")
+            return True
+        if (
+            kind in CLOSE_BRACKETS
+            or (kind == SYMBOL and token.text == ";")
+            or (kind == IDENT and token.text in ("fun", "val", "var"))
+        ):
+            self.class_header = None  # A declaration without a body.
+        return False
+
+    def _open_function(self, header: _Header, token: Token) -> FunctionInfo:
+        body = Block("function", header.line, token.line)
+        self.function = FunctionInfo(
+            name=header.name,
+            start_line=header.line,
+            header_end_line=token.line,
+            end_line=token.line,
+            lines=[],
+            body=body,
+            owner=self.scopes[-1] if self.scopes else None,
+            arity=header.arity,
         )
+        self.open_blocks = [body]
+        return self.function
+
+    def _close_function(self, end_line: int) -> None:
+        function = self.function
+        self.function = None
+        self.open_blocks = []
+        for awaiting in (
+            self.awaiting_message,
+            self.awaiting_call,
+            self.awaiting_throw,
+            self.awaiting_exception,
+        ):
+            awaiting.clear()
+        function.end_line = function.body.end_line = end_line
+        function.lines = self.source.span(function.start_line - 1, end_line)
+        self.closed.append(function)
+
+    def _push(
+        self, token: Token, role: Optional[str] = None, block: Optional[Block] = None
+    ) -> _Frame:
+        frame = _Frame(token.kind, role, block)
+        self.stack.append(frame)
+        return frame
+
+    def _close(self, token: Token) -> None:
+        opening = _MATCHING_BRACKETS[token.kind]
+        for index in range(len(self.stack) - 1, -1, -1):
+            if self.stack[index].bracket == opening:
+                break
+        else:
+            return  # Unbalanced closing bracket.
+        while len(self.stack) > index:
+            self._closed(self.stack.pop(), token)
+
+    def _closed(self, frame: _Frame, token: Token) -> None:
+        role = frame.role
+        if role == "parameters":
+            frame.header.in_parameters = False
+            frame.header.after_parameters = True
+        elif role == "function":
+            self._close_function(token.line)
+        elif role == "call":
+            for block in frame.callers:
+                block.first_call_arity = frame.arguments
+        elif role == "class":
+            self.scopes.pop()
+        elif role == "condition":
+            self.conditions.remove(frame)
+            frame.block.condition = _join_tokens(frame.tokens[:-1])
+            frame.block.predicate = _predicate(frame.tokens)
+            frame.block.end_line = token.line
+            self.after_condition = frame.block
+        elif role in ("body", "lambda"):
+            self._body_end(frame.block)(token)
+
+    def _end_statements(self, token: Token) -> None:
+        if self.after_condition is not None and self.after_condition.kind in ("if", "else"):
+            return  # The body has not started yet.
+        while self.statements:
+            statement = self.statements[-1]
+            depth = len(self.stack)
+            if depth > statement.depth:
+                return
+            last = statement.last
+            kind = token.kind
+            ends = (
+                kind in CLOSE_BRACKETS
+                or (kind == SYMBOL and token.text == ";")
+                or (statement.stop_at_else and kind == IDENT and token.text == "else")
+                or (token.line > last.end_line and not _continues(last, token, statement))
+            )
+            if not ends:
+                return
+            self.statements.pop()
+            statement.on_end(last)
+
+
+def _arguments(text: str, start: int) -> Tuple[int, int]:
+    """End of the group of a run opened at ``start`` and its argument count.
+
+    As for the tokens of a call, each comma-separated part that holds
+    anything is an argument.
+    """
+
+    group = _GROUP.match(text, start)
+    inside = _FLAT_GROUP.sub("()", group.group()[1:-1])
+    return group.end(), sum(1 for part in inside.split(",") if not part.isspace() and part)
+
+
+def _predicate(tokens: Sequence[Token]) -> Optional[str]:
+    """The first ``should*`` identifier among ``tokens``."""
+
+    for token in tokens:
+        if token.kind == IDENT:
+            if token.text.startswith("should"):
+                return token.text
+        elif token.kind == RUN or token.kind == CONDITION:
+            match = _PREDICATE.search(token.text)
+            if match is not None:
+                return match.group()
+    return None
+
+
+def _continues(last: Token, token: Token, statement: _Statement) -> bool:
+    if last.kind == SYMBOL and last.text in _TRAILING_OPERATORS:
+        return True
+    if last.kind == IDENT and last.text == "else":
+        return True
+    if token.kind == SYMBOL and token.text in _LEADING_OPERATORS:
+        return True
+    return token.kind == IDENT and token.text == "else" and not statement.stop_at_else
+
+
+def _join_tokens(tokens: Sequence[Token]) -> str:
+    """Source text of ``tokens`` with comments dropped and whitespace collapsed."""
+
+    parts: List[str] = []
+    previous: Optional[Token] = None
+    for token in tokens:
+        if previous is not None and token.start > previous.end:
+            parts.append(" ")
+        if token.kind == RUN or token.kind == CONDITION:
+            parts.append(" ".join(token.text.split()))
+        else:
+            parts.append(token.text)
+        previous = token
+    return "".join(parts)
+
+
+def _string_content(literal: str) -> str:
+    quotes = 3 if literal.startswith('"""') else 1
+    return literal[quotes:-quotes] if len(literal) >= 2 * quotes else literal[quotes:]
+
+
+@dataclass
+class _Guard:
+    """A guard rule whose called function and predicate are still to be resolved."""
+
+    rule: Rule
+    block: Block
+    predicate: str
+    owner: Optional[str]
+
+
+class _RuleCollector:
+    """Numbers the rules of one run and links throw rules to their guards.
+
+    A guard rule is recorded against the function it calls; once every
+    function has been collected, the throw rules of a guarded function depend
+    on the last guard calling it, wherever that guard is declared.
+    """
+
+    def __init__(self) -> None:
+        self.rules: List[Rule] = []
+        self.next_id = 1
+        self.guards: Dict[FunctionInfo, int] = {}
+        self.throw_rules: List[Tuple[FunctionInfo, Rule]] = []
+
+    def collect(self, func: FunctionInfo, source_file: str, functions: SymbolIndex) -> None:
+        """Emit the rules of one function from a single walk over its blocks.
+
+        Every ``require`` becomes a rule. The first ``if`` that calls a
+        function under a ``should*`` predicate becomes a guard rule; functions
+        without one get a rule per ``if`` that throws. Rules are numbered in
+        that order. The guarded function and the predicate are resolved
+        through the symbol index from the scope of ``func``.
+        """
+
+        requires: List[Block] = []
+        throws: List[Block] = []
+        guard: Optional[Block] = None
+        for block in func.blocks():
+            if block.kind == "require":
+                if block.condition:
+                    requires.append(block)
+            elif block.kind == "if":
+                if guard is None and block.first_call and block.predicate:
+                    guard = block
+                if block.throws:
+                    throws.append(block)
+
+        for block in requires:
+            self._add(
+                describe_kotlin_require(block.condition, message=block.message),
+                source_file,
+                block.line,
+                block.end_line,
+            )
+
+        if guard is not None:
+            rule = self._add("", source_file, func.start_line, guard.end_line)
+            self._guard(_Guard(rule, guard, guard.predicate, func.owner), functions)
+            return
+
+        if not throws:
+            return
         end_line = func.end_line
         if func.lines and func.lines[-1].strip() == "}":
             end_line = max(func.end_line - 1, func.start_line)
+        for block in throws:
+            rule = self._add(
+                _describe_throw_rule(block, func.name),
+                source_file,
+                func.start_line,
+                end_line,
+            )
+            self.throw_rules.append((func, rule))
+
+    def finish(self) -> List[Rule]:
+        self._link(self.throw_rules)
+        return self.rules
+
+    def _guard(self, guard: _Guard, functions: SymbolIndex) -> None:
+        self._resolve_guard(guard, functions)
+
+    def _resolve_guard(self, guard: _Guard, functions: SymbolIndex) -> None:
+        block = guard.block
+        called = block.first_call
+        target = functions.resolve(called, guard.owner, block.first_call_arity)
+        predicate = functions.resolve(guard.predicate, guard.owner)
+        rule = guard.rule
+        rule.description = _describe_guard_rule(
+            block.condition,
+            guard.predicate,
+            called,
+            predicate.expression if predicate is not None else None,
+        )
+        if target is not None:
+            rule.end_line = max(target.header_end_line - 1, rule.end_line)
+            self.guards[target] = max(self.guards.get(target, 0), rule.internal_id)
+
+    def _link(self, throw_rules: List[Tuple[FunctionInfo, Rule]]) -> None:
+        for func, rule in throw_rules:
+            guard_id = self.guards.get(func)
+            if guard_id is not None:
+                rule.depends_on_internal.add(guard_id)
+
+    def _add(self, description: str, source_file: str, start_line: int, end_line: int) -> Rule:
         rule = Rule(
-            internal_id=internal_id + created,
+            internal_id=self.next_id,
             description=description,
             source_file=source_file,
-            start_line=func.start_line,
+            start_line=start_line,
             end_line=end_line,
             source_type=SourceType.KOTLIN,
         )
-        if func.name in guard_dependencies:
-            rule.depends_on_internal.add(guard_dependencies[func.name])
-        rules.append(rule)
-        created += 1
-    return created
-
-
-def _find_block_end(lines: List[str], if_index: int) -> int:
-    brace_balance = lines[if_index].count("{") - lines[if_index].count("}")
-    end_index = if_index
-    cursor = if_index + 1
-    while brace_balance > 0 and cursor < len(lines):
-        brace_balance += lines[cursor].count("{")
-        brace_balance -= lines[cursor].count("}")
-        end_index = cursor
-        cursor += 1
-    return end_index
-
-
-def _find_first_function_call(lines: List[str]) -> Optional[str]:
-    for line in lines:
-        match = re.search(r"([A-Za-z_][A-Za-z0-9_]*)\s*\(", line)
-        if match:
-            name = match.group(1)
-            if name not in {"if", "require", "check"}:
-                return name
-    return None
+        self.rules.append(rule)
+        self.next_id += 1
+        return rule
 
 
-def _find_predicate_name(condition: str) -> Optional[str]:
-    match = re.search(r"(should[A-Za-z0-9_]*)", condition)
-    return match.group(1) if match else None
+class _RuleStream(_RuleCollector):
+    """A collector fed one closed function at a time.
 
+    Only function signatures (the symbol index without block trees) and the
+    guard tables are kept across functions. A guard is resolved once its
+    predicate has been declared and a function with the exact signature of
+    the call exists in the caller's own scope, where a batch lookup stops as
+    well. Otherwise it waits until the outermost class around the caller has
+    closed and is then resolved through the whole scope chain from what has
+    been declared so far; guards of top-level functions wait for the end of
+    the file. The throw rules of a class's functions are held until that
+    class closes, so guards in the same class are linked to them before they
+    are released; a released rule is not changed again. ``rules`` only holds
+    the rules not yet released, which are released in order up to the first
+    unresolved guard or held throw rule.
+    """
 
-def _collect_assignments(lines: Iterable[str]) -> Dict[str, str]:
-    assignments: Dict[str, str] = {}
-    for line in lines:
-        match = re.match(
-            r"\s*val\s+(?P<name>[A-Za-z_][A-Za-z0-9_]*)\s*=\s*(?P<expr>.+)", line
-        )
-        if match:
-            assignments[match.group("name")] = match.group("expr").strip()
-    return assignments
+    def __init__(self) -> None:
+        super().__init__()
+        self.functions = SymbolIndex()
+        self.pending: List[_Guard] = []
+        # The outermost class around the last function, ``None`` at top level.
+        self.open_class: Optional[str] = None
 
+    def add(self, func: FunctionInfo, source_file: str) -> List[Rule]:
+        self.functions.add(func)
+        self.open_class = _outermost_class(func.owner)
+        if self.pending:
+            waiting = self.pending
+            self.pending = []
+            for guard in waiting:
+                if guard.owner is not None and _outermost_class(guard.owner) != self.open_class:
+                    self._resolve_guard(guard, self.functions)
+                else:
+                    self._guard(guard, self.functions)
+        self.collect(func, source_file, self.functions)
+        func.body = None
+        return self._release()
 
-def _find_throw_line(body_lines: List[str]) -> Optional[str]:
-    for line in body_lines:
-        if "throw" in line:
-            return line
-    return None
+    def finish(self) -> List[Rule]:
+        for guard in self.pending:
+            self._resolve_guard(guard, self.functions)
+        self.pending = []
+        self.open_class = None
+        return self._release()
 
+    def _guard(self, guard: _Guard, functions: SymbolIndex) -> None:
+        block = guard.block
+        signature = (guard.owner, block.first_call, block.first_call_arity)
+        if functions.get(signature) is not None and functions.resolve(guard.predicate, guard.owner):
+            self._resolve_guard(guard, functions)
+        else:
+            self.pending.append(guard)
 
-def _extract_parenthesized_condition(text: str, keyword: str) -> Optional[str]:
-    marker = f"{keyword}("
-    start = text.find(marker)
-    if start == -1:
-        return None
-    idx = start + len(marker)
-    depth = 0
-    chars: List[str] = []
-    while idx < len(text):
-        ch = text[idx]
-        if ch == "(":
-            depth += 1
-        elif ch == ")":
-            if depth == 0:
+    def _release(self) -> List[Rule]:
+        if not self.rules:
+            return []
+        end = self.rules[0].internal_id + len(self.rules)
+        if self.pending:
+            end = min(guard.rule.internal_id for guard in self.pending)
+        linked = 0
+        for func, rule in self.throw_rules:
+            if rule.internal_id >= end:
                 break
-            depth -= 1
-        chars.append(ch)
-        idx += 1
-    return "".join(chars).strip()
+            if func.owner is not None and _outermost_class(func.owner) == self.open_class:
+                end = rule.internal_id
+                break
+            linked += 1
+        self._link(self.throw_rules[:linked])
+        del self.throw_rules[:linked]
+        count = end - self.rules[0].internal_id
+        released = self.rules[:count]
+        del self.rules[:count]
+        return released
+
+
+def _outermost_class(owner: Optional[str]) -> Optional[str]:
+    return owner.partition(".")[0] if owner is not None else None
 
 
 def _describe_guard_rule(
@@ -306,12 +1076,10 @@ def _describe_guard_rule(
 
 
 def _describe_throw_rule(
-    condition: str,
-    body_lines: List[str],
-    assignments: Dict[str, str],
+    block: Block,
     func_name: str,
 ) -> str:
-    message = _extract_message(body_lines)
+    message = block.message
     if func_name == "validateChannelMapping" and "Invalid channel mapping" in (message or ""):
         return (
             "For region 'wr' with 'beneAdminFeesFeatureFlag' = true, the pair "
@@ -319,21 +1087,6 @@ def _describe_throw_rule(
             "'channelConfig.targetToMediumMap'; otherwise the request is rejected "
             "with 'Invalid channel mapping for target: <target> and medium: <medium>'."
         )
-    exception = None
-    exception_match = _THROW_RE.search("\n".join(body_lines))
-    if exception_match:
-        exception = exception_match.group("exception")
-    cleaned_condition = condition
     return describe_kotlin_if_throw(
-        cleaned_condition, exception=exception, message=message
+        block.condition, exception=block.exception, message=message
     )
-
-
-def _extract_message(lines: List[str]) -> Optional[str]:
-    for line in lines:
-        if '"' in line:
-            first = line.find('"')
-            last = line.rfind('"')
-            if first != last:
-                return line[first + 1 : last]
-    return None
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+"""Tokenizer for the Kotlin analyzer.
+
+Kotlin sources are split into identifiers, literals, brackets and operator
+symbols in a single left-to-right pass. String literals (including raw
+``\"\"\"`` strings and ``${...}`` templates, which may nest further strings),
+character literals and comments are consumed as a whole, so braces and
+parentheses inside them never affect the structure seen by the analyzer.
+Comments and whitespace produce no tokens.
+"""
+
+import re
+from typing import Iterator, NamedTuple
+
+
+IDENT = "ident"
+NUMBER = "number"
+STRING = "string"
+CHAR = "char"
+SYMBOL = "symbol"
+# Several tokens matched at once; see ``tokenize``.
+RUN = "run"
+CONDITION = "condition"
+# Brackets use their own character as the kind: ( ) { } [ ]
+OPEN_BRACKETS = "({["
+CLOSE_BRACKETS = ")}]"
+
+
+class Token(NamedTuple):
+    """A token with its offsets in the source and the 1-based line it starts on."""
+
+    kind: str
+    text: str
+    start: int
+    end: int
+    line: int
+
+    @property
+    def end_line(self) -> int:
+        return self.line + self.text.count("\n")
+
+
+# One alternation classifies every token; the search itself skips whitespace.
+# Plain strings are matched whole, while block comments, raw strings and
+# strings with ``${...}`` templates are only opened here and skipped by hand.
+_TOKEN = re.compile(
+    r"(?P<ident>[^\W\d]\w*|`[^`\n]+`)"
+    r"|(?P<bracket>[(){}\[\]])"
+    r"|(?P<line_comment>//[^\n]*)"
+    r"|(?P<block_comment>/\*)"
+    r'|(?P<raw_string>""")'
+    r'|(?P<plain_string>"(?:[^"\\$\n]|\\.|\$(?!\{))*")'
+    r'|(?P<string>")'
+    r"|(?P<char>'(?:\\u[0-9A-Fa-f]{4}|\\.|[^'\\\n])')"
+    r"|(?P<number>\d[\w]*(?:\.\d[\w]*)?)"
+    r"|(?P<symbol>===|!==|&&|\|\||\?:|\?\.|->|::|\.\.|[=!<>]=|\+\+|--|[+\-*/%]=|\S)"
+)
+# Token kinds of the alternatives that are complete once matched.
+_SIMPLE_KINDS = {"ident": IDENT, "plain_string": STRING, "char": CHAR, "number": NUMBER, "symbol": SYMBOL}
+# A run is a stretch of one line that starts on a word, ends on a word or a
+# bracketed group and holds only words, symbols and groups. Words are numbers
+# and identifiers other than ``throw*`` and the keywords the analyzer reacts
+# to. Groups are ``(...)`` or ``[...]`` with words, symbols, commas and groups
+# one level deep inside. Strings, character literals, comments, braces and
+# commas or semicolons outside a group end a run. A condition is ``if``,
+# ``when`` or ``require`` with such a group.
+_RUN_WORD = (
+    r"(?:(?!(?:fun|class|interface|object|companion|if|require|when|else)(?!\w)|throw)"
+    r"[^\W\d]\w*(?!\w)|\d[\w]*(?:\.\d[\w]*)?(?!\w))"
+)
+_RUN_SYMBOL = r"(?:[^\s\w(){}\[\]\"'`/;,]|/(?![/*]))"
+_RUN_INNER = rf"(?:[ \t,]|{_RUN_WORD}|{_RUN_SYMBOL})"
+_RUN_FLAT_GROUP = rf"(?:\({_RUN_INNER}*\)|\[{_RUN_INNER}*\])"
+_RUN_GROUP = (
+    rf"(?:\((?:{_RUN_INNER}|{_RUN_FLAT_GROUP})*\)|\[(?:{_RUN_INNER}|{_RUN_FLAT_GROUP})*\])"
+)
+_TOKEN_OR_RUN = re.compile(
+    rf"(?P<condition>(?:if|when|require)[ \t]*\((?:{_RUN_INNER}|{_RUN_FLAT_GROUP})*\))"
+    rf"|(?P<run>{_RUN_WORD}(?:(?:[ \t]*{_RUN_SYMBOL})*[ \t]*(?:{_RUN_WORD}|{_RUN_GROUP}))+)"
+    rf"|{_TOKEN.pattern}"
+)
+_RUN_KINDS = {**_SIMPLE_KINDS, "run": RUN, "condition": CONDITION}
+_STRING_BODY = re.compile(r'(?:[^"\\$\n]|\\.|\$(?!\{))*')
+_RAW_STRING_BODY = re.compile(r'(?:[^"$]|"(?!"")|\$(?!\{))*')
+_RAW_STRING_END = re.compile(r'"{3,}')
+_COMMENT_EDGE = re.compile(r"/\*|\*/")
+
+
+def tokenize(text: str, *, runs: bool = False) -> Iterator[Token]:
+    """Yield the tokens of ``text`` in source order.
+
+    Unterminated strings and comments end at the end of their line (plain
+    strings) or of the input, so malformed sources still tokenize.
+
+    With ``runs``, the plain words, operators and parentheses between the
+    tokens that shape the structure are matched in bulk: each run of them on
+    a line is one ``RUN`` token, and a keyword with its parenthesized
+    condition one ``CONDITION`` token. ``split_run`` turns either back into
+    its tokens.
+    """
+
+    pos = 0
+    line = 1
+    new_token = tuple.__new__
+    simple_kinds = _RUN_KINDS if runs else _SIMPLE_KINDS
+    finditer = (_TOKEN_OR_RUN if runs else _TOKEN).finditer
+    count = text.count
+    while True:
+        for match in finditer(text, pos):
+            start, end = match.span()
+            if start != pos:
+                line += count("\n", pos, start)
+            pos = end
+            kind = match.lastgroup
+            simple = simple_kinds.get(kind)
+            if simple is not None:
+                yield new_token(Token, (simple, text[start:end], start, end, line))
+            elif kind == "bracket":
+                yield new_token(Token, (text[start], text[start], start, end, line))
+            elif kind != "line_comment":
+                break  # Skipped by hand below; the scan resumes after it.
+        else:
+            return
+        if kind == "block_comment":
+            pos = _skip_comment(text, pos)
+            line += count("\n", start, pos)
+            continue
+        pos = _skip_string(text, pos) if kind == "string" else _skip_raw_string(text, pos)
+        yield Token(STRING, text[start:pos], start, pos, line)
+        line += count("\n", start, pos)
+
+
+def split_run(text: str, run: Token) -> Iterator[Token]:
+    """Yield the tokens a ``RUN`` or ``CONDITION`` token of ``text`` stands for."""
+
+    new_token = tuple.__new__
+    simple_kinds = _SIMPLE_KINDS
+    line = run.line
+    for match in _TOKEN.finditer(text, run.start, run.end):
+        start, end = match.span()
+        kind = simple_kinds.get(match.lastgroup) or text[start]
+        yield new_token(Token, (kind, text[start:end], start, end, line))
+
+
+def _skip_comment(text: str, pos: int) -> int:
+    """Skip a block comment opened before ``pos``; Kotlin comments nest."""
+
+    depth = 1
+    for edge in _COMMENT_EDGE.finditer(text, pos):
+        depth += 1 if edge.group() == "/*" else -1
+        if not depth:
+            return edge.end()
+    return len(text)
+
+
+def _skip_string(text: str, pos: int) -> int:
+    while True:
+        pos = _STRING_BODY.match(text, pos).end()
+        if text.startswith("${", pos):
+            pos = _skip_template(text, pos + 2)
+        elif text.startswith('"', pos):
+            return pos + 1
+        else:
+            return pos  # Unterminated at the end of the line or input.
+
+
+def _skip_raw_string(text: str, pos: int) -> int:
+    while True:
+        pos = _RAW_STRING_BODY.match(text, pos).end()
+        if text.startswith("${", pos):
+            pos = _skip_template(text, pos + 2)
+            continue
+        end = _RAW_STRING_END.match(text, pos)
+        return end.end() if end else len(text)
+
+
+def _skip_template(text: str, pos: int) -> int:
+    """Skip a ``${...}`` template expression whose ``{`` ends before ``pos``."""
+
+    depth = 0
+    search = _TOKEN.search
+    while True:
+        match = search(text, pos)
+        if match is None:
+            return len(text)
+        kind = match.lastgroup
+        pos = match.end()
+        if kind == "block_comment":
+            pos = _skip_comment(text, pos)
+        elif kind == "string":
+            pos = _skip_string(text, pos)
+        elif kind == "raw_string":
+            pos = _skip_raw_string(text, pos)
+        elif kind == "bracket":
+            if text[pos - 1] == "{":
+                depth += 1
+            elif text[pos - 1] == "}":
+                if not depth:
+                    return pos
+                depth -= 1
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+"""Symbol index for Kotlin functions.
+
+Functions are indexed by their declaring class, name and arity, so overloads
+and same-named methods of different classes stay distinct. A call site is
+resolved from the scope of the calling function outwards: the caller's class,
+its enclosing classes, then top-level functions. Every step is a dictionary
+lookup. An index can fall back to a parent index, such as the functions of
+a whole project for the index of one file.
+"""
+
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .kotlin_analyzer import FunctionInfo
+
+
+# ``(declaring class, name, arity)``; the class is ``None`` for top-level
+# functions and dotted for nested classes.
+SymbolKey = Tuple[Optional[str], str, int]
+
+
+class SymbolIndex:
+    """Functions of one source file or project, in source order."""
+
+    def __init__(self, parent: Optional[SymbolIndex] = None) -> None:
+        self.parent = parent
+        self.functions: List[FunctionInfo] = []
+        self._by_signature: Dict[SymbolKey, FunctionInfo] = {}
+        self._by_scope: Dict[Tuple[Optional[str], str], List[FunctionInfo]] = {}
+        self._by_name: Dict[str, List[FunctionInfo]] = {}
+
+    def __iter__(self) -> Iterator[FunctionInfo]:
+        return iter(self.functions)
+
+    def __len__(self) -> int:
+        return len(self.functions)
+
+    def add(self, function: FunctionInfo) -> None:
+        self.functions.append(function)
+        self._by_signature.setdefault(function.key, function)
+        self._by_scope.setdefault((function.owner, function.name), []).append(function)
+        self._by_name.setdefault(function.name, []).append(function)
+
+    def get(self, key: SymbolKey) -> Optional[FunctionInfo]:
+        """The first function declared with exactly this signature."""
+
+        return self._by_signature.get(key)
+
+    def update(self, other: SymbolIndex) -> None:
+        for function in other.functions:
+            self.add(function)
+
+    def resolve(
+        self, name: str, scope: Optional[str], arity: Optional[int] = None
+    ) -> Optional[FunctionInfo]:
+        """The function a call to ``name`` from a function of ``scope`` refers to.
+
+        An exact arity match wins in the innermost scope that declares
+        ``name``; a scope with a single function of that name matches any
+        arity (default and vararg parameters). Outside the caller's scopes, a
+        name declared only once is used. Names this index cannot resolve are
+        looked up in the parent index; ambiguous calls resolve to ``None``.
+        """
+
+        function = self._resolve(name, scope, arity)
+        if function is None and self.parent is not None:
+            return self.parent.resolve(name, scope, arity)
+        return function
+
+    def _resolve(
+        self, name: str, scope: Optional[str], arity: Optional[int]
+    ) -> Optional[FunctionInfo]:
+        for owner in _enclosing_scopes(scope):
+            if arity is not None:
+                function = self._by_signature.get((owner, name, arity))
+                if function is not None:
+                    return function
+            candidates = self._by_scope.get((owner, name))
+            if candidates:
+                return candidates[0] if len(candidates) == 1 else None
+        candidates = self._by_name.get(name)
+        if candidates and len(candidates) == 1:
+            return candidates[0]
+        return None
+
+
+def _enclosing_scopes(scope: Optional[str]) -> Iterator[Optional[str]]:
+    while scope:
+        yield scope
+        scope = scope.rpartition(".")[0] or None
+    yield None
@@ -1,14 +1,38 @@
 from __future__ import annotations
 
-import json
-from dataclasses import dataclass
+import logging
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from itertools import islice
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple, Union
 
+from src.analyzers.endpoint_selection import HTTP_METHODS, EndpointSelector
+from src.analyzers.openapi_documents import (
+    MISSING_DOCUMENT_WARNING,
+    DocumentLoader,
+    OpenAPIDocument,
+)
+from src.analyzers.schema_graph import SchemaGraph, SchemaReference, UnresolvedReference
+from src.analyzers.yaml_parser import (
+    DEFAULT_YAML_PARSER,
+    YamlNode,
+    YamlParseError,
+)
 from src.description import (
+    describe_openapi_alternatives,
     describe_openapi_array_items,
     describe_openapi_enum,
+    describe_openapi_format,
+    describe_openapi_length,
+    describe_openapi_nullable,
+    describe_openapi_pattern,
+    describe_openapi_range,
     describe_openapi_request_body_required,
+    describe_openapi_required_parameter,
     describe_openapi_required_property,
 )
 from src.models import Rule, SourceType
@@ -18,258 +42,1516 @@ class OpenAPIAnalyzerError(RuntimeError):
     """Raised when the OpenAPI analyzer cannot proceed."""
 
 
-@dataclass
-class YamlNode:
-    value: object
-    start_line: int
-    end_line: int
+DEFAULT_MAX_SCHEMA_DEPTH = 32
+DEFAULT_MAX_RULES_PER_ENDPOINT = 10000
+
+# The parts of an operation that rules are extracted from.
+ENDPOINT_ENTITIES = ("parameters", "requestBody", "responses")
+
+
+def analyze_openapi_file(
+    path: str | Path,
+    *,
+    yaml_parser: str = DEFAULT_YAML_PARSER,
+    max_schema_depth: int = DEFAULT_MAX_SCHEMA_DEPTH,
+    max_rules_per_endpoint: int = DEFAULT_MAX_RULES_PER_ENDPOINT,
+    lazy: bool = False,
+    endpoints: EndpointSelector | None = None,
+    jobs: int = 1,
+    entities: Iterable[str] | None = None,
+    schema_graph_file: str | Path | None = None,
+    logger: logging.Logger | None = None,
+) -> List[Rule]:
+    """Extract validation rules from an OpenAPI document.
+
+    ``max_schema_depth`` bounds how many nested ``$ref`` schema levels are
+    expanded from a request or response schema, and ``max_rules_per_endpoint``
+    caps the rules emitted for a single operation. ``0`` disables a limit.
+    Truncated endpoints are reported as warnings.
+
+    With ``lazy`` set, documents are only pre-scanned for line spans and the
+    path items and schemas are parsed when the analysis reaches them.
+
+    ``endpoints`` restricts the analysis to the selected paths and methods.
+    Selection always uses lazy parsing, so unselected path items and the
+    schemas only they reference are neither parsed nor analyzed.
+
+    ``jobs`` greater than one analyzes chunks of path items in that many
+    worker processes (``0`` uses every CPU). The merged rules, internal IDs
+    and warnings are identical to a sequential run.
+
+    ``entities`` names the parts of each operation to analyze, out of
+    :data:`ENDPOINT_ENTITIES`; ``None`` or an empty list selects all of them.
+    Restricting them implies lazy parsing, so skipped parts and the schemas
+    only they reference are not parsed or expanded at all. Unknown names are
+    reported as a warning and ignored.
+
+    Before any rules are generated, the schemas reachable from the analyzed
+    endpoints are collected into a reference graph and expanded dependencies
+    first; unresolved schema references are reported as warnings. With
+    ``schema_graph_file`` set, the graph is written there in Graphviz DOT
+    format, annotated with the rules each schema expands into.
+    """
+
+    logger = logger or logging.getLogger("valid_builder")
+    selected_entities = _select_entities(entities, logger)
+    settings = _AnalysisSettings(
+        path=Path(path),
+        yaml_parser=yaml_parser,
+        max_schema_depth=max_schema_depth,
+        max_rules_per_endpoint=max_rules_per_endpoint,
+        lazy=lazy or endpoints is not None or len(selected_entities) < len(ENDPOINT_ENTITIES),
+        endpoints=endpoints,
+        entities=selected_entities,
+    )
+    try:
+        context = _open_context(settings, logger)
+        try:
+            if jobs != 1:
+                rules = _analyze_paths_in_parallel(context, settings, jobs, logger)
+            else:
+                rules = _analyze_paths(context, logger)
+            if schema_graph_file is not None:
+                _write_schema_graph(context, Path(schema_graph_file))
+            return rules
+        finally:
+            context.loader.close()
+    except YamlParseError as exc:
+        raise OpenAPIAnalyzerError(str(exc)) from exc
+
+
+@dataclass(frozen=True)
+class _AnalysisSettings:
+    """Everything needed to open a document for analysis, in picklable form."""
+
+    path: Path
+    yaml_parser: str
+    max_schema_depth: int
+    max_rules_per_endpoint: int
+    lazy: bool
+    endpoints: Optional[EndpointSelector]
+    entities: FrozenSet[str] = frozenset(ENDPOINT_ENTITIES)
+
 
+def _select_entities(
+    entities: Optional[Iterable[str]], logger: logging.Logger
+) -> FrozenSet[str]:
+    requested = [entity.strip() for entity in entities or () if entity.strip()]
+    if not requested:
+        return frozenset(ENDPOINT_ENTITIES)
+    known = {entity.lower(): entity for entity in ENDPOINT_ENTITIES}
+    unknown = [entity for entity in requested if entity.lower() not in known]
+    if unknown:
+        logger.warning("Ignoring unknown OpenAPI endpoint entities: %s", ", ".join(unknown))
+    return frozenset(known[entity.lower()] for entity in requested if entity.lower() in known)
 
-def analyze_openapi_file(path: str | Path) -> List[Rule]:
-    path = Path(path)
-    root = _parse_yaml_with_lines(path.read_text())
 
-    if not isinstance(root.value, dict):
-        raise OpenAPIAnalyzerError("Root YAML node must be a mapping")
+def _open_context(settings: _AnalysisSettings, logger: logging.Logger) -> _AnalysisContext:
+    loader = DocumentLoader(
+        settings.path.parent,
+        yaml_parser=settings.yaml_parser,
+        lazy=settings.lazy,
+        logger=logger,
+    )
+    try:
+        document = loader.load(settings.path, display_name=settings.path.name)
+        if not document.is_mapping():
+            raise OpenAPIAnalyzerError("Root YAML node must be a mapping")
+    except BaseException:
+        loader.close()
+        raise
+    return _AnalysisContext(
+        document=document,
+        loader=loader,
+        max_schema_depth=settings.max_schema_depth,
+        max_rules_per_endpoint=settings.max_rules_per_endpoint,
+        endpoints=settings.endpoints,
+        entities=settings.entities,
+    )
+
+
+def _analyze_paths(context: _AnalysisContext, logger: logging.Logger) -> List[Rule]:
+    _prepare_schemas(context, logger, _path_filter(context))
+    rules, _, selected = _analyze_endpoints(context, logger, _path_filter(context))
+    if context.endpoints and not selected:
+        logger.warning("No OpenAPI endpoints matched the selection")
+    return rules
+
+
+def _path_filter(context: _AnalysisContext) -> Optional[Callable[[str], bool]]:
+    return context.endpoints.matches_path if context.endpoints else None
+
+
+def _analyze_endpoints(
+    context: _AnalysisContext,
+    logger: logging.Logger,
+    include: Optional[Callable[[str], bool]],
+) -> Tuple[List[Rule], int, int]:
+    """Analyze the path items accepted by ``include``.
+
+    Returns the rules, the next free internal ID and the number of endpoints
+    analyzed. Internal IDs start at 1.
+    """
 
-    schemas = _extract_schemas(root)
     rules: List[Rule] = []
     internal_id = 1
+    selected = 0
 
     # Process endpoints and request/response schemas
-    paths_node = _get_mapping_node(root, "paths")
-    if paths_node is None or not isinstance(paths_node.value, dict):
+    for endpoint_str, method_node, path_item_node, path_document in _iter_operations(
+        context, include
+    ):
+        budget = _EndpointBudget(context.max_rules_per_endpoint)
+        created, internal_id = _analyze_method(
+            method_node,
+            path_item_node,
+            endpoint_str,
+            path_document,
+            context,
+            internal_id,
+            rules,
+            budget,
+        )
+        internal_id = created
+        _warn_on_truncation(logger, endpoint_str, context, budget)
+        selected += 1
+
+    return rules, internal_id, selected
+
+
+def _iter_operations(
+    context: _AnalysisContext, include: Optional[Callable[[str], bool]]
+) -> Iterator[Tuple[str, YamlNode, YamlNode, OpenAPIDocument]]:
+    """Yield the selected operations as ``(endpoint, node, path item, document)``.
+
+    ``document`` is the file the operation is defined in, which differs from
+    the root document for path items given as a ``$ref``.
+    """
+
+    selector = context.endpoints
+    path_items = context.document.path_items(include)
+    if path_items is None:
         raise OpenAPIAnalyzerError("OpenAPI document must contain a paths mapping")
 
-    for endpoint_path, endpoint_node in _iter_mapping(paths_node):
+    for endpoint_path, endpoint_node in path_items:
         methods_node = endpoint_node
+        path_document = context.document
+        path_item_ref = _get_scalar_value(endpoint_node, "$ref")
+        if path_item_ref:
+            resolved = _resolve_ref(path_item_ref, path_document, context)
+            if resolved is None:
+                continue
+            methods_node, path_document = resolved
         if not isinstance(methods_node.value, dict):
             continue
         for method, method_node in _iter_mapping(methods_node):
-            if method.lower() not in {"get", "post", "put", "delete", "patch"}:
+            if method.lower() not in HTTP_METHODS:
                 continue
-            endpoint_str = f"{endpoint_path} [{method.upper()}]"
-            created, internal_id = _analyze_method(
-                method_node,
-                path.name,
-                endpoint_str,
-                schemas,
-                internal_id,
-                rules,
+            if selector and not selector.matches_method(method):
+                continue
+            yield f"{endpoint_path} [{method.upper()}]", method_node, methods_node, path_document
+
+
+def _prepare_schemas(
+    context: _AnalysisContext,
+    logger: logging.Logger,
+    include: Optional[Callable[[str], bool]],
+) -> None:
+    """Build the schema graph and expand its schemas dependencies first.
+
+    Expanding in topological order means every nested schema is already
+    cached when the schema that references it is expanded, so expansion
+    never recurses. Schemas that reach a cycle or exceed the depth limit
+    depend on where they are used and are left to the endpoints.
+    """
+
+    graph, targets = _build_schema_graph(context, include)
+    context.schema_graph = graph
+    for unresolved in graph.unresolved:
+        logger.warning(
+            "Unresolved schema reference %s in %s at line %d",
+            unresolved.ref,
+            unresolved.source_file,
+            unresolved.line,
+        )
+    max_depth = _max_schema_depth(context)
+    heights, _ = graph.heights()
+    for key in graph.topological_order():
+        height = heights.get(key)
+        if height is not None and height <= max_depth:
+            _expand_schema(targets[key], context, max_depth, set())
+
+
+def _build_schema_graph(
+    context: _AnalysisContext, include: Optional[Callable[[str], bool]]
+) -> Tuple[SchemaGraph, Dict[_SchemaKey, _SchemaTarget]]:
+    """Collect the schemas reachable from the selected operations."""
+
+    graph = SchemaGraph()
+    targets: Dict[_SchemaKey, _SchemaTarget] = {}
+    pending: List[_SchemaTarget] = []
+    reported: Set[Tuple[str, str]] = set()
+
+    def visit(
+        ref: Optional[str],
+        target: Optional[_SchemaTarget],
+        document: OpenAPIDocument,
+        line: int,
+        source: Optional[_SchemaKey],
+    ) -> Optional[_SchemaKey]:
+        if target is None:
+            if ref is None:
+                return None
+            file_part = ref.partition("#")[0]
+            if file_part and context.loader.resolve(ref, document) is None:
+                return None  # Missing documents are reported by the loader.
+            if (ref, document.display_name) not in reported:
+                reported.add((ref, document.display_name))
+                graph.unresolved.append(
+                    UnresolvedReference(ref, document.display_name, line, source)
+                )
+            return None
+        if graph.add_schema(target.key, target.name, target.document.display_name):
+            targets[target.key] = target
+            pending.append(target)
+        return target.key
+
+    for _, method_node, _, document in _iter_operations(context, include):
+        for ref, ref_document, line in _operation_schema_refs(method_node, document, context):
+            key = visit(ref, _resolve_schema(ref, ref_document, context), ref_document, line, None)
+            if key is not None:
+                graph.add_root(key)
+    while pending:
+        target = pending.pop()
+        for kind, label, ref, nested, document, line in _schema_edges(target, context):
+            key = visit(ref, nested, document, line, target.key)
+            if key is not None:
+                graph.add_edge(target.key, SchemaReference(kind, label, key))
+    return graph, targets
+
+
+def _operation_schema_refs(
+    method_node: YamlNode, document: OpenAPIDocument, context: _AnalysisContext
+) -> List[Tuple[str, OpenAPIDocument, int]]:
+    """The schema ``$ref`` values an operation's rules are expanded from."""
+
+    refs: List[Tuple[str, OpenAPIDocument, int]] = []
+    request_body = _request_body_schema(method_node, document, context)
+    if request_body is not None:
+        request_body_node, body_document, _, raw_ref = request_body
+        refs.append((raw_ref, body_document, request_body_node.start_line))
+    for response_node, response_document, raw_ref in _response_schemas(
+        method_node, document, context
+    ):
+        refs.append((raw_ref, response_document, response_node.start_line))
+    return refs
+
+
+def _schema_edges(
+    target: _SchemaTarget, context: _AnalysisContext
+) -> List[Tuple[str, str, Optional[str], Optional[_SchemaTarget], OpenAPIDocument, int]]:
+    """``(kind, label, ref, target, document, line)`` for each schema ``target`` uses.
+
+    Edges follow the effective schema: required properties (including those
+    inherited through ``allOf``), the schema's own ``allOf`` members and its
+    ``oneOf``/``anyOf`` branches.
+    """
+
+    effective = _effective_schema(target, context)
+    edges: List[Tuple[str, str, Optional[str], Optional[_SchemaTarget], OpenAPIDocument, int]] = []
+    # Only required properties expand, so they are looked up directly
+    # instead of walking every property.
+    for prop_name in effective.required:
+        prop = effective.properties.get(prop_name)
+        if prop is None:
+            continue
+        line = prop.node.start_line
+        ref, nested = _items_target(prop, context)
+        if ref or nested:
+            edges.append(("items", prop_name, ref, nested, prop.document, line))
+            continue
+        ref, nested = _nested_target(prop.node, prop.document, prop_name, prop.key, context)
+        if ref or nested:
+            edges.append(("property", prop_name, ref, nested, prop.document, line))
+    for member in effective.all_of:
+        if member.ref is not None:
+            edges.append(
+                (
+                    "allOf",
+                    str(member.position),
+                    member.ref,
+                    member.target,
+                    target.document,
+                    member.line,
+                )
+            )
+    for alternatives in effective.alternatives:
+        for member in alternatives.members:
+            edges.append(
+                (
+                    alternatives.keyword,
+                    str(member.position),
+                    member.ref,
+                    member.target,
+                    alternatives.document,
+                    member.line,
+                )
             )
-            internal_id = created
+    return edges
+
+
+def _write_schema_graph(context: _AnalysisContext, path: Path) -> None:
+    assert context.schema_graph is not None
+    rule_counts = {key: expansion.size for key, expansion in context.expansions.items()}
+    rule_counts.update((key, expansion.size) for key, expansion in context.root_expansions.items())
+    path.write_text(context.schema_graph.to_dot(rule_counts), encoding="utf-8")
 
+
+# Path items are split into this many chunks per worker so that a few
+# expensive endpoints do not leave the other workers idle.
+_CHUNKS_PER_WORKER = 4
+
+# The context of the running analysis. Set in the parent before the pool is
+# created so that forked workers inherit the parsed document read-only;
+# workers started with ``spawn`` open their own copy.
+_WORKER_CONTEXT: Optional[_AnalysisContext] = None
+_WORKER_LOG: Optional[_RecordingHandler] = None
+
+
+class _RecordingHandler(logging.Handler):
+    """Collect worker log records so the parent can replay them in order.
+
+    Records are kept as ``(level, format string, message)``.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: List[Tuple[int, str, str]] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append((record.levelno, str(record.msg), record.getMessage()))
+
+
+def _analyze_paths_in_parallel(
+    context: _AnalysisContext,
+    settings: _AnalysisSettings,
+    jobs: int,
+    logger: logging.Logger,
+) -> List[Rule]:
+    global _WORKER_CONTEXT
+
+    workers = jobs if jobs > 0 else os.cpu_count() or 1
+    names = context.document.path_names(_path_filter(context))
+    if names is None:
+        raise OpenAPIAnalyzerError("OpenAPI document must contain a paths mapping")
+    size = max(1, -(-len(names) // (workers * _CHUNKS_PER_WORKER)))
+    chunks = [names[start : start + size] for start in range(0, len(names), size)]
+    if workers == 1 or len(chunks) < 2:
+        return _analyze_paths(context, logger)
+
+    # Schemas are expanded once here and inherited by forked workers.
+    prepared = _RecordingHandler()
+    logger.addHandler(prepared)
+    try:
+        _prepare_schemas(context, logger, _path_filter(context))
+    finally:
+        logger.removeHandler(prepared)
+
+    _WORKER_CONTEXT = context
+    try:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(chunks)),
+            mp_context=_pool_context(),
+            initializer=_init_worker,
+            initargs=(settings,),
+        ) as pool:
+            results = list(pool.map(_analyze_chunk, chunks))
+    finally:
+        _WORKER_CONTEXT = None
+
+    # Chunks are contiguous and merged in document order; shifting each
+    # chunk's IDs by the IDs used before it reproduces the sequential run.
+    rules: List[Rule] = []
+    offset = 0
+    selected = 0
+    # Workers do not share the loader's memo of missing files, so several
+    # may warn about the same file; like a sequential run, each is reported
+    # once. All other records are replayed as logged.
+    missing = {
+        message
+        for _, template, message in prepared.records
+        if template == MISSING_DOCUMENT_WARNING
+    }
+    for chunk_rules, used_ids, chunk_selected, records in results:
+        for level, template, message in records:
+            if template == MISSING_DOCUMENT_WARNING:
+                if message in missing:
+                    continue
+                missing.add(message)
+            logger.log(level, message)
+        for rule in chunk_rules:
+            rule.internal_id += offset
+            rule.depends_on_internal = {dep + offset for dep in rule.depends_on_internal}
+        rules.extend(chunk_rules)
+        offset += used_ids
+        selected += chunk_selected
+
+    if context.endpoints and not selected:
+        logger.warning("No OpenAPI endpoints matched the selection")
     return rules
 
 
+def _pool_context() -> multiprocessing.context.BaseContext:
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+
+def _init_worker(settings: _AnalysisSettings) -> None:
+    global _WORKER_CONTEXT, _WORKER_LOG
+
+    _WORKER_LOG = _RecordingHandler()
+    worker_logger = logging.Logger("valid_builder.worker")
+    worker_logger.addHandler(_WORKER_LOG)
+    if _WORKER_CONTEXT is None:
+        _WORKER_CONTEXT = _open_context(settings, worker_logger)
+    else:
+        _WORKER_CONTEXT.loader.logger = worker_logger
+
+
+def _analyze_chunk(
+    names: List[str],
+) -> Tuple[List[Rule], int, int, List[Tuple[int, str, str]]]:
+    assert _WORKER_CONTEXT is not None and _WORKER_LOG is not None
+    _WORKER_LOG.records.clear()
+    rules, next_id, selected = _analyze_endpoints(
+        _WORKER_CONTEXT, _WORKER_CONTEXT.loader.logger, set(names).__contains__
+    )
+    return rules, next_id - 1, selected, list(_WORKER_LOG.records)
+
+
+@dataclass(frozen=True)
+class _RuleTemplate:
+    """A schema rule expressed relative to the site that uses the schema.
+
+    ``entity_suffix`` is appended to the use site's base entity and
+    ``depends_on`` is the offset of another template in the same expansion, or
+    ``None`` when the rule depends on whatever the use site depends on.
+    """
+
+    kind: str
+    entity_suffix: str
+    source_file: str
+    start_line: int
+    end_line: int
+    depends_on: Optional[int]
+    args: Tuple[object, ...] = ()
+
+
+# Schemas are identified by the document that defines them and their pointer.
+_SchemaKey = Tuple[Path, str]
+
+
+@dataclass(frozen=True)
+class _SchemaTarget:
+    """A resolved ``$ref`` to a schema, possibly in another document."""
+
+    name: str
+    node: YamlNode
+    document: OpenAPIDocument
+    key: _SchemaKey
+
+
+@dataclass(frozen=True)
+class _SchemaExpansion:
+    """Rule templates for one schema plus how its expansion was bounded.
+
+    Nested schemas are kept as :class:`_NestedExpansion` entries rather than
+    copied, so building an expansion costs the schema's own templates only.
+    ``size`` is the number of templates it flattens to, after truncation.
+    ``height`` counts the schema levels that were expanded, including the
+    schema itself. ``cyclic`` is set when a ``$ref`` pointed back into the
+    active chain somewhere below the schema.
+    """
+
+    templates: Tuple[Union[_RuleTemplate, _NestedExpansion], ...]
+    size: int
+    height: int = 1
+    depth_truncated: bool = False
+    rules_truncated: bool = False
+    cyclic: bool = False
+
+
+@dataclass(frozen=True)
+class _NestedExpansion:
+    """A nested schema's expansion placed below ``entity_prefix``.
+
+    ``depends_on`` is the offset, in the enclosing expansion, of the template
+    its top-level templates depend on.
+    """
+
+    entity_prefix: str
+    depends_on: int
+    expansion: _SchemaExpansion
+
+
+@dataclass(frozen=True)
+class _CompositionMember:
+    """One entry of an ``allOf``, ``oneOf`` or ``anyOf`` list.
+
+    ``target`` is ``None`` for an unresolved ``$ref``; inline members are
+    targets of their own, identified by their pointer below the owner.
+    """
+
+    position: int
+    label: str
+    ref: Optional[str]
+    target: Optional[_SchemaTarget]
+    line: int
+
+
+@dataclass(frozen=True)
+class _Alternatives:
+    """The ``oneOf`` or ``anyOf`` branches a schema value has to match."""
+
+    keyword: str
+    node: YamlNode
+    document: OpenAPIDocument
+    members: Tuple[_CompositionMember, ...]
+
+
+@dataclass(frozen=True)
+class _EffectiveProperty:
+    """A property of an effective schema and the document that defines it."""
+
+    name: str
+    node: YamlNode
+    document: OpenAPIDocument
+    key: _SchemaKey
+
+
+@dataclass(frozen=True)
+class _EffectiveSchema:
+    """A schema with its ``allOf`` members merged in.
+
+    ``required`` maps each required property to the schema node, and its
+    document, that lists it. ``all_of`` holds the schema's own members only;
+    ``alternatives`` includes those inherited through ``allOf``.
+    """
+
+    properties: Dict[str, _EffectiveProperty]
+    required: Dict[str, Tuple[YamlNode, OpenAPIDocument]]
+    all_of: Tuple[_CompositionMember, ...] = ()
+    alternatives: Tuple[_Alternatives, ...] = ()
+
+
+@dataclass
+class _AnalysisContext:
+    document: OpenAPIDocument
+    loader: DocumentLoader
+    max_schema_depth: int = DEFAULT_MAX_SCHEMA_DEPTH
+    max_rules_per_endpoint: int = DEFAULT_MAX_RULES_PER_ENDPOINT
+    endpoints: Optional[EndpointSelector] = None
+    entities: FrozenSet[str] = frozenset(ENDPOINT_ENTITIES)
+    schema_graph: Optional[SchemaGraph] = None
+    expansions: Dict[_SchemaKey, _SchemaExpansion] = field(default_factory=dict)
+    # Expansions started from an endpoint with an empty chain and the full
+    # depth budget; unlike ``expansions`` these may be cyclic or truncated.
+    root_expansions: Dict[_SchemaKey, _SchemaExpansion] = field(default_factory=dict)
+    # Schemas with their ``allOf`` members merged, keyed like ``expansions``.
+    effective_schemas: Dict[_SchemaKey, _EffectiveSchema] = field(default_factory=dict)
+    # Constraint templates and nested schemas of properties, keyed by the
+    # property's pointer. Cyclic schemas are rebuilt for every chain that
+    # reaches them; their properties are only looked at once.
+    property_constraints: Dict[_SchemaKey, Tuple[_RuleTemplate, ...]] = field(
+        default_factory=dict
+    )
+    property_targets: Dict[
+        _SchemaKey, Tuple[Optional[str], Optional[_SchemaTarget], Optional[_SchemaTarget]]
+    ] = field(default_factory=dict)
+    # Parameter templates keyed by the defining document and line.
+    parameter_templates: Dict[Tuple[Path, int], _SchemaExpansion] = field(
+        default_factory=dict
+    )
+
+
+class _EndpointBudget:
+    """Tracks the rules emitted for one endpoint against the configured cap."""
+
+    def __init__(self, max_rules: int) -> None:
+        self.max_rules = max_rules
+        self.emitted = 0
+        self.rules_truncated = False
+        self.depth_truncated = False
+
+    def allow(self, count: int) -> int:
+        """Reserve up to ``count`` rules and return how many may be emitted."""
+
+        if self.max_rules > 0:
+            available = max(self.max_rules - self.emitted, 0)
+            if count > available:
+                self.rules_truncated = True
+                count = available
+        self.emitted += count
+        return count
+
+
+def _warn_on_truncation(
+    logger: logging.Logger,
+    endpoint: str,
+    context: _AnalysisContext,
+    budget: _EndpointBudget,
+) -> None:
+    if budget.depth_truncated:
+        logger.warning(
+            "Schema expansion for %s stopped at the maximum depth of %d nested schemas",
+            endpoint,
+            context.max_schema_depth,
+        )
+    if budget.rules_truncated:
+        logger.warning(
+            "Endpoint %s exceeded the limit of %d rules; remaining rules were skipped",
+            endpoint,
+            context.max_rules_per_endpoint,
+        )
+
+
 def _analyze_method(
     method_node: YamlNode,
-    source_file: str,
+    path_item_node: YamlNode,
     endpoint_str: str,
-    schemas: Dict[str, YamlNode],
+    document: OpenAPIDocument,
+    context: _AnalysisContext,
     internal_id: int,
     rules: List[Rule],
+    budget: _EndpointBudget,
 ) -> Tuple[int, int]:
     current_internal = internal_id
-    request_body_node = _get_mapping_node(method_node, "requestBody")
     request_dep: Optional[int] = None
 
-    if request_body_node:
-        required_node = _get_scalar_node(request_body_node, "required")
-        content_node = _get_mapping_node(request_body_node, "content")
-        media_type, schema_ref = _first_schema_ref(content_node)
-        if required_node and required_node.value is True and schema_ref:
-            description = describe_openapi_request_body_required(
-                method=endpoint_str.split()[1].strip("[]"),
-                path=endpoint_str.split()[0],
-                media_type=media_type or "request body",
-                schema=schema_ref,
-            )
-            rule = Rule(
-                internal_id=current_internal,
-                description=description,
-                source_file=source_file,
-                start_line=request_body_node.start_line,
-                end_line=request_body_node.end_line,
-                source_type=SourceType.OPENAPI,
-                endpoint=endpoint_str,
-                endpoint_entity=schema_ref,
-            )
-            rules.append(rule)
-            request_dep = rule.internal_id
-            current_internal += 1
-
-            if schema_ref in schemas:
-                current_internal = _analyze_schema(
-                    schema_ref,
-                    schemas[schema_ref],
-                    source_file,
-                    rules,
-                    current_internal,
-                    endpoint=endpoint_str,
-                    base_entity=schema_ref,
-                    depends_on=request_dep,
-                    schemas=schemas,
-                )
+    parameters = (
+        _operation_parameters(path_item_node, method_node, document, context)
+        if "parameters" in context.entities
+        else []
+    )
+    for parameter_node, parameter_document in parameters:
+        location = _get_scalar_value(parameter_node, "in")
+        current_internal = _emit_templates(
+            _parameter_templates(parameter_node, parameter_document, context),
+            rules,
+            current_internal,
+            endpoint=endpoint_str,
+            base_entity=location,
+            depends_on=None,
+            budget=budget,
+        )
 
-    responses_node = _get_mapping_node(method_node, "responses")
-    if responses_node:
-        for status_code, response_node in _iter_mapping(responses_node):
-            content_node = _get_mapping_node(response_node, "content")
-            _, schema_ref = _first_schema_ref(content_node)
-            if not schema_ref or schema_ref not in schemas:
-                continue
+    request_body = _request_body_schema(method_node, document, context)
+    if request_body is not None and budget.allow(1):
+        request_body_node, body_document, media_type, raw_ref = request_body
+        schema_ref = _normalize_ref(raw_ref)
+        description = describe_openapi_request_body_required(
+            method=endpoint_str.split()[1].strip("[]"),
+            path=endpoint_str.split()[0],
+            media_type=media_type or "request body",
+            schema=schema_ref,
+        )
+        rule = Rule(
+            internal_id=current_internal,
+            description=description,
+            source_file=body_document.display_name,
+            start_line=request_body_node.start_line,
+            end_line=request_body_node.end_line,
+            source_type=SourceType.OPENAPI,
+            endpoint=endpoint_str,
+            endpoint_entity=schema_ref,
+        )
+        rules.append(rule)
+        request_dep = rule.internal_id
+        current_internal += 1
+
+        target = _resolve_schema(raw_ref, body_document, context)
+        if target is not None:
             current_internal = _analyze_schema(
-                schema_ref,
-                schemas[schema_ref],
-                source_file,
+                target,
                 rules,
                 current_internal,
                 endpoint=endpoint_str,
                 base_entity=schema_ref,
                 depends_on=request_dep,
-                schemas=schemas,
+                context=context,
+                budget=budget,
             )
 
+    for _, response_document, raw_ref in _response_schemas(method_node, document, context):
+        target = _resolve_schema(raw_ref, response_document, context)
+        if target is None:
+            continue
+        current_internal = _analyze_schema(
+            target,
+            rules,
+            current_internal,
+            endpoint=endpoint_str,
+            base_entity=target.name,
+            depends_on=request_dep,
+            context=context,
+            budget=budget,
+        )
+
     return current_internal, current_internal
 
 
+def _request_body_schema(
+    method_node: YamlNode, document: OpenAPIDocument, context: _AnalysisContext
+) -> Optional[Tuple[YamlNode, OpenAPIDocument, Optional[str], str]]:
+    """The required request body as ``(node, document, media type, schema ref)``.
+
+    Request bodies given as a ``$ref`` into ``components.requestBodies`` are
+    resolved first. Optional bodies, bodies without a schema ref and runs that
+    skip request bodies yield ``None``.
+    """
+
+    if "requestBody" not in context.entities:
+        return None
+    resolved = _resolve_component(_get_mapping_node(method_node, "requestBody"), document, context)
+    if resolved is None:
+        return None
+    request_body_node, body_document = resolved
+    required_node = _get_scalar_node(request_body_node, "required")
+    media_type, raw_ref = _first_schema_ref(_get_mapping_node(request_body_node, "content"))
+    if not (required_node and required_node.value is True and _normalize_ref(raw_ref)):
+        return None
+    return request_body_node, body_document, media_type, raw_ref
+
+
+def _response_schemas(
+    method_node: YamlNode, document: OpenAPIDocument, context: _AnalysisContext
+) -> List[Tuple[YamlNode, OpenAPIDocument, str]]:
+    """``(node, document, schema ref)`` for each response with a schema ref.
+
+    Responses given as a ``$ref`` into ``components.responses`` are resolved.
+    """
+
+    responses_node = _get_mapping_node(method_node, "responses")
+    if not responses_node or "responses" not in context.entities:
+        return []
+    schemas: List[Tuple[YamlNode, OpenAPIDocument, str]] = []
+    for _, response_node in _iter_mapping(responses_node):
+        resolved = _resolve_component(response_node, document, context)
+        if resolved is None:
+            continue
+        node, response_document = resolved
+        _, raw_ref = _first_schema_ref(_get_mapping_node(node, "content"))
+        if raw_ref:
+            schemas.append((node, response_document, raw_ref))
+    return schemas
+
+
+def _operation_parameters(
+    path_item_node: YamlNode,
+    method_node: YamlNode,
+    document: OpenAPIDocument,
+    context: _AnalysisContext,
+) -> List[Tuple[YamlNode, OpenAPIDocument]]:
+    """The effective parameters of an operation, with ``$ref`` resolved.
+
+    Path-level parameters are inherited; an operation parameter with the same
+    ``name`` and ``in`` replaces the inherited one.
+    """
+
+    merged: Dict[Tuple[str, str], Tuple[YamlNode, OpenAPIDocument]] = {}
+    for owner in (path_item_node, method_node):
+        parameters_node = _get_sequence_node(owner, "parameters")
+        if not parameters_node:
+            continue
+        for item in parameters_node.value:
+            if not isinstance(item, YamlNode):
+                continue
+            resolved = _resolve_component(item, document, context)
+            if resolved is None:
+                continue
+            name = _get_scalar_value(resolved[0], "name")
+            location = _get_scalar_value(resolved[0], "in")
+            if not isinstance(name, str) or not isinstance(location, str):
+                continue
+            merged.pop((name, location), None)
+            merged[(name, location)] = resolved
+    return list(merged.values())
+
+
+def _parameter_templates(
+    node: YamlNode, document: OpenAPIDocument, context: _AnalysisContext
+) -> _SchemaExpansion:
+    """Rule templates for one parameter, computed once per run.
+
+    Templates are relative to the parameter location, so a shared component
+    or inherited path-level parameter is reused by every operation.
+    """
+
+    key = (document.path, node.start_line)
+    cached = context.parameter_templates.get(key)
+    if cached is not None:
+        return cached
+
+    name = _get_scalar_value(node, "name")
+    location = _get_scalar_value(node, "in")
+    schema_node = _get_mapping_node(node, "schema")
+    schema_file = document.display_name
+    if schema_node is not None:
+        target = _resolve_schema(_get_scalar_value(schema_node, "$ref"), document, context)
+        if target is not None:
+            schema_node, schema_file = target.node, target.document.display_name
+
+    templates: List[_RuleTemplate] = []
+    required = location == "path" or _is_true(_get_scalar_value(node, "required"))
+    if required:
+        templates.append(
+            _RuleTemplate(
+                kind="parameter",
+                entity_suffix=f".{name}",
+                source_file=document.display_name,
+                start_line=node.start_line,
+                end_line=node.end_line,
+                depends_on=None,
+                args=(location, name, _get_scalar_value(schema_node, "type")),
+            )
+        )
+    if schema_node is not None:
+        for template in _constraint_templates(name, schema_node, schema_file):
+            templates.append(replace(template, depends_on=0) if required else template)
+
+    context.parameter_templates[key] = _SchemaExpansion(tuple(templates), len(templates))
+    return context.parameter_templates[key]
+
+
+def _resolve_component(
+    node: Optional[YamlNode], document: OpenAPIDocument, context: _AnalysisContext
+) -> Optional[Tuple[YamlNode, OpenAPIDocument]]:
+    """Follow the ``$ref`` chain of a parameter, request body or response.
+
+    Returns the node itself when it is not a reference, and ``None`` for
+    missing targets or reference loops.
+    """
+
+    seen: Set[Tuple[Path, str]] = set()
+    while node is not None:
+        ref = _get_scalar_value(node, "$ref")
+        if not isinstance(ref, str):
+            return node, document
+        if (document.path, ref) in seen:
+            return None
+        seen.add((document.path, ref))
+        resolved = _resolve_ref(ref, document, context)
+        if resolved is None:
+            return None
+        node, document = resolved
+    return None
+
+
 def _analyze_schema(
-    name: str,
-    node: YamlNode,
-    source_file: str,
+    target: _SchemaTarget,
     rules: List[Rule],
     internal_id: int,
     *,
     endpoint: Optional[str],
     base_entity: str,
     depends_on: Optional[int],
-    schemas: Dict[str, YamlNode],
+    context: _AnalysisContext,
+    budget: _EndpointBudget,
 ) -> int:
-    current_internal = internal_id
-    required_node = _get_sequence_node(node, "required")
-    required_fields: List[str] = []
-    if required_node:
-        for item in required_node.value:
-            if isinstance(item, YamlNode):
-                required_fields.append(item.value)
-            else:
-                required_fields.append(item)
+    expansion = context.root_expansions.get(target.key)
+    if expansion is None:
+        expansion = _expand_schema(target, context, _max_schema_depth(context), set())
+        context.root_expansions[target.key] = expansion
+    budget.depth_truncated = budget.depth_truncated or expansion.depth_truncated
+    budget.rules_truncated = budget.rules_truncated or expansion.rules_truncated
+    return _emit_templates(
+        expansion,
+        rules,
+        internal_id,
+        endpoint=endpoint,
+        base_entity=base_entity,
+        depends_on=depends_on,
+        budget=budget,
+    )
 
-    properties_node = _get_mapping_node(node, "properties")
-    if properties_node and isinstance(properties_node.value, dict):
-        for prop_name, prop_node in _iter_mapping(properties_node):
-            if prop_name not in required_fields:
-                continue
-            type_hint = _get_scalar_value(prop_node, "type")
-            description = describe_openapi_required_property(
-                name,
-                prop_name,
-                type_hint=type_hint,
+
+def _emit_templates(
+    expansion: _SchemaExpansion,
+    rules: List[Rule],
+    internal_id: int,
+    *,
+    endpoint: Optional[str],
+    base_entity: str,
+    depends_on: Optional[int],
+    budget: _EndpointBudget,
+) -> int:
+    """Turn templates into rules for one use site, within the endpoint budget."""
+
+    count = budget.allow(expansion.size)
+    for offset, (entity_suffix, template_dep, template) in enumerate(
+        islice(_iter_templates(expansion), count)
+    ):
+        endpoint_entity = f"{base_entity}{entity_suffix}"
+        rule = Rule(
+            internal_id=internal_id + offset,
+            description=_describe_template(template, endpoint_entity),
+            source_file=template.source_file,
+            start_line=template.start_line,
+            end_line=template.end_line,
+            source_type=SourceType.OPENAPI,
+            endpoint=endpoint,
+            endpoint_entity=endpoint_entity,
+        )
+        if template_dep is not None:
+            rule.depends_on_internal.add(internal_id + template_dep)
+        elif depends_on is not None:
+            rule.depends_on_internal.add(depends_on)
+        rules.append(rule)
+    return internal_id + count
+
+
+def _iter_templates(
+    expansion: _SchemaExpansion,
+) -> Iterator[Tuple[str, Optional[int], _RuleTemplate]]:
+    """Flatten an expansion into ``(entity suffix, depends_on, template)``.
+
+    Nested expansions are walked with an explicit stack. Offsets are positions
+    in the flattened sequence; each level stops after its own ``size``.
+    """
+
+    position = 0
+    # Per level: remaining entries, flat position to stop at, entity prefix,
+    # flat position of the level's first template and its default dependency.
+    stack: List[Tuple[Iterator, int, str, int, Optional[int]]] = [
+        (iter(expansion.templates), expansion.size, "", 0, None)
+    ]
+    while stack:
+        entries, stop, prefix, base, default_dep = stack[-1]
+        entry = next(entries, None) if position < stop else None
+        if entry is None:
+            stack.pop()
+        elif isinstance(entry, _NestedExpansion):
+            stack.append(
+                (
+                    iter(entry.expansion.templates),
+                    min(stop, position + entry.expansion.size),
+                    f"{prefix}{entry.entity_prefix}",
+                    position,
+                    base + entry.depends_on,
+                )
             )
-            endpoint_entity = f"{base_entity}.{prop_name}"
-            rule = Rule(
-                internal_id=current_internal,
-                description=description,
-                source_file=source_file,
-                start_line=node.start_line,
-                end_line=node.end_line,
-                source_type=SourceType.OPENAPI,
-                endpoint=endpoint,
-                endpoint_entity=endpoint_entity,
+        else:
+            template_dep = default_dep if entry.depends_on is None else base + entry.depends_on
+            yield f"{prefix}{entry.entity_suffix}", template_dep, entry
+            position += 1
+
+
+def _max_schema_depth(context: _AnalysisContext) -> int:
+    return context.max_schema_depth if context.max_schema_depth > 0 else sys.maxsize
+
+
+def _expand_schema(
+    target: _SchemaTarget,
+    context: _AnalysisContext,
+    remaining_depth: int,
+    active: Set[_SchemaKey],
+) -> _SchemaExpansion:
+    """Return the rule templates for ``name``.
+
+    ``active`` holds the schemas currently being expanded above this one; a
+    ``$ref`` back into it ends the expansion there. Complete, acyclic
+    expansions do not depend on where they are used and are computed once per
+    run.
+    """
+
+    cached = context.expansions.get(target.key)
+    if cached is not None and cached.height <= remaining_depth:
+        return cached
+    active.add(target.key)
+    try:
+        expansion = _build_schema_templates(target, context, remaining_depth, active)
+    finally:
+        active.discard(target.key)
+    if not expansion.depth_truncated and not expansion.cyclic:
+        context.expansions[target.key] = expansion
+    return expansion
+
+
+def _build_schema_templates(
+    target: _SchemaTarget,
+    context: _AnalysisContext,
+    remaining_depth: int,
+    active: Set[_SchemaKey],
+) -> _SchemaExpansion:
+    name = target.name
+    limit = context.max_rules_per_endpoint
+    templates: List[Union[_RuleTemplate, _NestedExpansion]] = []
+    # Number of templates ``templates`` flattens to.
+    size = 0
+    height = 1
+    depth_truncated = False
+    rules_truncated = False
+    cyclic = False
+
+    def expand_nested(nested_target: _SchemaTarget, entity_prefix: str, prop_dep: int) -> None:
+        nonlocal size, height, depth_truncated, rules_truncated, cyclic
+        if nested_target.key in active:
+            cyclic = True
+            return
+        if remaining_depth <= 1:
+            depth_truncated = True
+            return
+        nested = _expand_schema(nested_target, context, remaining_depth - 1, active)
+        height = max(height, nested.height + 1)
+        depth_truncated = depth_truncated or nested.depth_truncated
+        rules_truncated = rules_truncated or nested.rules_truncated
+        cyclic = cyclic or nested.cyclic
+        if nested.size:
+            templates.append(_NestedExpansion(entity_prefix, prop_dep, nested))
+            size += nested.size
+
+    effective = _effective_schema(target, context)
+
+    # Properties are walked once. Required, items and nested templates come
+    # first because dependencies point into them; per-property constraints
+    # are buffered and appended after them.
+    property_templates: List[_RuleTemplate] = []
+    for prop in effective.properties.values():
+        if limit > 0 and size > limit:
+            break
+        prop_name = prop.name
+        prop_node = prop.node
+        property_templates.extend(_property_constraints(prop, context))
+        declaration = effective.required.get(prop_name)
+        if declaration is None:
+            continue
+        declaring_node, declaring_document = declaration
+        type_hint = _get_scalar_value(prop_node, "type")
+        prop_dep = size
+        size += 1
+        templates.append(
+            _RuleTemplate(
+                kind="required",
+                entity_suffix=f".{prop_name}",
+                source_file=declaring_document.display_name,
+                start_line=declaring_node.start_line,
+                end_line=declaring_node.end_line,
+                depends_on=None,
+                args=(name, prop_name, type_hint),
             )
-            if depends_on is not None:
-                rule.depends_on_internal.add(depends_on)
-            rules.append(rule)
-            current_internal += 1
-            prop_dep = rule.internal_id
-
-            items_ref = _get_ref_from_items(prop_node)
-            if items_ref:
-                array_rule = Rule(
-                    internal_id=current_internal,
-                    description=describe_openapi_array_items(
-                        f"{endpoint_entity}[]", f"items must follow {items_ref}",
-                    ),
-                    source_file=source_file,
+        )
+
+        items_ref, items_target, nested_target = _property_targets(prop, context)
+        if items_ref or items_target:
+            size += 1
+            templates.append(
+                _RuleTemplate(
+                    kind="items",
+                    entity_suffix=f".{prop_name}[]",
+                    source_file=prop.document.display_name,
                     start_line=prop_node.start_line,
                     end_line=prop_node.end_line,
-                    source_type=SourceType.OPENAPI,
-                    endpoint=endpoint,
-                    endpoint_entity=f"{endpoint_entity}[]",
+                    depends_on=prop_dep,
+                    args=(_normalize_ref(items_ref) if items_ref else items_target.name,),
                 )
-                array_rule.depends_on_internal.add(prop_dep)
-                rules.append(array_rule)
-                current_internal += 1
-                if items_ref in schemas:
-                    current_internal = _analyze_schema(
-                        items_ref,
-                        schemas[items_ref],
-                        source_file,
-                        rules,
-                        current_internal,
-                        endpoint=endpoint,
-                        base_entity=f"{endpoint_entity}[]",
-                        depends_on=prop_dep,
-                        schemas=schemas,
-                    )
-            else:
-                ref = _normalize_ref(_get_scalar_value(prop_node, "$ref"))
-                if ref and ref in schemas:
-                    current_internal = _analyze_schema(
-                        ref,
-                        schemas[ref],
-                        source_file,
-                        rules,
-                        current_internal,
-                        endpoint=endpoint,
-                        base_entity=endpoint_entity,
-                        depends_on=prop_dep,
-                        schemas=schemas,
-                    )
-
-    # Enumerations
-    if properties_node and isinstance(properties_node.value, dict):
+            )
+            if items_target is not None:
+                expand_nested(items_target, f".{prop_name}[]", prop_dep)
+        elif nested_target is not None:
+            expand_nested(nested_target, f".{prop_name}", prop_dep)
+
+    for alternatives in effective.alternatives:
+        if limit > 0 and size > limit:
+            break
+        alternatives_dep = size
+        size += 1
+        templates.append(
+            _RuleTemplate(
+                kind="alternatives",
+                entity_suffix="",
+                source_file=alternatives.document.display_name,
+                start_line=alternatives.node.start_line,
+                end_line=alternatives.node.end_line,
+                depends_on=None,
+                args=(alternatives.keyword, tuple(member.label for member in alternatives.members)),
+            )
+        )
+        for member in alternatives.members:
+            if member.target is not None:
+                expand_nested(
+                    member.target, f".{alternatives.keyword}[{member.label}]", alternatives_dep
+                )
+    templates.extend(property_templates)
+    size += len(property_templates)
+
+    if limit > 0 and size > limit:
+        # Dependencies only point backwards, so a prefix stays consistent.
+        # Entries that start past the limit are dropped; flattening stops
+        # inside the last one.
+        kept = 0
+        for count, entry in enumerate(templates):
+            if kept >= limit:
+                del templates[count:]
+                break
+            kept += entry.expansion.size if isinstance(entry, _NestedExpansion) else 1
+        size = limit
+        rules_truncated = True
+    return _SchemaExpansion(
+        templates=tuple(templates),
+        size=size,
+        height=height,
+        depth_truncated=depth_truncated,
+        rules_truncated=rules_truncated,
+        cyclic=cyclic,
+    )
+
+
+def _property_constraints(
+    prop: _EffectiveProperty, context: _AnalysisContext
+) -> Tuple[_RuleTemplate, ...]:
+    cached = context.property_constraints.get(prop.key)
+    if cached is None:
+        cached = tuple(_constraint_templates(prop.name, prop.node, prop.document.display_name))
+        context.property_constraints[prop.key] = cached
+    return cached
+
+
+def _property_targets(
+    prop: _EffectiveProperty, context: _AnalysisContext
+) -> Tuple[Optional[str], Optional[_SchemaTarget], Optional[_SchemaTarget]]:
+    """The ``items`` reference and target of a property, or its nested schema."""
+
+    cached = context.property_targets.get(prop.key)
+    if cached is None:
+        items_ref, items_target = _items_target(prop, context)
+        nested_target = None
+        if not (items_ref or items_target):
+            _, nested_target = _nested_target(
+                prop.node, prop.document, prop.name, prop.key, context
+            )
+        cached = (items_ref, items_target, nested_target)
+        context.property_targets[prop.key] = cached
+    return cached
+
+
+def _required_names(node: YamlNode) -> List[str]:
+    required_node = _get_sequence_node(node, "required")
+    if not required_node:
+        return []
+    return [item.value if isinstance(item, YamlNode) else item for item in required_node.value]
+
+
+# Keywords that only annotate a schema. An inline schema made of these and an
+# ``allOf`` of references is identified by its members alone, so every
+# property using the same composition shares one expansion.
+_ANNOTATION_KEYWORDS = frozenset(
+    {
+        "description",
+        "title",
+        "nullable",
+        "readOnly",
+        "writeOnly",
+        "deprecated",
+        "example",
+        "examples",
+    }
+)
+_ALTERNATIVE_KEYWORDS = ("oneOf", "anyOf")
+
+
+def _effective_schema(target: _SchemaTarget, context: _AnalysisContext) -> _EffectiveSchema:
+    """``target`` with its ``allOf`` members merged in, computed once per run."""
+
+    return _merge_schema(target, context, set())[0]
+
+
+def _merge_schema(
+    target: _SchemaTarget, context: _AnalysisContext, merging: Set[_SchemaKey]
+) -> Tuple[_EffectiveSchema, bool]:
+    """Merge ``allOf`` members in order, then the schema's own keywords.
+
+    A property redefined by a later member or the schema itself takes the most
+    specific definition. Members already being merged (an ``allOf`` cycle) are
+    skipped; the second value is ``False`` when that happened, and such partial
+    merges are not cached.
+    """
+
+    cached = context.effective_schemas.get(target.key)
+    if cached is not None:
+        return cached, True
+
+    node = target.node
+    properties: Dict[str, _EffectiveProperty] = {}
+    required: Dict[str, Tuple[YamlNode, OpenAPIDocument]] = {}
+    alternatives: List[_Alternatives] = []
+    complete = True
+
+    merging.add(target.key)
+    all_of = _composition_members(node, "allOf", target, context)
+    for member in all_of:
+        if member.target is None:
+            continue
+        if member.target.key in merging:
+            complete = False
+            continue
+        merged, member_complete = _merge_schema(member.target, context, merging)
+        complete = complete and member_complete
+        properties.update(merged.properties)
+        required.update(merged.required)
+        alternatives.extend(merged.alternatives)
+    merging.discard(target.key)
+
+    properties_node = _get_mapping_node(node, "properties")
+    if properties_node is not None:
         for prop_name, prop_node in _iter_mapping(properties_node):
-            enum_node = _get_sequence_node(prop_node, "enum")
-            if not enum_node:
-                continue
-            values: List[str] = []
-            for item in enum_node.value:
-                if isinstance(item, YamlNode):
-                    values.append(item.value)
-                else:
-                    values.append(str(item))
-            description = describe_openapi_enum(f"{base_entity}.{prop_name}", values)
-            enum_rule = Rule(
-                internal_id=current_internal,
-                description=description,
-                source_file=source_file,
-                start_line=prop_node.start_line,
-                end_line=prop_node.end_line,
-                source_type=SourceType.OPENAPI,
-                endpoint=endpoint,
-                endpoint_entity=f"{base_entity}.{prop_name}",
+            pointer = f"{target.key[1]}/properties/{_escape_pointer(prop_name)}"
+            properties[prop_name] = _EffectiveProperty(
+                prop_name, prop_node, target.document, (target.key[0], pointer)
+            )
+    for prop_name in _required_names(node):
+        required[prop_name] = (node, target.document)
+    for keyword in _ALTERNATIVE_KEYWORDS:
+        members_node = _get_sequence_node(node, keyword)
+        if members_node is not None:
+            alternatives.append(
+                _Alternatives(
+                    keyword,
+                    members_node,
+                    target.document,
+                    _composition_members(node, keyword, target, context),
+                )
             )
-            if depends_on is not None:
-                enum_rule.depends_on_internal.add(depends_on)
-            rules.append(enum_rule)
-            current_internal += 1
-
-    return current_internal
-
-
-def _extract_schemas(root: YamlNode) -> Dict[str, YamlNode]:
-    schemas: Dict[str, YamlNode] = {}
-    components = _get_mapping_node(root, "components")
-    if not components:
-        return schemas
-    schemas_node = _get_mapping_node(components, "schemas")
-    if not schemas_node:
-        return schemas
-    for name, node in _iter_mapping(schemas_node):
-        schemas[name] = node
-    return schemas
+
+    effective = _EffectiveSchema(properties, required, all_of, tuple(alternatives))
+    if complete:
+        context.effective_schemas[target.key] = effective
+    return effective, complete
+
+
+def _composition_members(
+    node: YamlNode, keyword: str, owner: _SchemaTarget, context: _AnalysisContext
+) -> Tuple[_CompositionMember, ...]:
+    members_node = _get_sequence_node(node, keyword)
+    if members_node is None:
+        return ()
+    members: List[_CompositionMember] = []
+    for position, member_node in enumerate(members_node.value):
+        if not isinstance(member_node, YamlNode):
+            continue
+        ref = _get_scalar_value(member_node, "$ref")
+        if isinstance(ref, str):
+            target = _resolve_schema(ref, owner.document, context)
+            label = target.name if target is not None else _normalize_ref(ref)
+        else:
+            ref = None
+            pointer = f"{owner.key[1]}/{keyword}/{position}"
+            target = _SchemaTarget(owner.name, member_node, owner.document, (owner.key[0], pointer))
+            label = _get_scalar_value(member_node, "title") or f"option {position + 1}"
+        members.append(_CompositionMember(position, label, ref, target, member_node.start_line))
+    return tuple(members)
+
+
+def _nested_target(
+    node: YamlNode,
+    document: OpenAPIDocument,
+    name: str,
+    key: _SchemaKey,
+    context: _AnalysisContext,
+) -> Tuple[Optional[str], Optional[_SchemaTarget]]:
+    """The raw ``$ref`` and the schema a property or ``items`` node expands into.
+
+    A ``$ref`` resolves to the referenced schema. An inline schema using
+    ``allOf``, ``oneOf`` or ``anyOf`` becomes a schema of its own, named after
+    its first ``allOf`` reference; when it only composes references, it is
+    keyed by them so that every use shares one merge and expansion.
+    """
+
+    ref = _get_scalar_value(node, "$ref")
+    if isinstance(ref, str):
+        return ref, _resolve_schema(ref, document, context)
+    if not isinstance(node.value, dict):
+        return None, None
+    if not any(keyword in node.value for keyword in ("allOf",) + _ALTERNATIVE_KEYWORDS):
+        return None, None
+
+    inline = _SchemaTarget(name, node, document, key)
+    members = _composition_members(node, "allOf", inline, context)
+    referenced = [member.target for member in members if member.ref and member.target]
+    if referenced:
+        name = referenced[0].name
+    if (
+        referenced
+        and len(referenced) == len(members)
+        and set(node.value) <= _ANNOTATION_KEYWORDS | {"allOf"}
+    ):
+        member_keys = ",".join(f"{member.key[0]}#{member.key[1]}" for member in referenced)
+        key = (referenced[0].key[0], f"allOf({member_keys})")
+    return None, _SchemaTarget(name, node, document, key)
+
+
+def _items_target(
+    prop: _EffectiveProperty, context: _AnalysisContext
+) -> Tuple[Optional[str], Optional[_SchemaTarget]]:
+    items_node = _get_mapping_node(prop.node, "items")
+    if items_node is None:
+        return None, None
+    key = (prop.key[0], f"{prop.key[1]}/items")
+    return _nested_target(items_node, prop.document, prop.name, key, context)
+
+
+def _escape_pointer(token: str) -> str:
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def _constraint_templates(
+    prop_name: str, prop_node: YamlNode, source_file: str
+) -> List[_RuleTemplate]:
+    """Templates for the value constraints declared directly on a property."""
+
+    if not isinstance(prop_node.value, dict):
+        return []
+    constraints: List[Tuple[str, tuple]] = []
+
+    enum_node = _get_sequence_node(prop_node, "enum")
+    if enum_node:
+        values = tuple(
+            item.value if isinstance(item, YamlNode) else str(item) for item in enum_node.value
+        )
+        constraints.append(("enum", (values,)))
+
+    min_length = _get_scalar_value(prop_node, "minLength")
+    max_length = _get_scalar_value(prop_node, "maxLength")
+    if min_length is not None or max_length is not None:
+        constraints.append(("length", (min_length, max_length)))
+
+    minimum, exclusive_minimum = _range_bound(prop_node, "minimum", "exclusiveMinimum")
+    maximum, exclusive_maximum = _range_bound(prop_node, "maximum", "exclusiveMaximum")
+    if minimum is not None or maximum is not None:
+        constraints.append(("range", (minimum, maximum, exclusive_minimum, exclusive_maximum)))
+
+    pattern = _get_scalar_value(prop_node, "pattern")
+    if pattern is not None:
+        constraints.append(("pattern", (pattern,)))
+
+    value_format = _get_scalar_value(prop_node, "format")
+    if value_format is not None:
+        constraints.append(("format", (value_format,)))
+
+    nullable = _get_scalar_value(prop_node, "nullable")
+    if nullable is not None:
+        constraints.append(("nullable", (_is_true(nullable),)))
+
+    return [
+        _RuleTemplate(
+            kind=kind,
+            entity_suffix=f".{prop_name}",
+            source_file=source_file,
+            start_line=prop_node.start_line,
+            end_line=prop_node.end_line,
+            depends_on=None,
+            args=args,
+        )
+        for kind, args in constraints
+    ]
+
+
+def _range_bound(
+    prop_node: YamlNode, bound_key: str, exclusive_key: str
+) -> Tuple[Optional[str], bool]:
+    """Return a numeric bound and whether it is exclusive.
+
+    Both the OpenAPI 3.0 boolean form (``exclusiveMinimum: true`` next to
+    ``minimum``) and the 3.1 numeric form (``exclusiveMinimum: 5``) are read.
+    """
+
+    bound = _get_scalar_value(prop_node, bound_key)
+    exclusive = _get_scalar_value(prop_node, exclusive_key)
+    if exclusive is None or isinstance(exclusive, bool) or exclusive.lower() in {"true", "false"}:
+        return bound, exclusive is not None and _is_true(exclusive)
+    return exclusive, True
+
+
+def _is_true(value: object) -> bool:
+    return value is True or str(value).lower() == "true"
+
+
+def _describe_template(template: _RuleTemplate, endpoint_entity: str) -> str:
+    if template.kind == "parameter":
+        location, name, type_hint = template.args
+        return describe_openapi_required_parameter(location, name, type_hint=type_hint)
+    if template.kind == "required":
+        schema, prop_name, type_hint = template.args
+        return describe_openapi_required_property(schema, prop_name, type_hint=type_hint)
+    if template.kind == "items":
+        return describe_openapi_array_items(endpoint_entity, f"items must follow {template.args[0]}")
+    if template.kind == "enum":
+        return describe_openapi_enum(endpoint_entity, template.args[0])
+    if template.kind == "length":
+        return describe_openapi_length(endpoint_entity, *template.args)
+    if template.kind == "range":
+        minimum, maximum, exclusive_minimum, exclusive_maximum = template.args
+        return describe_openapi_range(
+            endpoint_entity,
+            minimum,
+            maximum,
+            exclusive_minimum=exclusive_minimum,
+            exclusive_maximum=exclusive_maximum,
+        )
+    if template.kind == "pattern":
+        return describe_openapi_pattern(endpoint_entity, template.args[0])
+    if template.kind == "format":
+        return describe_openapi_format(endpoint_entity, template.args[0])
+    if template.kind == "nullable":
+        return describe_openapi_nullable(endpoint_entity, template.args[0])
+    if template.kind == "alternatives":
+        keyword, labels = template.args
+        return describe_openapi_alternatives(endpoint_entity, labels, exclusive=keyword == "oneOf")
+    raise OpenAPIAnalyzerError(f"Unknown rule template kind: {template.kind}")
+
+
+def _resolve_ref(
+    ref: str, document: OpenAPIDocument, context: _AnalysisContext
+) -> Optional[Tuple[YamlNode, OpenAPIDocument]]:
+    """Resolve a (possibly external) ``$ref`` to its node and document."""
+
+    resolved = context.loader.resolve(ref, document)
+    if resolved is None:
+        return None
+    target_document, pointer = resolved
+    node = target_document.resolve_pointer(pointer)
+    if node is None:
+        return None
+    return node, target_document
+
+
+def _resolve_schema(
+    ref: Optional[str], document: OpenAPIDocument, context: _AnalysisContext
+) -> Optional[_SchemaTarget]:
+    """Resolve a schema ``$ref`` relative to the document that contains it.
+
+    Local references are looked up by name in ``components.schemas``; file
+    references are loaded through the run's document loader.
+    """
+
+    if not isinstance(ref, str):
+        return None
+    name = _normalize_ref(ref)
+    if not name:
+        return None
+    if ref.startswith("#"):
+        node = document.schema(name)
+        if node is None:
+            return None
+        return _SchemaTarget(name, node, document, (document.path, f"/components/schemas/{name}"))
+    resolved = _resolve_ref(ref, document, context)
+    if resolved is None:
+        return None
+    node, target_document = resolved
+    pointer = ref.partition("#")[2]
+    if not pointer.strip("/"):
+        name = Path(ref.partition("#")[0]).stem
+    return _SchemaTarget(name, node, target_document, (target_document.path, pointer.rstrip("/")))
 
 
 def _first_schema_ref(content_node: Optional[YamlNode]) -> Tuple[Optional[str], Optional[str]]:
@@ -277,30 +1559,12 @@ def _first_schema_ref(content_node: Optional[YamlNode]) -> Tuple[Optional[str],
         return None, None
     for media_type, node in _iter_mapping(content_node):
         schema_node = _get_mapping_node(node, "schema")
-        ref = _normalize_ref(_get_scalar_value(schema_node, "$ref"))
+        ref = _get_scalar_value(schema_node, "$ref")
         if ref:
             return media_type, ref
     return None, None
 
 
-def _get_ref_from_items(prop_node: YamlNode) -> Optional[str]:
-    items_node = _get_mapping_node(prop_node, "items")
-    if not items_node:
-        return None
-    ref = _normalize_ref(_get_scalar_value(items_node, "$ref"))
-    if ref:
-        return ref
-    all_of_node = _get_sequence_node(items_node, "allOf")
-    if all_of_node and isinstance(all_of_node.value, list):
-        for candidate in all_of_node.value:
-            if not isinstance(candidate, YamlNode):
-                continue
-            candidate_ref = _normalize_ref(_get_scalar_value(candidate, "$ref"))
-            if candidate_ref:
-                return candidate_ref
-    return None
-
-
 def _get_mapping_node(node: YamlNode, key: str) -> Optional[YamlNode]:
     if not isinstance(node.value, dict):
         return None
@@ -342,155 +1606,3 @@ def _iter_mapping(node: YamlNode) -> Iterable[Tuple[str, YamlNode]]:
     if not isinstance(node.value, dict):
         return []
     return node.value.items()
-
-
-# ----------------------
-# Minimal YAML parser
-# ----------------------
-
-
-def _parse_yaml_with_lines(text: str) -> YamlNode:
-    lines = text.splitlines()
-    node, _ = _parse_block(lines, 0, 0)
-    if node is None:
-        raise OpenAPIAnalyzerError("Empty YAML content")
-    return node
-
-
-def _parse_block(lines: List[str], index: int, indent: int) -> Tuple[Optional[YamlNode], int]:
-    while index < len(lines) and not lines[index].strip():
-        index += 1
-    if index >= len(lines):
-        return None, index
-
-    first_line = lines[index]
-    first_indent = _leading_spaces(first_line)
-    if first_indent < indent:
-        return None, index
-
-    use_list = first_line.strip().startswith("- ")
-    if use_list:
-        return _parse_list(lines, index, indent)
-    return _parse_mapping(lines, index, indent)
-
-
-def _parse_list(lines: List[str], index: int, indent: int) -> Tuple[YamlNode, int]:
-    items: List[YamlNode] = []
-    while index < len(lines):
-        line = lines[index]
-        stripped_line = line.strip()
-        if not stripped_line or stripped_line in {"}", "]"}:
-            index += 1
-            continue
-        current_indent = _leading_spaces(line)
-        if current_indent < indent:
-            break
-        stripped = line.strip()
-        if not stripped.startswith("- "):
-            break
-        start_line = index + 1
-        content = stripped[2:]
-        if content == "":
-            child, index = _parse_block(lines, index + 1, current_indent + 2)
-            if child:
-                child.start_line = start_line
-                items.append(child)
-            continue
-        if ":" in content:
-            key, value_part = content.split(":", 1)
-            key = key.strip().strip("\"\'")
-            if value_part.strip() and value_part.strip() not in "{}":
-                value_node = _parse_scalar(value_part.strip(), start_line)
-                mapping = {key: value_node}
-                end_line = value_node.end_line
-                items.append(YamlNode(mapping, start_line, end_line))
-                index += 1
-            else:
-                child, index = _parse_block(lines, index + 1, current_indent + 2)
-                if child is None:
-                    child = YamlNode(None, start_line, start_line)
-                mapping = {key: child}
-                end_line = child.end_line
-                items.append(YamlNode(mapping, start_line, end_line))
-            continue
-        scalar = _parse_scalar(content, start_line)
-        items.append(scalar)
-        index += 1
-
-    start = items[0].start_line if items else index + 1
-    end = items[-1].end_line if items else start
-    return YamlNode(items, start, end), index
-
-
-def _parse_mapping(lines: List[str], index: int, indent: int) -> Tuple[YamlNode, int]:
-    mapping: Dict[str, YamlNode] = {}
-    start_line = index + 1
-    last_line = start_line
-
-    while index < len(lines):
-        line = lines[index]
-        stripped_line = line.strip()
-        if not stripped_line or stripped_line in {"}", "]"}:
-            index += 1
-            continue
-        current_indent = _leading_spaces(line)
-        if current_indent < indent:
-            break
-        if line.strip().startswith("- ") and current_indent == indent:
-            break
-        stripped = line.strip()
-        if ":" not in stripped:
-            index += 1
-            continue
-        key, value_part = stripped.split(":", 1)
-        key = key.strip().strip("\"\'")
-        line_no = index + 1
-        if value_part.strip() and value_part.strip() not in "{}":
-            value_node = _parse_scalar(value_part.strip(), line_no)
-            mapping[key] = value_node
-            last_line = value_node.end_line
-            index += 1
-        else:
-            child, index = _parse_block(lines, index + 1, current_indent + 2)
-            if child is None:
-                child = YamlNode(None, line_no, line_no)
-            child.start_line = line_no
-            mapping[key] = child
-            last_line = child.end_line
-
-    end_line = last_line
-    if mapping:
-        end_line = max(node.end_line for node in mapping.values())
-    return YamlNode(mapping, start_line, end_line), index
-
-
-def _parse_scalar(text: str, line_no: int) -> YamlNode:
-    value: object = text
-    if (text.startswith("\"") and text.endswith("\"")) or (
-        text.startswith("'") and text.endswith("'")
-    ):
-        text = text[1:-1]
-        value = text
-    if text.lower() == "true":
-        value = True
-    elif text.lower() == "false":
-        value = False
-    elif text.startswith("[") or text.startswith("{"):
-        try:
-            value = json.loads(text.replace("'", '"'))
-        except json.JSONDecodeError:
-            if text.startswith("[") and text.endswith("]"):
-                inner = text[1:-1].strip()
-                if inner:
-                    parts = [part.strip() for part in inner.replace(" ", ",").split(",")]
-                    value = [part for part in parts if part]
-                else:
-                    value = []
-            else:
-                value = text
-    return YamlNode(value, line_no, line_no)
-
-
-def _leading_spaces(line: str) -> int:
-    return len(line) - len(line.lstrip(" "))
-
@@ -0,0 +1,386 @@
+from __future__ import annotations
+
+"""Loading of OpenAPI documents and resolution of ``$ref`` targets across files.
+
+A :class:`DocumentLoader` lives for one analysis run. Every referenced file is
+parsed at most once; parsed documents are cached by resolved path and
+modification time so shared model files are reused by every reference.
+Files are read through memory-mapped :mod:`src.source_files` buffers.
+
+JSON files (a ``.json`` suffix or content starting with ``{``) go through the
+JSON front end and are always parsed eagerly.
+
+In lazy mode YAML documents are not parsed up front. A pre-scan records the line
+span of every top-level key, path item and ``components`` entry, and only the
+spans the analyzer actually reaches are parsed.
+"""
+
+import logging
+import os
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from src.analyzers.json_parser import parse_json
+from src.analyzers.yaml_parser import (
+    DEFAULT_YAML_PARSER,
+    YamlNode,
+    YamlParseError,
+    parse_yaml_lines,
+)
+from src.source_files import SourceBuffer
+
+
+# Half-open ``[start, end)`` range of 0-based line indexes.
+_Span = Tuple[int, int]
+
+# Logged once per missing file and loader.
+MISSING_DOCUMENT_WARNING = "Referenced OpenAPI document not found: %s"
+
+
+class OpenAPIDocument:
+    """A parsed OpenAPI (or shared model) file."""
+
+    def __init__(self, path: Path, display_name: str, root: Optional[YamlNode]) -> None:
+        self.path = path
+        self.display_name = display_name
+        self._root = root
+        self._components: Dict[str, Dict[str, YamlNode]] = {}
+
+    @property
+    def root(self) -> YamlNode:
+        assert self._root is not None
+        return self._root
+
+    def is_mapping(self) -> bool:
+        return isinstance(self.root.value, dict)
+
+    def path_items(
+        self, include: Optional[Callable[[str], bool]] = None
+    ) -> Optional[Iterable[Tuple[str, YamlNode]]]:
+        """Entries of the ``paths`` mapping, or ``None`` if it is missing.
+
+        ``include`` filters the entries by path before they are returned.
+        """
+
+        paths_node = _child(self.root, "paths")
+        if paths_node is None or not isinstance(paths_node.value, dict):
+            return None
+        items = paths_node.value.items()
+        if include is None:
+            return items
+        return [(key, node) for key, node in items if include(key)]
+
+    def path_names(self, include: Optional[Callable[[str], bool]] = None) -> Optional[List[str]]:
+        """Keys of the ``paths`` mapping in document order, or ``None``."""
+
+        items = self.path_items(include)
+        return None if items is None else [key for key, _ in items]
+
+    def schema(self, name: str) -> Optional[YamlNode]:
+        """Return the ``components.schemas`` entry called ``name``."""
+
+        return self.component("schemas", name)
+
+    def component(self, section: str, name: str) -> Optional[YamlNode]:
+        """Return the entry ``name`` of ``components.<section>``.
+
+        Each section is indexed on first use, so later lookups are a single
+        dictionary access.
+        """
+
+        index = self._components.get(section)
+        if index is None:
+            index = {}
+            components = _child(self.root, "components")
+            section_node = _child(components, section) if components else None
+            if section_node and isinstance(section_node.value, dict):
+                index.update(section_node.value)
+            self._components[section] = index
+        return index.get(name)
+
+    def resolve_pointer(self, pointer: str) -> Optional[YamlNode]:
+        """Resolve a JSON pointer such as ``/components/schemas/Money``."""
+
+        return _walk(self.root, _pointer_tokens(pointer))
+
+
+class LazyOpenAPIDocument(OpenAPIDocument):
+    """A document whose subtrees are parsed on first access."""
+
+    def __init__(
+        self,
+        path: Path,
+        display_name: str,
+        lines: SourceBuffer,
+        *,
+        yaml_parser: str = DEFAULT_YAML_PARSER,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        # The root is parsed on first access; see ``root``.
+        super().__init__(path, display_name, None)
+        self.yaml_parser = yaml_parser
+        self.logger = logger
+        self._lines = lines
+        self._nodes: Dict[_Span, YamlNode] = {}
+        self._child_spans: Dict[Tuple[str, ...], Optional[Dict[str, _Span]]] = {}
+        first = _first_content_line(lines, 0, len(lines))
+        if first is None:
+            raise YamlParseError("Empty YAML content")
+        self._root_is_list = lines[first].strip().startswith("- ")
+        self._top_level = {} if self._root_is_list else _key_spans(lines, 0, len(lines))
+
+    @property
+    def root(self) -> YamlNode:
+        if self._root is None:
+            self._root = parse_yaml_lines(self._lines, self.yaml_parser, logger=self.logger)
+        return self._root
+
+    def is_mapping(self) -> bool:
+        return not self._root_is_list
+
+    def path_items(
+        self, include: Optional[Callable[[str], bool]] = None
+    ) -> Optional[Iterable[Tuple[str, YamlNode]]]:
+        spans = self._spans_below(("paths",))
+        if spans is None:
+            return super().path_items(include)
+        # Filtering happens on the span index, so excluded items are never parsed.
+        return (
+            (key, self._node(key, span))
+            for key, span in spans.items()
+            if include is None or include(key)
+        )
+
+    def path_names(self, include: Optional[Callable[[str], bool]] = None) -> Optional[List[str]]:
+        spans = self._spans_below(("paths",))
+        if spans is None:
+            return super().path_names(include)
+        return [key for key in spans if include is None or include(key)]
+
+    def component(self, section: str, name: str) -> Optional[YamlNode]:
+        spans = self._spans_below(("components", section))
+        if spans is None:
+            return super().component(section, name)
+        span = spans.get(name)
+        return self._node(name, span) if span else None
+
+    def resolve_pointer(self, pointer: str) -> Optional[YamlNode]:
+        tokens = _pointer_tokens(pointer)
+        if not tokens:
+            return self.root
+        if tokens[0] == "paths" and len(tokens) > 1:
+            spans = self._spans_below(("paths",))
+            if spans is not None:
+                span = spans.get(tokens[1])
+                return _walk(self._node(tokens[1], span), tokens[2:]) if span else None
+        if tokens[0] == "components" and len(tokens) > 2:
+            return _walk(self.component(tokens[1], tokens[2]), tokens[3:])
+        span = self._top_level.get(tokens[0])
+        if span is None:
+            return super().resolve_pointer(pointer) if self._root_is_list else None
+        return _walk(self._node(tokens[0], span), tokens[1:])
+
+    def _node(self, key: str, span: _Span) -> Optional[YamlNode]:
+        node = self._nodes.get(span)
+        if node is None:
+            start, end = span
+            parsed = parse_yaml_lines(
+                self._lines[start:end], self.yaml_parser, line_offset=start, logger=self.logger
+            )
+            node = _child(parsed, key)
+            if node is None:
+                return None
+            self._nodes[span] = node
+        return node
+
+    def _spans_below(self, keys: Tuple[str, ...]) -> Optional[Dict[str, _Span]]:
+        """Spans of the block mapping entries under ``keys``.
+
+        Returns ``None`` when the value is not a plain indented block (for
+        example an inline or flow value), in which case callers fall back to
+        parsing the subtree.
+        """
+
+        if keys in self._child_spans:
+            return self._child_spans[keys]
+        if len(keys) == 1:
+            parent = self._top_level.get(keys[0])
+        else:
+            parent_spans = self._spans_below(keys[:-1])
+            parent = parent_spans.get(keys[-1]) if parent_spans else None
+        spans: Optional[Dict[str, _Span]] = None
+        if parent is not None and _is_block_key(self._lines[parent[0]]):
+            first = _first_content_line(self._lines, parent[0] + 1, parent[1])
+            if first is not None and not self._lines[first].strip().startswith("- "):
+                spans = _key_spans(self._lines, first, parent[1])
+        self._child_spans[keys] = spans
+        return spans
+
+
+class DocumentLoader:
+    """Parse and cache documents reachable from one root specification."""
+
+    def __init__(
+        self,
+        base_dir: Path,
+        *,
+        yaml_parser: str = DEFAULT_YAML_PARSER,
+        lazy: bool = False,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        self.base_dir = Path(base_dir).resolve()
+        self.yaml_parser = yaml_parser
+        self.logger = logger or logging.getLogger("valid_builder")
+        self.lazy = lazy
+        self._documents: Dict[Tuple[Path, int], OpenAPIDocument] = {}
+        self._missing: Set[Path] = set()
+        self._open_sources = ExitStack()
+
+    def load(self, path: str | Path, *, display_name: str | None = None) -> OpenAPIDocument:
+        """Return the parsed document at ``path``, parsing it on first use.
+
+        Raises ``OSError`` when the file cannot be read and
+        :class:`~src.analyzers.yaml_parser.YamlParseError` when it is invalid.
+        """
+
+        resolved = Path(path).resolve()
+        key = (resolved, resolved.stat().st_mtime_ns)
+        document = self._documents.get(key)
+        if document is None:
+            display_name = display_name or self._display_name(resolved)
+            source = SourceBuffer(resolved)
+            if self.lazy and not _is_json(source):
+                # Lazy documents read from the mapping until the loader is closed.
+                document = LazyOpenAPIDocument(
+                    resolved,
+                    display_name,
+                    self._open_sources.enter_context(source),
+                    yaml_parser=self.yaml_parser,
+                    logger=self.logger,
+                )
+            else:
+                with source:
+                    if _is_json(source):
+                        root = parse_json(source.text())
+                    else:
+                        root = parse_yaml_lines(source, self.yaml_parser, logger=self.logger)
+                document = OpenAPIDocument(resolved, display_name, root)
+            self._documents[key] = document
+        return document
+
+    def close(self) -> None:
+        """Release the files still mapped by lazily parsed documents."""
+
+        self._open_sources.close()
+
+    def resolve(
+        self, ref: str, document: OpenAPIDocument
+    ) -> Optional[Tuple[OpenAPIDocument, str]]:
+        """Split ``ref`` into the target document and JSON pointer.
+
+        File parts are resolved relative to the referencing ``document``.
+        Files that cannot be read are reported once as a warning and resolve
+        to ``None``.
+        """
+
+        file_part, _, pointer = ref.partition("#")
+        if not file_part:
+            return document, pointer
+        target_path = (document.path.parent / file_part).resolve()
+        if target_path in self._missing:
+            return None
+        try:
+            return self.load(target_path), pointer
+        except OSError:
+            self._missing.add(target_path)
+            self.logger.warning(MISSING_DOCUMENT_WARNING, file_part)
+            return None
+
+    def _display_name(self, path: Path) -> str:
+        try:
+            return Path(os.path.relpath(path, self.base_dir)).as_posix()
+        except ValueError:  # pragma: no cover - different drive on Windows
+            return path.as_posix()
+
+
+def _child(node: Optional[YamlNode], key: str) -> Optional[YamlNode]:
+    if node is None or not isinstance(node.value, dict):
+        return None
+    return node.value.get(key)
+
+
+def _is_json(source: SourceBuffer) -> bool:
+    return source.path.suffix.lower() == ".json" or source.search(rb"\A\s*\{")
+
+
+def _pointer_tokens(pointer: str) -> List[str]:
+    return [
+        token.replace("~1", "/").replace("~0", "~")
+        for token in pointer.strip("/").split("/")
+        if token
+    ]
+
+
+def _walk(node: Optional[YamlNode], tokens: Iterable[str]) -> Optional[YamlNode]:
+    for token in tokens:
+        if node is None:
+            return None
+        if isinstance(node.value, dict):
+            node = node.value.get(token)
+        elif isinstance(node.value, list) and token.isdigit() and int(token) < len(node.value):
+            item = node.value[int(token)]
+            node = item if isinstance(item, YamlNode) else None
+        else:
+            return None
+    return node
+
+
+def _first_content_line(lines: Sequence[str], start: int, end: int) -> Optional[int]:
+    for index in range(start, end):
+        content = lines[index].strip()
+        if content and content not in {"}", "]"}:
+            return index
+    return None
+
+
+def _is_block_key(line: str) -> bool:
+    """True when the key on ``line`` opens an indented block value."""
+
+    _, _, value = line.partition(":")
+    value = value.strip()
+    return not value or value in "{}"
+
+
+def _key_spans(lines: SourceBuffer, start: int, end: int) -> Dict[str, _Span]:
+    """Line spans of the keys of the block mapping starting at ``start``.
+
+    Keys are recognised the same way the builtin scanner does: lines at the
+    indentation of the first content line that contain a colon. Deeper lines
+    are filtered out on the raw bytes and never decoded.
+    """
+
+    spans: Dict[str, _Span] = {}
+    first = _first_content_line(lines, start, end)
+    if first is None:
+        return spans
+    block_indent = len(lines[first]) - len(lines[first].lstrip(" "))
+    shallow = lines.find_lines(rb"^ {0,%d}[^ \r\n]" % block_indent, first, end)
+    current_key: Optional[str] = None
+    current_start = first
+    for index in shallow:
+        line = lines[index]
+        content = line.strip()
+        if not content or content in {"}", "]"}:
+            continue
+        if len(line) - len(line.lstrip(" ")) < block_indent:
+            break
+        if content.startswith("- ") or ":" not in content:
+            continue
+        if current_key is not None:
+            spans[current_key] = (current_start, index)
+        current_key = content.split(":", 1)[0].strip().strip("\"\'")
+        current_start = index
+    if current_key is not None:
+        spans[current_key] = (current_start, end)
+    return spans
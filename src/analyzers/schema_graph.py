@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+"""Reference graph between the schemas reachable from analyzed endpoints.
+
+Nodes are schemas, identified by the document that defines them and their
+JSON pointer; edges are the links the analyzer follows from a schema (required
+properties, array ``items``, ``allOf`` members and ``oneOf``/``anyOf``
+branches). The graph is built once per run before any rules are generated, so
+unreachable schemas are never touched, unresolved references are known up
+front and schemas can be expanded dependencies first.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+# A schema is identified by the document that defines it and its pointer.
+SchemaKey = Tuple[Path, str]
+
+
+@dataclass(frozen=True)
+class SchemaReference:
+    """An edge from one schema to another.
+
+    ``kind`` is ``property``, ``items``, ``allOf``, ``oneOf`` or ``anyOf`` and
+    ``label`` names the property or list position the reference appears at.
+    """
+
+    kind: str
+    label: str
+    target: SchemaKey
+
+
+@dataclass(frozen=True)
+class UnresolvedReference:
+    """A ``$ref`` whose target does not exist.
+
+    ``source`` is the schema containing the reference, or ``None`` when an
+    operation references the schema directly.
+    """
+
+    ref: str
+    source_file: str
+    line: int
+    source: Optional[SchemaKey] = None
+
+
+class SchemaGraph:
+    """Schemas reachable from the endpoints of one analysis run."""
+
+    def __init__(self) -> None:
+        self.names: Dict[SchemaKey, str] = {}
+        self.source_files: Dict[SchemaKey, str] = {}
+        self.edges: Dict[SchemaKey, List[SchemaReference]] = {}
+        self.roots: List[SchemaKey] = []
+        self.unresolved: List[UnresolvedReference] = []
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.names
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def add_schema(self, key: SchemaKey, name: str, source_file: str) -> bool:
+        """Register a schema; returns ``False`` if it was already known."""
+
+        if key in self.names:
+            return False
+        self.names[key] = name
+        self.source_files[key] = source_file
+        self.edges[key] = []
+        return True
+
+    def add_root(self, key: SchemaKey) -> None:
+        if key not in self.roots:
+            self.roots.append(key)
+
+    def add_edge(self, source: SchemaKey, reference: SchemaReference) -> None:
+        self.edges[source].append(reference)
+
+    def components(self) -> List[List[SchemaKey]]:
+        """Strongly connected components, dependencies before dependents.
+
+        Uses an iterative form of Tarjan's algorithm, so long reference chains
+        cannot exhaust the interpreter stack.
+        """
+
+        index: Dict[SchemaKey, int] = {}
+        lowlink: Dict[SchemaKey, int] = {}
+        on_stack: Set[SchemaKey] = set()
+        stack: List[SchemaKey] = []
+        result: List[List[SchemaKey]] = []
+
+        for start in self.names:
+            if start in index:
+                continue
+            work: List[Tuple[SchemaKey, Iterable[SchemaReference]]] = []
+            index[start] = lowlink[start] = len(index)
+            stack.append(start)
+            on_stack.add(start)
+            work.append((start, iter(self.edges[start])))
+            while work:
+                key, references = work[-1]
+                descended = False
+                for reference in references:
+                    target = reference.target
+                    if target not in index:
+                        index[target] = lowlink[target] = len(index)
+                        stack.append(target)
+                        on_stack.add(target)
+                        work.append((target, iter(self.edges[target])))
+                        descended = True
+                        break
+                    if target in on_stack:
+                        lowlink[key] = min(lowlink[key], index[target])
+                if descended:
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[key])
+                if lowlink[key] == index[key]:
+                    component: List[SchemaKey] = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == key:
+                            break
+                    result.append(component)
+        return result
+
+    def topological_order(self) -> List[SchemaKey]:
+        """All schemas, each after the schemas it references (cycles aside)."""
+
+        return [key for component in self.components() for key in component]
+
+    def heights(self) -> Tuple[Dict[SchemaKey, int], Set[SchemaKey]]:
+        """Expansion height per acyclic schema, and the schemas that reach a cycle.
+
+        The height counts the schema levels a full expansion visits,
+        including the schema itself.
+        """
+
+        heights: Dict[SchemaKey, int] = {}
+        cyclic: Set[SchemaKey] = set()
+        for component in self.components():
+            key = component[0]
+            targets = self._targets(key)
+            if len(component) > 1 or key in targets or any(target in cyclic for target in targets):
+                cyclic.update(component)
+                continue
+            heights[key] = 1 + max((heights[target] for target in targets), default=0)
+        return heights, cyclic
+
+    def to_dot(self, rule_counts: Optional[Dict[SchemaKey, int]] = None) -> str:
+        """Render the graph in Graphviz DOT format.
+
+        Nodes are labelled with the schema name and, when ``rule_counts`` is
+        given, the number of rules one expansion of the schema produced.
+        Unresolved references are drawn as dashed edges to the raw ``$ref``.
+        """
+
+        lines = ["digraph schemas {", "  rankdir=LR;", "  node [shape=box];"]
+        for key, name in self.names.items():
+            label = [name]
+            if rule_counts is not None and key in rule_counts:
+                label.append(f"{rule_counts[key]} rules")
+            attributes = f"label={_quote(*label)}"
+            if key in self.roots:
+                attributes += ", style=bold"
+            lines.append(f"  {_quote(self._node_id(key))} [{attributes}];")
+        for key, references in self.edges.items():
+            for reference in references:
+                lines.append(
+                    f"  {_quote(self._node_id(key))} -> {_quote(self._node_id(reference.target))}"
+                    f" [label={_quote(_edge_label(reference))}];"
+                )
+        for unresolved in self.unresolved:
+            lines.append(f"  {_quote(unresolved.ref)} [style=dashed];")
+            if unresolved.source is not None:
+                lines.append(
+                    f"  {_quote(self._node_id(unresolved.source))} -> {_quote(unresolved.ref)}"
+                    " [style=dashed];"
+                )
+        lines.append("}")
+        return "\n".join(lines) + "\n"
+
+    def _targets(self, key: SchemaKey) -> List[SchemaKey]:
+        return [reference.target for reference in self.edges[key]]
+
+    def _node_id(self, key: SchemaKey) -> str:
+        return f"{self.source_files[key]}#{key[1]}"
+
+
+def _edge_label(reference: SchemaReference) -> str:
+    if reference.kind == "items":
+        return f"{reference.label}[]"
+    if reference.kind in ("allOf", "oneOf", "anyOf"):
+        return f"{reference.kind}[{reference.label}]"
+    return reference.label
+
+
+def _quote(*lines: str) -> str:
+    """A DOT string literal; several arguments become separate label lines."""
+
+    escaped = (line.replace("\\", "\\\\").replace('"', '\\"') for line in lines)
+    return '"' + "\\n".join(escaped) + '"'
@@ -0,0 +1,380 @@
+from __future__ import annotations
+
+"""YAML front ends that build line-annotated ``YamlNode`` trees.
+
+Two backends are available: the dependency-free ``builtin`` scanner, which
+understands the block-style subset used by typical OpenAPI documents, and
+``ruamel``, which composes the document with ruamel.yaml (using its libyaml
+based C parser when installed) and converts the node marks into line spans.
+
+``builtin`` is the faster of the two: even with the C parser, building
+ruamel's node graph and converting it makes ``ruamel`` several times slower
+(see ``benchmarks/yaml_parsers.py``). ``ruamel`` is for documents outside
+the builtin subset, such as flow-style mappings or multi-line scalars.
+"""
+
+import json
+import logging
+import sys
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+YAML_PARSERS = ("builtin", "ruamel")
+DEFAULT_YAML_PARSER = "builtin"
+
+
+class YamlParseError(RuntimeError):
+    """Raised when YAML content cannot be parsed into a node tree."""
+
+
+# Scalars up to this length (type names, formats, ``$ref`` targets, ...) are
+# interned so repeated values share one string; longer text such as
+# descriptions is kept as is.
+_INTERN_MAX_LENGTH = 64
+
+
+@dataclass(slots=True)
+class YamlNode:
+    """A parsed value with the 1-based lines it spans.
+
+    ``value`` is a ``dict`` of child nodes, a ``list`` of items or a scalar.
+    Nodes are slotted and mapping keys are interned, since large specs produce
+    millions of them.
+    """
+
+    value: object
+    start_line: int
+    end_line: int
+
+
+def intern_scalar(text: str) -> str:
+    """Return a shared copy of a mapping key or short scalar value."""
+
+    return sys.intern(text) if len(text) <= _INTERN_MAX_LENGTH else text
+
+
+def parse_yaml(
+    text: str,
+    parser: str = DEFAULT_YAML_PARSER,
+    *,
+    logger: logging.Logger | None = None,
+) -> YamlNode:
+    """Parse ``text`` with the selected backend.
+
+    Requesting ``ruamel`` when the library is not installed logs a warning and
+    falls back to the builtin scanner.
+    """
+
+    if parser not in YAML_PARSERS:
+        raise ValueError(f"Unsupported YAML parser: {parser}")
+    if parser == "ruamel":
+        try:
+            return _parse_yaml_with_ruamel(text)
+        except ImportError:
+            _warn_ruamel_missing(logger)
+    return _parse_yaml_with_lines(text)
+
+
+def parse_yaml_lines(
+    lines: Sequence[str],
+    parser: str = DEFAULT_YAML_PARSER,
+    *,
+    line_offset: int = 0,
+    logger: logging.Logger | None = None,
+) -> YamlNode:
+    """Parse a slice of a document; ``line_offset`` lines precede ``lines[0]``."""
+
+    if parser not in YAML_PARSERS:
+        raise ValueError(f"Unsupported YAML parser: {parser}")
+    if parser == "ruamel":
+        try:
+            return _parse_yaml_with_ruamel("\n".join(lines), line_offset)
+        except ImportError:
+            _warn_ruamel_missing(logger)
+    return _parse_yaml_lines(lines, line_offset)
+
+
+def _warn_ruamel_missing(logger: logging.Logger | None) -> None:
+    logger = logger or logging.getLogger("valid_builder")
+    logger.warning("ruamel.yaml is not installed; falling back to the builtin YAML parser")
+
+
+# ----------------------
+# ruamel.yaml backend
+# ----------------------
+
+
+def _parse_yaml_with_ruamel(text: str, line_offset: int = 0) -> YamlNode:
+    from ruamel.yaml import YAML
+    from ruamel.yaml.error import YAMLError
+    from ruamel.yaml.nodes import MappingNode, SequenceNode
+
+    # The safe loader picks the C parser from ruamel.yaml.clib when present;
+    # composing keeps the start/end marks without constructing Python objects.
+    yaml = YAML(typ="safe")
+    try:
+        root = yaml.compose(text)
+    except YAMLError as exc:
+        raise YamlParseError(f"Invalid YAML content: {exc}") from exc
+    if root is None:
+        raise YamlParseError("Empty YAML content")
+
+    def start(node, start_line: int) -> YamlNode:
+        if isinstance(node, MappingNode):
+            return YamlNode({}, start_line, start_line)
+        if isinstance(node, SequenceNode):
+            return YamlNode([], start_line, start_line)
+        end_line = _scalar_end_line(node) + line_offset
+        return YamlNode(_ruamel_scalar_value(node), start_line, end_line)
+
+    # Like the builtin scanner, the conversion keeps an explicit stack of open
+    # collections (each with an iterator over its remaining children) instead
+    # of recursing per nesting level. A collection ends where its last child
+    # ends, which is known once that child has been closed.
+    result = start(root, root.start_mark.line + 1 + line_offset)
+    stack: List[Tuple[YamlNode, Iterator]] = []
+    if isinstance(root, (MappingNode, SequenceNode)):
+        stack.append((result, iter(root.value)))
+    while stack:
+        parent, children = stack[-1]
+        entry = next(children, None)
+        if entry is None:
+            stack.pop()
+            if stack:
+                stack[-1][0].end_line = parent.end_line
+            continue
+        if isinstance(parent.value, dict):
+            key_node, node = entry
+            child = start(node, node.start_mark.line + 1 + line_offset)
+            child.start_line = key_node.start_mark.line + 1 + line_offset
+            parent.value[intern_scalar(str(key_node.value))] = child
+        else:
+            node = entry
+            child = start(node, node.start_mark.line + 1 + line_offset)
+            parent.value.append(child)
+        parent.end_line = child.end_line
+        if isinstance(node, (MappingNode, SequenceNode)):
+            stack.append((child, iter(node.value)))
+    return result
+
+
+def _ruamel_scalar_value(node) -> object:
+    tag = node.tag or ""
+    if tag.endswith(":bool"):
+        return node.value.lower() == "true"
+    if tag.endswith(":null"):
+        return None
+    return intern_scalar(node.value)
+
+
+def _scalar_end_line(node) -> int:
+    end = node.end_mark
+    # Block scalars end at column 0 of the following line.
+    if end.column == 0 and end.line > node.start_mark.line:
+        return end.line
+    return end.line + 1
+
+
+# ----------------------
+# Builtin line scanner
+# ----------------------
+
+
+def _parse_yaml_with_lines(text: str) -> YamlNode:
+    return _parse_yaml_lines(text.splitlines())
+
+
+def _parse_yaml_lines(lines: Iterable[str], line_offset: int = 0) -> YamlNode:
+    """Parse the supported YAML subset into a ``YamlNode`` tree.
+
+    The scanner keeps an explicit stack of open blocks instead of recursing per
+    nesting level, so deeply nested schemas cannot exhaust the interpreter
+    stack. Indentation and stripped content are computed in one pass over
+    ``lines``, which is only iterated, so the lines themselves need not be
+    held in memory.
+    """
+
+    first_line = line_offset + 1
+    stripped: List[str] = []
+    indents: List[int] = []
+    for line in lines:
+        content = line.lstrip(" ")
+        indents.append(len(line) - len(content))
+        stripped.append(content.strip())
+    total = len(stripped)
+
+    def open_block(index: int, indent: int) -> Tuple[Optional[_BlockFrame], int]:
+        while index < total and not stripped[index]:
+            index += 1
+        if index >= total or indents[index] < indent:
+            return None, index
+        is_list = stripped[index].startswith("- ")
+        return _BlockFrame(is_list, indent, index + first_line), index
+
+    root_frame, index = open_block(0, 0)
+    if root_frame is None:
+        raise YamlParseError("Empty YAML content")
+
+    stack: List[_BlockFrame] = [root_frame]
+    root: Optional[YamlNode] = None
+    while stack:
+        frame = stack[-1]
+        child_frame: Optional[_BlockFrame] = None
+        opened = False
+        closed = False
+
+        if index >= total:
+            closed = True
+        else:
+            content = stripped[index]
+            current_indent = indents[index]
+            if not content or content in {"}", "]"}:
+                index += 1
+                continue
+            if current_indent < frame.indent:
+                closed = True
+            elif frame.is_list:
+                if not content.startswith("- "):
+                    closed = True
+                else:
+                    start_line = index + first_line
+                    item = content[2:]
+                    if item == "":
+                        frame.pending_line = start_line
+                        frame.pending_key = None
+                        child_frame, index = open_block(index + 1, current_indent + 2)
+                        opened = True
+                    elif ":" in item:
+                        # ``- key: value`` starts a mapping whose keys are
+                        # aligned with the first one; the line is re-read as
+                        # that mapping's first key.
+                        stripped[index] = item.strip()
+                        indents[index] = current_indent + 2 + _leading_spaces(item)
+                        frame.pending_line = start_line
+                        frame.pending_key = None
+                        child_frame, index = open_block(index, indents[index])
+                        opened = True
+                    else:
+                        frame.items.append(_parse_scalar(item, start_line))
+                        index += 1
+            elif content.startswith("- ") and current_indent == frame.indent:
+                closed = True
+            elif ":" not in content:
+                index += 1
+            else:
+                key, value_part = content.split(":", 1)
+                key = intern_scalar(key.strip().strip("\"\'"))
+                line_no = index + first_line
+                value_text = value_part.strip()
+                if value_text and value_text not in "{}":
+                    value_node = _parse_scalar(value_text, line_no)
+                    frame.mapping[key] = value_node
+                    frame.last_line = value_node.end_line
+                    index += 1
+                else:
+                    frame.pending_line = line_no
+                    frame.pending_key = key
+                    child_frame, index = open_block(index + 1, current_indent + 2)
+                    opened = True
+
+        if opened:
+            if child_frame is not None:
+                stack.append(child_frame)
+            else:
+                _attach_child(frame, None)
+            continue
+        if closed:
+            stack.pop()
+            node = frame.close(index + first_line)
+            if stack:
+                _attach_child(stack[-1], node)
+            else:
+                root = node
+
+    assert root is not None
+    return root
+
+
+class _BlockFrame:
+    """An open mapping or list block on the parser stack."""
+
+    __slots__ = (
+        "is_list",
+        "indent",
+        "start_line",
+        "last_line",
+        "mapping",
+        "items",
+        "pending_key",
+        "pending_line",
+    )
+
+    def __init__(self, is_list: bool, indent: int, start_line: int) -> None:
+        self.is_list = is_list
+        self.indent = indent
+        self.start_line = start_line
+        self.last_line = start_line
+        self.mapping: Dict[str, YamlNode] = {}
+        self.items: List[YamlNode] = []
+        self.pending_key: Optional[str] = None
+        self.pending_line = start_line
+
+    def close(self, next_line: int) -> YamlNode:
+        if self.is_list:
+            start = self.items[0].start_line if self.items else next_line
+            end = self.items[-1].end_line if self.items else start
+            return YamlNode(self.items, start, end)
+        # Values are appended in line order, so the last one carries the
+        # greatest end line of the mapping.
+        return YamlNode(self.mapping, self.start_line, self.last_line)
+
+
+def _attach_child(frame: _BlockFrame, child: Optional[YamlNode]) -> None:
+    line_no = frame.pending_line
+    if frame.is_list:
+        if frame.pending_key is None:
+            if child:
+                child.start_line = line_no
+                frame.items.append(child)
+            return
+        if child is None:
+            child = YamlNode(None, line_no, line_no)
+        frame.items.append(YamlNode({frame.pending_key: child}, line_no, child.end_line))
+        return
+    if child is None:
+        child = YamlNode(None, line_no, line_no)
+    child.start_line = line_no
+    frame.mapping[frame.pending_key] = child
+    frame.last_line = child.end_line
+
+
+def _parse_scalar(text: str, line_no: int) -> YamlNode:
+    if (text.startswith("\"") and text.endswith("\"")) or (
+        text.startswith("'") and text.endswith("'")
+    ):
+        text = text[1:-1]
+    value: object = intern_scalar(text)
+    if text.lower() == "true":
+        value = True
+    elif text.lower() == "false":
+        value = False
+    elif text.startswith("[") or text.startswith("{"):
+        try:
+            value = json.loads(text.replace("'", '"'))
+        except json.JSONDecodeError:
+            if text.startswith("[") and text.endswith("]"):
+                inner = text[1:-1].strip()
+                if inner:
+                    parts = [part.strip() for part in inner.replace(" ", ",").split(",")]
+                    value = [part for part in parts if part]
+                else:
+                    value = []
+            else:
+                value = text
+    return YamlNode(value, line_no, line_no)
+
+
+def _leading_spaces(line: str) -> int:
+    return len(line) - len(line.lstrip(" "))
+
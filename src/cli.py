@@ -4,6 +4,8 @@ import argparse
 import sys
 from pathlib import Path
 
+from .analyzers.endpoint_selection import HTTP_METHODS
+from .analyzers.yaml_parser import YAML_PARSERS
 from .config import load_config
 from .logging_utils import attach_summary_handler, log_final_summary, setup_logging
 from .orchestrator import OrchestratorError, orchestrate
@@ -12,12 +14,60 @@ from .orchestrator import OrchestratorError, orchestrate
 LANG_CHOICES = ["kotlin", "openapi"]
 
 
+def _split_methods(raw: str):
+    methods = [part.strip().lower() for part in raw.split(",") if part.strip()]
+    unknown = [method for method in methods if method not in HTTP_METHODS]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unsupported method(s): {', '.join(unknown)}")
+    return methods
+
+
 def parse_cli_args(argv):
     parser = argparse.ArgumentParser()
-    parser.add_argument("input_file", help="Path to the input file")
+    parser.add_argument(
+        "input_file", help="Path to the input file, or a directory of Kotlin sources"
+    )
     parser.add_argument("--output", default="output.csv", help="Output CSV path")
     parser.add_argument("--lang", choices=LANG_CHOICES, help="Language override")
     parser.add_argument("--config", default=".env", help="Path to configuration file")
+    parser.add_argument(
+        "--yaml-parser",
+        choices=YAML_PARSERS,
+        help=(
+            "YAML backend for OpenAPI inputs (overrides OPENAPI_YAML_PARSER); builtin is faster, "
+            "ruamel also handles flow-style mappings and multi-line scalars"
+        ),
+    )
+    parser.add_argument(
+        "--lazy-parsing",
+        action="store_true",
+        help="Only parse the OpenAPI subtrees reached from paths (sets OPENAPI_LAZY_PARSING)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        metavar="N",
+        help=(
+            "Analyze OpenAPI endpoints or parse Kotlin project files in N worker processes,"
+            " 0 for all CPUs (sets OPENAPI_JOBS and KOTLIN_JOBS)"
+        ),
+    )
+    parser.add_argument(
+        "--paths",
+        action="append",
+        metavar="PATTERN",
+        help="Only analyze OpenAPI paths matching this glob (or 're:' regex); repeatable",
+    )
+    parser.add_argument(
+        "--methods",
+        type=_split_methods,
+        help="Comma-separated HTTP methods to analyze, e.g. get,post",
+    )
+    parser.add_argument(
+        "--schema-graph",
+        metavar="FILE",
+        help="Write the OpenAPI schema reference graph to FILE in Graphviz DOT format",
+    )
 
     return parser.parse_args(argv)
 
@@ -25,10 +75,27 @@ def parse_cli_args(argv):
 def main(argv=None):
     args = parse_cli_args(argv)
 
-    config = load_config(Path(args.config))
+    overrides = {}
+    if args.yaml_parser:
+        overrides["OPENAPI_YAML_PARSER"] = args.yaml_parser
+    if args.lazy_parsing:
+        overrides["OPENAPI_LAZY_PARSING"] = "true"
+    if args.jobs is not None:
+        overrides["OPENAPI_JOBS"] = str(args.jobs)
+        overrides["KOTLIN_JOBS"] = str(args.jobs)
+    config = load_config(Path(args.config), overrides)
     logger = setup_logging(config.log_level, config.log_file)
     summary_handler = attach_summary_handler(logger)
 
+    # Endpoint filters and the graph export are only passed when given.
+    openapi_options = {}
+    if args.paths:
+        openapi_options["paths"] = args.paths
+    if args.methods:
+        openapi_options["methods"] = args.methods
+    if args.schema_graph:
+        openapi_options["schema_graph_file"] = args.schema_graph
+
     exit_code = 0
     rule_count = None
 
@@ -39,6 +106,7 @@ def main(argv=None):
             config,
             lang_override=args.lang,
             logger=logger,
+            **openapi_options,
         )
         rule_count = len(rules)
     except ValueError as exc:
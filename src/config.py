@@ -4,6 +4,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional
 
+from .analyzers.yaml_parser import YAML_PARSERS
+
 
 @dataclass
 class Config:
@@ -15,6 +17,12 @@ class Config:
     llm_api_key: str
     log_file: str
     log_level: str
+    openapi_yaml_parser: str = "builtin"
+    openapi_max_schema_depth: int = 32
+    openapi_max_rules_per_endpoint: int = 10000
+    openapi_lazy_parsing: bool = False
+    openapi_jobs: int = 1
+    kotlin_jobs: int = 1
 
 
 def _parse_env_file(env_path: Path) -> Dict[str, str]:
@@ -37,6 +45,27 @@ def _parse_endpoint_entities(raw: str) -> List[str]:
     return [part.strip() for part in raw.split(",") if part.strip()]
 
 
+def _parse_limit(raw: str, default: str) -> int:
+    """Parse a non-negative integer limit, falling back to the default."""
+
+    try:
+        value = int(raw.strip())
+    except (AttributeError, ValueError):
+        return int(default)
+    return value if value >= 0 else int(default)
+
+
+def _parse_choice(raw: str, choices: Iterable[str], default: str) -> str:
+    """Parse a case-insensitive choice, falling back to the default."""
+
+    value = raw.strip().lower()
+    return value if value in choices else default
+
+
+def _parse_flag(raw: str) -> bool:
+    return raw.strip().lower() in {"1", "true", "yes", "on"}
+
+
 def load_config(env_path: Optional[Path] = None, overrides: Optional[Dict[str, str]] = None) -> Config:
     env_file = Path(env_path) if env_path is not None else Path(".env")
 
@@ -49,6 +78,12 @@ def load_config(env_path: Optional[Path] = None, overrides: Optional[Dict[str, s
         "LLM_API_KEY": "",
         "LOG_FILE": "",
         "LOG_LEVEL": "INFO",
+        "OPENAPI_YAML_PARSER": "builtin",
+        "OPENAPI_MAX_SCHEMA_DEPTH": "32",
+        "OPENAPI_MAX_RULES_PER_ENDPOINT": "10000",
+        "OPENAPI_LAZY_PARSING": "false",
+        "OPENAPI_JOBS": "1",
+        "KOTLIN_JOBS": "1",
     }
 
     env_values = _parse_env_file(env_file)
@@ -68,4 +103,16 @@ def load_config(env_path: Optional[Path] = None, overrides: Optional[Dict[str, s
         llm_api_key=combined.get("LLM_API_KEY", defaults["LLM_API_KEY"]),
         log_file=combined.get("LOG_FILE", defaults["LOG_FILE"]),
         log_level=combined.get("LOG_LEVEL", defaults["LOG_LEVEL"]),
+        openapi_yaml_parser=_parse_choice(
+            combined.get("OPENAPI_YAML_PARSER", ""), YAML_PARSERS, defaults["OPENAPI_YAML_PARSER"]
+        ),
+        openapi_max_schema_depth=_parse_limit(
+            combined.get("OPENAPI_MAX_SCHEMA_DEPTH", ""), defaults["OPENAPI_MAX_SCHEMA_DEPTH"]
+        ),
+        openapi_max_rules_per_endpoint=_parse_limit(
+            combined.get("OPENAPI_MAX_RULES_PER_ENDPOINT", ""), defaults["OPENAPI_MAX_RULES_PER_ENDPOINT"]
+        ),
+        openapi_lazy_parsing=_parse_flag(combined.get("OPENAPI_LAZY_PARSING", "")),
+        openapi_jobs=_parse_limit(combined.get("OPENAPI_JOBS", ""), defaults["OPENAPI_JOBS"]),
+        kotlin_jobs=_parse_limit(combined.get("KOTLIN_JOBS", ""), defaults["KOTLIN_JOBS"]),
     )
@@ -64,6 +64,15 @@ def describe_openapi_request_body_required(method: str, path: str, media_type: s
     )
 
 
+def describe_openapi_required_parameter(location: str, name: str, type_hint: str | None = None) -> str:
+    """Template for required operation parameters."""
+
+    parameter = f"The '{name}' {location} parameter"
+    if type_hint:
+        parameter += f" of type {type_hint}"
+    return parameter + " MUST be provided."
+
+
 def describe_openapi_required_property(schema: str, property_name: str, type_hint: str | None = None) -> str:
     """Template for required object properties."""
 
@@ -84,3 +93,66 @@ def describe_openapi_array_items(array_path: str, item_requirement: str) -> str:
     """Template for array item constraints."""
 
     return f"Each item in '{array_path}' MUST satisfy: {item_requirement}."
+
+
+def describe_openapi_length(
+    property_path: str, min_length: str | None = None, max_length: str | None = None
+) -> str:
+    """Template for ``minLength``/``maxLength`` constraints."""
+
+    if min_length is not None and max_length is not None:
+        bound = f"between {min_length} and {max_length} characters long"
+    elif min_length is not None:
+        bound = f"at least {min_length} characters long"
+    else:
+        bound = f"at most {max_length} characters long"
+    return f"The '{property_path}' field MUST be {bound}."
+
+
+def describe_openapi_range(
+    property_path: str,
+    minimum: str | None = None,
+    maximum: str | None = None,
+    *,
+    exclusive_minimum: bool = False,
+    exclusive_maximum: bool = False,
+) -> str:
+    """Template for ``minimum``/``maximum`` constraints, optionally exclusive."""
+
+    bounds = []
+    if minimum is not None:
+        comparison = "greater than" if exclusive_minimum else "greater than or equal to"
+        bounds.append(f"{comparison} {minimum}")
+    if maximum is not None:
+        comparison = "less than" if exclusive_maximum else "less than or equal to"
+        bounds.append(f"{comparison} {maximum}")
+    return f"The '{property_path}' field MUST be {' and '.join(bounds)}."
+
+
+def describe_openapi_pattern(property_path: str, pattern: str) -> str:
+    """Template for ``pattern`` constraints."""
+
+    return f"The '{property_path}' field MUST match the pattern '{pattern}'."
+
+
+def describe_openapi_format(property_path: str, value_format: str) -> str:
+    """Template for ``format`` constraints."""
+
+    return f"The '{property_path}' field MUST be a valid {value_format} value."
+
+
+def describe_openapi_nullable(property_path: str, nullable: bool) -> str:
+    """Template for an explicit ``nullable`` flag."""
+
+    if nullable:
+        return f"The '{property_path}' field MAY be null."
+    return f"The '{property_path}' field MUST NOT be null."
+
+
+def describe_openapi_alternatives(
+    property_path: str, alternatives: Iterable[str], *, exclusive: bool
+) -> str:
+    """Template for ``oneOf`` (exclusive) and ``anyOf`` compositions."""
+
+    quantifier = "exactly one" if exclusive else "at least one"
+    return f"The '{property_path}' value MUST match {quantifier} of: {', '.join(alternatives)}."
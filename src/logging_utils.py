@@ -38,18 +38,24 @@ def setup_logging(log_level: str = "INFO", log_file: Optional[str] = None) -> lo
 
 
 class SummaryHandler(logging.Handler):
-    """Track warning and error counts for a run without emitting output."""
+    """Track warning and error counts for a run without emitting output.
+
+    Records carrying a ``skipped_files`` attribute add to the count of input
+    files that were skipped without analysis.
+    """
 
     def __init__(self) -> None:
-        super().__init__(level=logging.WARNING)
+        super().__init__()
         self.warning_count = 0
         self.error_count = 0
+        self.skipped_files = 0
 
     def emit(self, record: logging.LogRecord) -> None:  # pragma: no cover - trivial
         if record.levelno >= logging.ERROR:
             self.error_count += 1
         elif record.levelno >= logging.WARNING:
             self.warning_count += 1
+        self.skipped_files += getattr(record, "skipped_files", 0)
 
 
 def attach_summary_handler(logger: logging.Logger) -> SummaryHandler:
@@ -71,10 +77,13 @@ def log_final_summary(
 
     warnings = summary_handler.warning_count if summary_handler else 0
     errors = summary_handler.error_count if summary_handler else 0
+    skipped = summary_handler.skipped_files if summary_handler else 0
 
     if success:
         count_text = f"Completed successfully. Extracted {rule_count or 0} rules."
         warning_text = f"{warnings} warning(s)." if warnings else "No warnings."
+        if skipped:
+            warning_text += f" Skipped {skipped} file(s) without validation constructs."
         logger.info("%s %s", count_text, warning_text)
     else:
         logger.error("Failed with %d error(s). See messages above.", errors or 1)
@@ -1,16 +1,20 @@
 from __future__ import annotations
 
 import logging
+import re
+from functools import partial
 from pathlib import Path
-from typing import Callable, Iterable
+from typing import Callable, Iterable, Sequence
 
-from .analyzers.kotlin_analyzer import analyze_kotlin_file
+from .analyzers.endpoint_selection import EndpointSelector
+from .analyzers.kotlin_analyzer import analyze_kotlin_file, analyze_kotlin_project
 from .analyzers.openapi_analyzer import analyze_openapi_file
 from .config import Config
 from .csv_writer import write_rules_csv
 from .dependency_resolver import resolve_dependencies
 from .models import Rule, SourceType
 from .rule_id_manager import assign_rule_ids
+from .source_files import SourceBuffer
 
 
 LANG_MAP = {
@@ -24,7 +28,10 @@ class OrchestratorError(RuntimeError):
 
 
 def detect_source_type(input_file: str | Path, lang_override: str | None = None) -> SourceType:
-    """Determine the source type using override, extension, or heuristics."""
+    """Determine the source type using override, extension, or heuristics.
+
+    Content sniffing searches the mapped file without decoding it.
+    """
 
     if lang_override:
         try:
@@ -36,15 +43,14 @@ def detect_source_type(input_file: str | Path, lang_override: str | None = None)
     extension = path.suffix.lower()
     if extension == ".kt":
         return SourceType.KOTLIN
-    if extension in {".yml", ".yaml"}:
+    if extension in {".yml", ".yaml", ".json"}:
         return SourceType.OPENAPI
 
-    content = path.read_text(errors="ignore")
-    lowered = content.lower()
-    if "openapi:" in lowered or "paths:" in lowered:
-        return SourceType.OPENAPI
-    if "fun " in lowered or lowered.startswith("package "):
-        return SourceType.KOTLIN
+    with SourceBuffer(path) as source:
+        if source.search(rb'(?:openapi|paths)"?:', re.IGNORECASE):
+            return SourceType.OPENAPI
+        if source.search(rb"fun |\Apackage ", re.IGNORECASE):
+            return SourceType.KOTLIN
 
     raise ValueError(f"Cannot detect source type for file: {path}")
 
@@ -56,29 +62,43 @@ def orchestrate(
     *,
     lang_override: str | None = None,
     logger: logging.Logger | None = None,
+    paths: Sequence[str] | None = None,
+    methods: Sequence[str] | None = None,
+    schema_graph_file: str | Path | None = None,
 ) -> list[Rule]:
-    """Run the end-to-end extraction pipeline for a single file."""
+    """Run the end-to-end extraction pipeline for a single file or Kotlin project.
+
+    A directory ``input_file`` is analyzed as a Kotlin project: every ``.kt``
+    file below it is parsed and guards are resolved across files.
+
+    ``paths`` (glob patterns, or regular expressions prefixed with ``re:``)
+    and ``methods`` restrict an OpenAPI run to the matching endpoints.
+    ``schema_graph_file`` receives the OpenAPI schema reference graph in
+    Graphviz DOT format.
+    """
 
     logger = logger or logging.getLogger("valid_builder")
     input_path = Path(input_file)
     output_path = Path(output_file)
-
-    source_type = detect_source_type(input_path, lang_override)
-    analyzer: Callable[[Path | str], Iterable[Rule]]
-    if source_type is SourceType.KOTLIN:
-        analyzer = analyze_kotlin_file
-    elif source_type is SourceType.OPENAPI:
-        analyzer = analyze_openapi_file
+    endpoints = EndpointSelector.build(paths, methods)
+
+    if input_path.is_dir():
+        if lang_override and detect_source_type(input_path, lang_override) is not SourceType.KOTLIN:
+            raise ValueError(f"Directory inputs are analyzed as Kotlin projects: {input_path}")
+        analyzer = _select_analyzer(
+            SourceType.KOTLIN, config, logger, endpoints, schema_graph_file, project=True
+        )
+        logger.info("Reading Kotlin project %s", input_path)
+        rules = _run_analyzer(analyzer, input_path, logger)
     else:
-        raise OrchestratorError(f"Unsupported source type: {source_type}")
+        if not input_path.exists():
+            raise FileNotFoundError(f"Input file not found: {input_path}")
+        source_type = detect_source_type(input_path, lang_override)
+        analyzer = _select_analyzer(source_type, config, logger, endpoints, schema_graph_file)
 
-    logger.info("Reading source file %s as %s", input_path, source_type.value)
+        logger.info("Reading source file %s as %s", input_path, source_type.value)
 
-    try:
-        rules = list(analyzer(input_path))
-    except Exception as exc:  # pragma: no cover - defensive wrapper
-        logger.error("Failed to analyze %s", input_path, exc_info=True)
-        raise OrchestratorError("Analysis failed") from exc
+        rules = _run_analyzer(analyzer, input_path, logger)
 
     logger.info("Detected %d validation rules", len(rules))
 
@@ -99,3 +119,48 @@ def orchestrate(
 
     logger.info("Completed extraction; wrote %d rules to %s", len(rules), output_path)
     return rules
+
+
+def _run_analyzer(
+    analyzer: Callable[[Path | str], Iterable[Rule]],
+    input_path: Path,
+    logger: logging.Logger,
+) -> list[Rule]:
+    try:
+        return list(analyzer(input_path))
+    except Exception as exc:  # pragma: no cover - defensive wrapper
+        logger.error("Failed to analyze %s", input_path, exc_info=True)
+        raise OrchestratorError("Analysis failed") from exc
+
+
+def _select_analyzer(
+    source_type: SourceType,
+    config: Config,
+    logger: logging.Logger,
+    endpoints: EndpointSelector | None = None,
+    schema_graph_file: str | Path | None = None,
+    *,
+    project: bool = False,
+) -> Callable[[Path | str], Iterable[Rule]]:
+    if source_type is SourceType.KOTLIN:
+        if endpoints is not None:
+            logger.warning("Endpoint filters apply to OpenAPI inputs only; ignoring them")
+        if schema_graph_file is not None:
+            logger.warning("Schema graph export applies to OpenAPI inputs only; ignoring it")
+        if project:
+            return partial(analyze_kotlin_project, jobs=config.kotlin_jobs, logger=logger)
+        return analyze_kotlin_file
+    if source_type is SourceType.OPENAPI:
+        return partial(
+            analyze_openapi_file,
+            yaml_parser=config.openapi_yaml_parser,
+            max_schema_depth=config.openapi_max_schema_depth,
+            max_rules_per_endpoint=config.openapi_max_rules_per_endpoint,
+            lazy=config.openapi_lazy_parsing,
+            endpoints=endpoints,
+            jobs=config.openapi_jobs,
+            entities=config.openapi_endpoint_entities,
+            schema_graph_file=schema_graph_file,
+            logger=logger,
+        )
+    raise OrchestratorError(f"Unsupported source type: {source_type}")
@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+"""Memory-mapped access to input files.
+
+Inputs are mapped read-only. Content sniffing (:meth:`SourceBuffer.search`,
+:meth:`SourceBuffer.find_lines`) runs over the raw bytes, and consumers that
+read the whole file decode it once with :meth:`SourceBuffer.text`. Consumers
+that only read some ranges, such as lazily parsed OpenAPI documents, index a
+:class:`SourceBuffer` as a sequence of lines backed by a line-offset index;
+a slice of lines is decoded in one call.
+
+Text that has already been decoded is viewed the same way by
+:class:`TextLines`, whose :class:`LineSpan` views let many consumers refer to
+ranges of lines without copying them.
+"""
+
+import mmap
+import re
+from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, overload
+
+
+_NEWLINE = re.compile(b"\n")
+_TEXT_NEWLINE = re.compile("\n")
+
+# Iteration decodes this many lines per call, so a full pass neither decodes
+# line by line nor holds every decoded line at once.
+_ITER_CHUNK_LINES = 4096
+
+
+class _LineIndex(Sequence[str], ABC):
+    """Content viewed as a sequence of lines through a line-offset index.
+
+    Lines are split on ``\\n`` and a trailing ``\\r`` is dropped, matching
+    ``str.splitlines`` for LF and CRLF files. The index is built on first
+    access, and lines are sliced from the content only when they are read.
+    Subclasses provide the content and how a slice of it is decoded.
+    """
+
+    _newline = _NEWLINE
+
+    def __init__(self) -> None:
+        self._starts: Optional[array] = None
+        self._count = 0
+
+    @abstractmethod
+    def _content(self) -> bytes | mmap.mmap | str:
+        """Return the content the lines are sliced from."""
+
+    @abstractmethod
+    def _decode(self, chunk: bytes | str) -> str:
+        """Return a slice of the content as text."""
+
+    def __len__(self) -> int:
+        self._index()
+        return self._count
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[str]: ...
+
+    def __getitem__(self, index):
+        starts = self._index()
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._count)
+            if step != 1:
+                return [self._line(starts, i) for i in range(start, stop, step)]
+            return self._lines(starts, start, stop)
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("line index out of range")
+        return self._line(starts, index)
+
+    def __iter__(self) -> Iterator[str]:
+        starts = self._index()
+        for start in range(0, self._count, _ITER_CHUNK_LINES):
+            yield from self._lines(starts, start, min(start + _ITER_CHUNK_LINES, self._count))
+
+    def _index(self) -> array:
+        """Build the line-offset index on first use."""
+
+        if self._starts is None:
+            content = self._content()
+            starts = array("q", [0])
+            starts.extend(match.end() for match in self._newline.finditer(content))
+            self._count = len(starts) - 1 if starts[-1] == len(content) else len(starts)
+            starts.append(len(content) + 1)
+            self._starts = starts
+        return self._starts
+
+    def _line(self, starts: array, index: int) -> str:
+        line = self._decode(self._content()[starts[index] : starts[index + 1] - 1])
+        return line[:-1] if line.endswith("\r") else line
+
+    def _lines(self, starts: array, start: int, stop: int) -> List[str]:
+        """Decode lines ``[start, stop)`` with a single decode call."""
+
+        if start >= stop:
+            return []
+        text = self._decode(self._content()[starts[start] : starts[stop] - 1])
+        lines = text.split("\n")
+        if "\r" in text:
+            lines = [line[:-1] if line.endswith("\r") else line for line in lines]
+        return lines
+
+
+class SourceBuffer(_LineIndex):
+    """A read-only mapped file viewed as a sequence of decoded lines."""
+
+    def __init__(self, path: str | Path, *, encoding: str = "utf-8") -> None:
+        super().__init__()
+        self.path = Path(path)
+        self.encoding = encoding
+        self._file = open(self.path, "rb")
+        self._mmap: Optional[mmap.mmap] = None
+        try:
+            if self.path.stat().st_size:
+                self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            self._file.close()
+            raise
+
+    @property
+    def data(self) -> bytes | mmap.mmap:
+        """The raw file contents, without copying them."""
+
+        return self._mmap if self._mmap is not None else b""
+
+    def search(self, pattern: bytes, flags: int = 0) -> bool:
+        """True when the regular expression ``pattern`` occurs in the file."""
+
+        return re.search(pattern, self.data, flags) is not None
+
+    def text(self) -> str:
+        """Decode the whole file at once."""
+
+        return self.data[:].decode(self.encoding)
+
+    def find_lines(self, pattern: bytes, start: int = 0, end: Optional[int] = None) -> List[int]:
+        """Indexes of the lines in ``[start, end)`` where ``pattern`` matches.
+
+        The pattern is compiled in multiline mode and run over the raw bytes,
+        so lines that do not match are never decoded.
+        """
+
+        starts = self._index()
+        end = self._count if end is None else min(end, self._count)
+        if start >= end:
+            return []
+        regex = re.compile(pattern, re.MULTILINE)
+        stop = min(starts[end], len(self.data))
+        return [
+            bisect_right(starts, match.start()) - 1
+            for match in regex.finditer(self.data, starts[start], stop)
+        ]
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def __enter__(self) -> "SourceBuffer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _content(self) -> bytes | mmap.mmap:
+        return self.data
+
+    def _decode(self, chunk: bytes) -> str:
+        return chunk.decode(self.encoding)
+
+
+class TextLines(_LineIndex):
+    """Decoded text viewed as a sequence of lines, split on demand.
+
+    Lines follow the same rules as :class:`SourceBuffer`.
+    """
+
+    _newline = _TEXT_NEWLINE
+
+    def __init__(self, text: str) -> None:
+        super().__init__()
+        self.text = text
+
+    def span(self, start: int, stop: int) -> LineSpan:
+        """A view of lines ``[start, stop)`` that shares this text."""
+
+        return LineSpan(self, start, stop)
+
+    def _content(self) -> str:
+        return self.text
+
+    def _decode(self, chunk: str) -> str:
+        return chunk
+
+
+class LineSpan(Sequence[str]):
+    """Lines ``[start, stop)`` of a :class:`TextLines`, read on access."""
+
+    __slots__ = ("source", "start", "stop")
+
+    def __init__(self, source: TextLines, start: int, stop: int) -> None:
+        self.source = source
+        self.start = max(start, 0)
+        self.stop = max(self.start, stop)
+
+    def __len__(self) -> int:
+        return max(0, min(self.stop, len(self.source)) - self.start)
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[str]: ...
+
+    def __getitem__(self, index):
+        length = len(self)
+        if isinstance(index, slice):
+            return [self.source[self.start + i] for i in range(*index.indices(length))]
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("line index out of range")
+        return self.source[self.start + index]
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(len(self)):
+            yield self.source[self.start + index]
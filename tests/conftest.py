@@ -0,0 +1,15 @@
+from textwrap import dedent
+
+import pytest
+
+
+@pytest.fixture
+def write_spec(tmp_path):
+    """Return a function that writes a dedented spec into ``tmp_path``."""
+
+    def write(text, name="openapi.yml"):
+        spec = tmp_path / name
+        spec.write_text(dedent(text).lstrip())
+        return spec
+
+    return write
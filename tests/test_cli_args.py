@@ -41,3 +41,43 @@ def test_rejects_invalid_lang_choice():
     """Invalid language choices trigger argument parsing errors."""
     with pytest.raises(SystemExit):
         cli.parse_cli_args(["file.kt", "--lang", "javascript"])
+
+
+def test_yaml_parser_choice():
+    """The OpenAPI YAML backend can be selected and is validated."""
+    args = cli.parse_cli_args(["spec.yml", "--yaml-parser", "ruamel"])
+
+    assert args.yaml_parser == "ruamel"
+    assert cli.parse_cli_args(["spec.yml"]).yaml_parser is None
+    with pytest.raises(SystemExit):
+        cli.parse_cli_args(["spec.yml", "--yaml-parser", "pyyaml"])
+
+
+def test_lazy_parsing_flag():
+    """Lazy OpenAPI parsing is opt-in on the command line."""
+    assert cli.parse_cli_args(["spec.yml", "--lazy-parsing"]).lazy_parsing is True
+    assert cli.parse_cli_args(["spec.yml"]).lazy_parsing is False
+
+
+def test_endpoint_selection_options():
+    """Path patterns are repeatable and methods are validated."""
+    args = cli.parse_cli_args(
+        ["spec.yml", "--paths", "/orders/*", "--paths", "re:/v[0-9]+/.*", "--methods", "GET, post"]
+    )
+
+    assert args.paths == ["/orders/*", "re:/v[0-9]+/.*"]
+    assert args.methods == ["get", "post"]
+    with pytest.raises(SystemExit):
+        cli.parse_cli_args(["spec.yml", "--methods", "options"])
+
+
+def test_jobs_option():
+    """The OpenAPI worker count is an optional integer."""
+    assert cli.parse_cli_args(["spec.yml", "--jobs", "4"]).jobs == 4
+    assert cli.parse_cli_args(["spec.yml"]).jobs is None
+
+
+def test_schema_graph_option():
+    """The schema graph export path is optional."""
+    assert cli.parse_cli_args(["spec.yml", "--schema-graph", "g.dot"]).schema_graph == "g.dot"
+    assert cli.parse_cli_args(["spec.yml"]).schema_graph is None
@@ -67,3 +67,51 @@ LOG_LEVEL=INFO
     assert cfg.default_rule_id == "ID-200"
     assert cfg.log_file == "cli.log"
     assert cfg.log_level == "WARNING"
+
+
+def test_openapi_expansion_limits(tmp_path):
+    """Expansion limits are read as integers and fall back to defaults when invalid."""
+    env_path = tmp_path / ".env"
+    env_path.write_text("OPENAPI_MAX_SCHEMA_DEPTH=5\nOPENAPI_MAX_RULES_PER_ENDPOINT=many\n")
+
+    cfg = config.load_config(env_path=env_path)
+
+    assert cfg.openapi_max_schema_depth == 5
+    assert cfg.openapi_max_rules_per_endpoint == 10000
+
+
+def test_openapi_lazy_parsing_flag(tmp_path):
+    """Lazy OpenAPI parsing is off by default and accepts common truthy values."""
+    env_path = tmp_path / ".env"
+
+    assert config.load_config(env_path=env_path).openapi_lazy_parsing is False
+
+    env_path.write_text("OPENAPI_LAZY_PARSING=Yes\n")
+    assert config.load_config(env_path=env_path).openapi_lazy_parsing is True
+
+
+def test_openapi_jobs(tmp_path):
+    """The worker count defaults to one and accepts zero for all CPUs."""
+    env_path = tmp_path / ".env"
+
+    assert config.load_config(env_path=env_path).openapi_jobs == 1
+    assert config.load_config(env_path=env_path, overrides={"OPENAPI_JOBS": "0"}).openapi_jobs == 0
+
+
+def test_kotlin_jobs(tmp_path):
+    """Kotlin project parsing is sequential unless KOTLIN_JOBS says otherwise."""
+    env_path = tmp_path / ".env"
+
+    assert config.load_config(env_path=env_path).kotlin_jobs == 1
+    env_path.write_text("KOTLIN_JOBS=3\n")
+    assert config.load_config(env_path=env_path).kotlin_jobs == 3
+
+
+def test_openapi_yaml_parser(tmp_path):
+    """The YAML backend is matched case-insensitively and unknown names fall back to builtin."""
+    env_path = tmp_path / ".env"
+
+    env_path.write_text("OPENAPI_YAML_PARSER=Ruamel\n")
+    assert config.load_config(env_path=env_path).openapi_yaml_parser == "ruamel"
+    env_path.write_text("OPENAPI_YAML_PARSER=libfast\n")
+    assert config.load_config(env_path=env_path).openapi_yaml_parser == "builtin"
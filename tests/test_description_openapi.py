@@ -1,7 +1,14 @@
 from src.description import (
+    describe_openapi_alternatives,
     describe_openapi_array_items,
     describe_openapi_enum,
+    describe_openapi_format,
+    describe_openapi_length,
+    describe_openapi_nullable,
+    describe_openapi_pattern,
+    describe_openapi_range,
     describe_openapi_request_body_required,
+    describe_openapi_required_parameter,
     describe_openapi_required_property,
 )
 
@@ -36,3 +43,47 @@ def test_array_item_requirement_is_explicit():
     description = describe_openapi_array_items("offers[]", "each offer must include an 'id'")
 
     assert description == "Each item in 'offers[]' MUST satisfy: each offer must include an 'id'."
+
+
+def test_length_bounds_cover_one_or_both_limits():
+    assert describe_openapi_length("Pet.name", "1", "20") == (
+        "The 'Pet.name' field MUST be between 1 and 20 characters long."
+    )
+    assert describe_openapi_length("Pet.name", min_length="3").endswith("at least 3 characters long.")
+    assert describe_openapi_length("Pet.name", max_length="9").endswith("at most 9 characters long.")
+
+
+def test_range_bounds_respect_exclusivity():
+    assert describe_openapi_range("Pet.age", "0", "30") == (
+        "The 'Pet.age' field MUST be greater than or equal to 0 and less than or equal to 30."
+    )
+    assert describe_openapi_range("Pet.age", maximum="30", exclusive_maximum=True) == (
+        "The 'Pet.age' field MUST be less than 30."
+    )
+
+
+def test_pattern_format_and_nullable_templates():
+    assert describe_openapi_pattern("Pet.code", "^[A-Z]{3}$") == (
+        "The 'Pet.code' field MUST match the pattern '^[A-Z]{3}$'."
+    )
+    assert describe_openapi_format("Pet.born", "date") == "The 'Pet.born' field MUST be a valid date value."
+    assert describe_openapi_nullable("Pet.tag", True) == "The 'Pet.tag' field MAY be null."
+    assert describe_openapi_nullable("Pet.tag", False) == "The 'Pet.tag' field MUST NOT be null."
+
+
+def test_required_parameter_template_mentions_location_and_type():
+    assert describe_openapi_required_parameter("query", "limit", "integer") == (
+        "The 'limit' query parameter of type integer MUST be provided."
+    )
+    assert describe_openapi_required_parameter("path", "id") == (
+        "The 'id' path parameter MUST be provided."
+    )
+
+
+def test_alternatives_template_distinguishes_one_of_and_any_of():
+    assert describe_openapi_alternatives("Pet", ["Cat", "Dog"], exclusive=True) == (
+        "The 'Pet' value MUST match exactly one of: Cat, Dog."
+    )
+    assert describe_openapi_alternatives("Pet", ["Cat", "Dog"], exclusive=False) == (
+        "The 'Pet' value MUST match at least one of: Cat, Dog."
+    )
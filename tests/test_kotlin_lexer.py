@@ -0,0 +1,88 @@
+from src.analyzers.kotlin_lexer import CONDITION, IDENT, RUN, STRING, SYMBOL, split_run, tokenize
+
+
+def _kinds_and_texts(source):
+    return [(token.kind, token.text) for token in tokenize(source)]
+
+
+def test_brackets_inside_literals_and_comments_are_not_tokens():
+    source = 'val s = "a { b ${call("}")} c" // { (\nval c = \'{\' /* ( /* ) */ } */'
+
+    tokens = _kinds_and_texts(source)
+
+    assert [kind for kind, _ in tokens if kind in "(){}[]"] == []
+    assert (STRING, '"a { b ${call("}")} c"') in tokens
+    assert ("char", "'{'") in tokens
+
+
+def test_raw_strings_end_at_the_last_quote_of_the_closing_run():
+    source = 'val r = """say "hi" { """"\nfoo()'
+
+    tokens = list(tokenize(source))
+
+    assert tokens[3].text == '"""say "hi" { """"'
+    assert (tokens[4].kind, tokens[4].text, tokens[4].line) == (IDENT, "foo", 2)
+
+
+def test_lines_account_for_multi_line_literals_and_comments():
+    source = '/* one\ntwo */ a\nval s = """\n{\n"""\nb && c'
+
+    tokens = list(tokenize(source))
+
+    assert [(token.text, token.line) for token in tokens if token.kind == IDENT] == [
+        ("a", 2),
+        ("val", 3),
+        ("s", 3),
+        ("b", 6),
+        ("c", 6),
+    ]
+    assert tokens[-2].kind == SYMBOL and tokens[-2].text == "&&"
+    assert (tokens[4].kind, tokens[4].end_line) == (STRING, 5)
+
+
+def test_unterminated_string_ends_at_the_line_break():
+    tokens = list(tokenize('val s = "open\nfun f() {}'))
+
+    assert tokens[3].text == '"open'
+    assert [token.text for token in tokens[4:7]] == ["fun", "f", "("]
+
+
+def test_offsets_and_lines_survive_whitespace_and_unterminated_templates():
+    source = '\n\n  if (a)  "x$y\\"" \t\n  "${open(  \n'
+
+    tokens = list(tokenize(source))
+
+    assert [(token.text, token.line) for token in tokens] == [
+        ("if", 3),
+        ("(", 3),
+        ("a", 3),
+        (")", 3),
+        ('"x$y\\""', 3),
+        ('"${open(  \n', 4),
+    ]
+    assert all(source[token.start : token.end] == token.text for token in tokens)
+
+
+def test_runs_split_back_into_the_tokens_they_stand_for():
+    source = (
+        "fun check(a: Int, b: List<String>) {\n"
+        "    val key = config.mediums[a] ?: emptySet()\n"
+        '    if (shouldRun(a, b)) throw IllegalStateException("no")\n'
+        "    log(key) // done\n"
+        "}"
+    )
+
+    tokens = list(tokenize(source, runs=True))
+    expanded = [
+        part
+        for token in tokens
+        for part in (split_run(source, token) if token.kind in (RUN, CONDITION) else [token])
+    ]
+
+    assert expanded == list(tokenize(source))
+    assert [(token.kind, token.text) for token in tokens if token.kind in (RUN, CONDITION)] == [
+        (RUN, "check(a: Int, b: List<String>)"),
+        (RUN, "val key = config.mediums[a] ?: emptySet()"),
+        (CONDITION, "if (shouldRun(a, b))"),
+        (RUN, "log(key)"),
+    ]
@@ -2,7 +2,13 @@ from pathlib import Path
 
 import pytest
 
-from src.analyzers.kotlin_analyzer import analyze_kotlin_file
+from src.analyzers.kotlin_analyzer import (
+    _iter_functions,
+    _parse_functions,
+    _RuleStream,
+    analyze_kotlin_file,
+    iter_kotlin_rules,
+)
 from src.description import describe_kotlin_if_throw, describe_kotlin_require
 from src.models import SourceType
 
@@ -77,3 +83,281 @@ fun checkDetails(data: String) {
     assert validation_rule.start_line > guard_rule.start_line
     assert validation_rule.end_line >= validation_rule.start_line
     assert validation_rule.description.endswith("."), "Descriptions should be human readable"
+
+
+def test_literals_and_comments_do_not_break_block_boundaries(tmp_path):
+    content = """
+fun validate(input: String) {
+    val template = "{ ${input.map { "}" }} ("
+    // if (input.isBlank()) {
+    require(
+        input.isNotEmpty() &&
+            input != "}"
+    ) { "input required" }
+    if (input.length > 10 &&
+        input.startsWith("x")) {
+        throw IllegalArgumentException("too long")
+    }
+}
+
+fun after(value: Int) {
+    if (value < 0) throw IllegalStateException("negative")
+}
+""".strip()
+    kotlin_file = tmp_path / "Literals.kt"
+    kotlin_file.write_text(content)
+
+    rules = analyze_kotlin_file(kotlin_file)
+
+    assert [rule.description for rule in rules] == [
+        describe_kotlin_require('input.isNotEmpty() && input != "}"', message="input required"),
+        describe_kotlin_if_throw(
+            'input.length > 10 && input.startsWith("x")',
+            exception="IllegalArgumentException",
+            message="too long",
+        ),
+        describe_kotlin_if_throw(
+            "value < 0", exception="IllegalStateException", message="negative"
+        ),
+    ]
+    assert (rules[0].start_line, rules[0].end_line) == (4, 7)
+    assert (rules[1].start_line, rules[1].end_line) == (1, 11)
+    assert (rules[2].start_line, rules[2].end_line) == (14, 15)
+
+
+def test_unbalanced_parameter_list_does_not_fail_the_file(tmp_path):
+    content = """
+class Validator(private val config: Config) {
+    private fun shouldValidate(channel: Channel: Boolean =
+        config.enabled
+
+    fun validate(request: Request) {
+        if (shouldValidate(request.channel)) {
+            throw IllegalArgumentException("bad channel")
+        }
+    }
+}
+""".strip()
+    kotlin_file = tmp_path / "Unbalanced.kt"
+    kotlin_file.write_text(content)
+
+    rules = analyze_kotlin_file(kotlin_file)
+
+    assert [(rule.start_line, rule.end_line) for rule in rules] == [(5, 8)]
+    assert "shouldValidate(request.channel)" in rules[0].description
+
+
+def test_block_tree_nests_if_else_and_when_blocks():
+    source = """
+fun route(x: Int, s: String) {
+    if (x > 0) {
+        log("positive")
+    } else if (x < -10) throw IllegalStateException("too small")
+    else {
+        when (s) {
+            "a" -> if (x == 1) throw IllegalArgumentException("one")
+            else -> notify(s)
+        }
+    }
+}
+""".strip().splitlines()
+
+    function = _parse_functions(source).resolve("route", None)
+
+    def shape(block):
+        return (block.kind, block.line, block.end_line, [shape(child) for child in block.children])
+
+    assert shape(function.body) == (
+        "function",
+        1,
+        11,
+        [
+            ("if", 2, 4, []),
+            ("else", 4, 10, [("if", 4, 4, []), ("else", 5, 10, [("when", 6, 9, [("if", 7, 7, [])])])]),
+        ],
+    )
+    assert list(function.lines) == source
+    first_if, outer_else = function.body.children
+    assert (first_if.first_call, first_if.throws, first_if.message) == ("log", False, "positive")
+    nested_if = outer_else.children[1].children[0].children[0]
+    assert (nested_if.condition, nested_if.exception, nested_if.message) == (
+        "x == 1",
+        "IllegalArgumentException",
+        "one",
+    )
+    assert [block.kind for block in function.blocks()] == [
+        "function", "if", "else", "if", "else", "when", "if"
+    ]
+
+
+def test_require_rules_are_numbered_before_throw_rules_of_the_same_function(tmp_path):
+    content = """
+fun validate(age: Int, name: String) {
+    if (age < 0) {
+        throw IllegalArgumentException("negative age")
+    }
+    require(name.isNotBlank()) { "name required" }
+    if (age > 150) throw IllegalArgumentException("too old")
+}
+""".strip()
+    kotlin_file = tmp_path / "Ordered.kt"
+    kotlin_file.write_text(content)
+
+    rules = analyze_kotlin_file(kotlin_file)
+
+    assert [(rule.internal_id, rule.description.split(",")[0]) for rule in rules] == [
+        (1, "The input must satisfy name.isNotBlank(); otherwise the call fails with 'name required'."),
+        (2, "If age < 0"),
+        (3, "If age > 150"),
+    ]
+
+
+def test_guards_resolve_overloads_and_class_scoped_methods(tmp_path):
+    content = """
+class Orders {
+    fun submit(order: String) {
+        if (shouldSubmit(order)) {
+            verify(order, 1)
+        }
+    }
+
+    private fun shouldSubmit(order: String): Boolean = order.isNotEmpty()
+
+    fun verify(order: String) {
+        if (order.length > 10) throw IllegalStateException("long order")
+    }
+
+    fun verify(order: String, quantity: Int) {
+        if (quantity < 0) throw IllegalArgumentException("negative quantity")
+    }
+
+    companion object {
+        fun verify(order: String, quantity: Int, price: Int) {
+            if (price < 0) throw IllegalArgumentException("negative price")
+        }
+    }
+}
+
+class Invoices {
+    fun verify(order: String, quantity: Int) {
+        if (quantity == 0) throw IllegalArgumentException("empty invoice")
+    }
+}
+""".strip()
+    kotlin_file = tmp_path / "Orders.kt"
+    kotlin_file.write_text(content)
+
+    functions = _parse_functions(content.splitlines())
+    assert [function.key for function in functions] == [
+        ("Orders", "submit", 1),
+        ("Orders", "shouldSubmit", 1),
+        ("Orders", "verify", 1),
+        ("Orders", "verify", 2),
+        ("Orders", "verify", 3),
+        ("Invoices", "verify", 2),
+    ]
+    assert functions.resolve("verify", "Invoices", 2).owner == "Invoices"
+    assert len({id(function.lines.source) for function in functions}) == 1
+    assert functions.resolve("submit", "Orders").lines[-1] == "    }"
+    assert functions.resolve("verify", None, 2) is None  # Ambiguous outside both classes.
+
+    rules = analyze_kotlin_file(kotlin_file)
+
+    guard = rules[0]
+    dependent = [rule for rule in rules if rule.depends_on_internal == {guard.internal_id}]
+    assert [rule.description for rule in dependent] == [
+        "If quantity < 0, the code throws IllegalArgumentException with message 'negative quantity'."
+    ]
+    assert guard.end_line == 13
+
+
+def test_streamed_rules_hold_back_guards_until_their_target_is_declared(tmp_path):
+    content = """
+fun first(value: String) {
+    require(value.isNotEmpty()) { "value required" }
+}
+
+fun validate(data: String) {
+    if (shouldCheck(data)) {
+        checkDetails(data)
+    }
+}
+
+fun shouldCheck(data: String): Boolean = data.startsWith("X")
+
+fun late(data: String) {
+    require(data.length < 10)
+}
+
+fun checkDetails(data: String) {
+    if (data.endsWith("!")) throw IllegalStateException("no shouting")
+}
+""".strip()
+    kotlin_file = tmp_path / "Streamed.kt"
+    kotlin_file.write_text(content)
+
+    stream = iter_kotlin_rules(kotlin_file)
+    first = next(stream)
+    assert (first.internal_id, first.start_line) == (1, 2)
+
+    guard, late, throw = list(stream)
+    assert [rule.internal_id for rule in (guard, late, throw)] == [2, 3, 4]
+    assert guard.end_line == 16  # Extended to the line before checkDetails.
+    assert throw.depends_on_internal == {guard.internal_id}
+
+
+def test_streamed_throw_rules_wait_for_guards_of_their_class(tmp_path):
+    content = """
+class Checks {
+    fun checkDetails(data: String) {
+        if (data.endsWith("!")) throw IllegalStateException("no shouting")
+    }
+
+    fun validate(data: String) {
+        if (shouldCheck(data)) {
+            checkDetails(data)
+        }
+    }
+}
+""".strip()
+    kotlin_file = tmp_path / "Backwards.kt"
+    kotlin_file.write_text(content)
+
+    throw, guard = list(iter_kotlin_rules(kotlin_file))
+
+    assert guard.description == "If shouldCheck(data), then checkDetails is executed."
+    assert throw.depends_on_internal == {guard.internal_id}
+
+
+def test_streamed_guards_calling_outside_their_class_resolve_when_it_closes():
+    content = """
+class Orders {
+    fun submit(order: Order) {
+        if (shouldSubmit(order)) {
+            checkOrder(order)
+        }
+        if (order.total < 0) throw IllegalArgumentException("negative total")
+    }
+
+    fun shouldSubmit(order: Order): Boolean = order.open
+}
+
+fun checkOrder(order: Order) {
+    require(order.lines.isNotEmpty()) { "lines required" }
+}
+
+class Invoices {
+    fun issue(invoice: Invoice) {
+        require(invoice.number.isNotBlank())
+    }
+}
+""".strip()
+    stream = _RuleStream()
+
+    released = [
+        [rule.internal_id for rule in stream.add(func, "Orders.kt")]
+        for func in _iter_functions(content)
+    ]
+
+    assert released == [[], [], [1, 2], [3]]
+    assert stream.finish() == []
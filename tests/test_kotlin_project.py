@@ -0,0 +1,173 @@
+import csv
+import logging
+
+import pytest
+
+from src.analyzers import kotlin_analyzer
+from src.analyzers.kotlin_analyzer import (
+    KotlinAnalyzerError,
+    analyze_kotlin_file,
+    analyze_kotlin_project,
+)
+from src.config import Config
+from src.orchestrator import orchestrate
+
+
+def _write_project(root):
+    (root / "api").mkdir(parents=True)
+    (root / "rules").mkdir()
+    # The guard's file sorts after the validator it calls.
+    (root / "rules" / "Details.kt").write_text(
+        """
+package com.example.rules
+
+fun checkDetails(data: String) {
+    if (data.endsWith("!")) {
+        throw IllegalStateException("no shouting")
+    }
+}
+""".lstrip()
+    )
+    (root / "rules" / "Predicates.kt").write_text(
+        """
+package com.example.rules
+
+fun shouldCheck(data: String): Boolean = data.startsWith("X")
+""".lstrip()
+    )
+    (root / "validate.kt").write_text(
+        """
+package com.example
+
+fun validate(data: String) {
+    if (shouldCheck(data)) {
+        checkDetails(data)
+    }
+    require(data.isNotEmpty()) { "data required" }
+}
+""".lstrip()
+    )
+    (root / "api" / "Notes.txt").write_text("fun ignored() { require(false) }\n")
+
+
+def test_guards_resolve_across_files(tmp_path):
+    _write_project(tmp_path)
+
+    rules = analyze_kotlin_project(tmp_path)
+
+    assert [(rule.internal_id, rule.source_file) for rule in rules] == [
+        (1, "rules/Details.kt"),
+        (2, "validate.kt"),
+        (3, "validate.kt"),
+    ]
+    throw_rule, require_rule, guard_rule = rules
+    assert guard_rule.description == "If shouldCheck(data), then checkDetails is executed."
+    assert guard_rule.start_line == 3
+    assert throw_rule.depends_on_internal == {guard_rule.internal_id}
+    assert require_rule.depends_on_internal == set()
+
+
+def test_parallel_parsing_matches_sequential_run(tmp_path):
+    _write_project(tmp_path)
+
+    def summary(rules):
+        return [
+            (rule.internal_id, rule.source_file, rule.description, rule.depends_on_internal)
+            for rule in rules
+        ]
+
+    assert summary(analyze_kotlin_project(tmp_path, jobs=2)) == summary(
+        analyze_kotlin_project(tmp_path)
+    )
+
+
+def test_same_file_declarations_take_precedence(tmp_path):
+    _write_project(tmp_path)
+    (tmp_path / "rules" / "Other.kt").write_text(
+        """
+fun checkDetails(data: String, strict: Boolean) {
+    if (strict) throw IllegalStateException("strict")
+}
+""".lstrip()
+    )
+    (tmp_path / "validate.kt").write_text(
+        """
+fun validate(data: String) {
+    if (shouldCheck(data)) {
+        checkDetails(data)
+    }
+}
+
+fun checkDetails(data: String) {
+    if (data.isBlank()) throw IllegalArgumentException("blank")
+}
+""".lstrip()
+    )
+
+    rules = analyze_kotlin_project(tmp_path)
+
+    guard = next(rule for rule in rules if rule.description.startswith("If shouldCheck"))
+    dependent = [rule.description for rule in rules if rule.depends_on_internal == {guard.internal_id}]
+    assert dependent == ["If data.isBlank(), the code throws IllegalArgumentException with message 'blank'."]
+
+
+def test_project_without_kotlin_files_is_rejected(tmp_path):
+    with pytest.raises(KotlinAnalyzerError):
+        analyze_kotlin_project(tmp_path)
+
+
+def test_orchestrator_analyzes_directories_as_kotlin_projects(tmp_path, caplog):
+    project = tmp_path / "src"
+    _write_project(project)
+    output = tmp_path / "rules.csv"
+    config = Config(
+        default_rule_id="RULE-001",
+        openapi_endpoint_entities=[],
+        llm_method="rule-based",
+        llm_model="",
+        llm_url="",
+        llm_api_key="",
+        log_file="",
+        log_level="INFO",
+        kotlin_jobs=2,
+    )
+
+    with caplog.at_level(logging.INFO, logger="valid_builder"):
+        rules = orchestrate(project, output, config, logger=logging.getLogger("valid_builder"))
+
+    assert len(rules) == 3
+    with output.open(newline="") as handle:
+        rows = list(csv.DictReader(handle))
+    assert [row["Source file"] for row in rows] == ["rules/Details.kt", "validate.kt", "validate.kt"]
+    assert "Analyzing 3 Kotlin files" in caplog.text
+
+
+def test_files_without_trigger_bytes_are_skipped_before_parsing(tmp_path, monkeypatch, caplog):
+    _write_project(tmp_path)
+    (tmp_path / "api" / "Model.kt").write_text("data class Model(val id: String, val name: String)\n")
+    parsed = []
+    original = kotlin_analyzer._parse_functions
+
+    def recording_parse(lines):
+        parsed.append(lines.path.name)
+        return original(lines)
+
+    monkeypatch.setattr(kotlin_analyzer, "_parse_functions", recording_parse)
+
+    with caplog.at_level(logging.INFO, logger="valid_builder"):
+        rules = analyze_kotlin_project(tmp_path, logger=logging.getLogger("valid_builder"))
+
+    assert len(rules) == 3
+    assert sorted(parsed) == ["Details.kt", "Predicates.kt", "validate.kt"]
+    skipped = [record for record in caplog.records if hasattr(record, "skipped_files")]
+    assert [record.skipped_files for record in skipped] == [1]
+
+
+def test_single_file_without_trigger_bytes_yields_no_rules(tmp_path, caplog):
+    kotlin_file = tmp_path / "Model.kt"
+    kotlin_file.write_text("data class Model(val id: String)\n")
+
+    with caplog.at_level(logging.INFO, logger="valid_builder"):
+        assert analyze_kotlin_file(kotlin_file) == []
+
+    assert "Skipped 1 Kotlin file(s)" in caplog.text
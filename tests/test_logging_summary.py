@@ -30,3 +30,21 @@ def test_failure_summary_counts_errors_and_targets_stderr(capsys):
 
     assert "Failed with 1 error(s). See messages above." in captured.err
     assert "Failed with" not in captured.out
+
+
+def test_success_summary_reports_skipped_files(capsys):
+    """Checks that files skipped by an analyzer's prefilter are counted in the summary."""
+
+    logger = logging_utils.setup_logging(log_level="INFO")
+    summary = logging_utils.attach_summary_handler(logger)
+
+    logger.info("skipped two", extra={"skipped_files": 2})
+    logger.info("skipped one", extra={"skipped_files": 1})
+    logging_utils.log_final_summary(logger, summary, rule_count=0, success=True)
+
+    captured = capsys.readouterr()
+
+    assert (
+        "Completed successfully. Extracted 0 rules. No warnings. "
+        "Skipped 3 file(s) without validation constructs."
+    ) in captured.out
@@ -0,0 +1,150 @@
+import pytest
+
+from src.analyzers import openapi_analyzer
+from src.analyzers.openapi_analyzer import analyze_openapi_file
+
+
+SPEC = """
+    openapi: 3.0.0
+    paths:
+      /orders/{orderId}:
+        parameters:
+          - $ref: '#/components/parameters/OrderId'
+          - name: X-Tenant
+            in: header
+            required: true
+            schema:
+              type: string
+        get:
+          parameters:
+            - $ref: '#/components/parameters/Limit'
+          responses:
+            '200':
+              $ref: '#/components/responses/OrderFound'
+        put:
+          parameters:
+            - name: X-Tenant
+              in: header
+              schema:
+                type: string
+          requestBody:
+            $ref: '#/components/requestBodies/OrderBody'
+    components:
+      parameters:
+        OrderId:
+          name: orderId
+          in: path
+          schema:
+            type: string
+            pattern: '^[0-9]+$'
+        Limit:
+          name: limit
+          in: query
+          required: true
+          schema:
+            type: integer
+            maximum: 100
+      requestBodies:
+        OrderBody:
+          required: true
+          content:
+            application/json:
+              schema:
+                $ref: '#/components/schemas/Order'
+      responses:
+        OrderFound:
+          description: The order
+          content:
+            application/json:
+              schema:
+                $ref: '#/components/schemas/Order'
+      schemas:
+        Order:
+          type: object
+          required: [ id ]
+          properties:
+            id:
+              type: string
+"""
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_component_refs_and_inherited_parameters(write_spec, lazy):
+    rules = analyze_openapi_file(write_spec(SPEC), lazy=lazy)
+
+    assert [(rule.endpoint, rule.endpoint_entity, rule.description) for rule in rules] == [
+        (
+            "/orders/{orderId} [GET]",
+            "path.orderId",
+            "The 'orderId' path parameter of type string MUST be provided.",
+        ),
+        (
+            "/orders/{orderId} [GET]",
+            "path.orderId",
+            "The 'path.orderId' field MUST match the pattern '^[0-9]+$'.",
+        ),
+        (
+            "/orders/{orderId} [GET]",
+            "header.X-Tenant",
+            "The 'X-Tenant' header parameter of type string MUST be provided.",
+        ),
+        (
+            "/orders/{orderId} [GET]",
+            "query.limit",
+            "The 'limit' query parameter of type integer MUST be provided.",
+        ),
+        (
+            "/orders/{orderId} [GET]",
+            "query.limit",
+            "The 'query.limit' field MUST be less than or equal to 100.",
+        ),
+        (
+            "/orders/{orderId} [GET]",
+            "Order.id",
+            "The Order object MUST contain a 'id' property of type string.",
+        ),
+        (
+            "/orders/{orderId} [PUT]",
+            "path.orderId",
+            "The 'orderId' path parameter of type string MUST be provided.",
+        ),
+        (
+            "/orders/{orderId} [PUT]",
+            "path.orderId",
+            "The 'path.orderId' field MUST match the pattern '^[0-9]+$'.",
+        ),
+        (
+            "/orders/{orderId} [PUT]",
+            "Order",
+            "For the PUT /orders/{orderId} endpoint, a application/json request body "
+            "conforming to Order MUST be provided; requests without a body are invalid.",
+        ),
+        (
+            "/orders/{orderId} [PUT]",
+            "Order.id",
+            "The Order object MUST contain a 'id' property of type string.",
+        ),
+    ]
+    constraint, required = rules[1], rules[0]
+    assert constraint.depends_on_internal == {required.internal_id}
+    assert (rules[0].start_line, rules[0].end_line) == (27, 32)
+
+
+def test_shared_parameters_are_analyzed_once(write_spec, monkeypatch):
+    calls = []
+    original = openapi_analyzer._constraint_templates
+
+    def counting(prop_name, prop_node, source_file):
+        calls.append(prop_name)
+        return original(prop_name, prop_node, source_file)
+
+    monkeypatch.setattr(openapi_analyzer, "_constraint_templates", counting)
+
+    analyze_openapi_file(write_spec(SPEC))
+
+    assert sorted(name for name in calls if name != "id") == [
+        "X-Tenant",
+        "X-Tenant",
+        "limit",
+        "orderId",
+    ]
@@ -0,0 +1,219 @@
+import pytest
+
+from src.analyzers import openapi_analyzer
+from src.analyzers.openapi_analyzer import analyze_openapi_file
+
+
+SPEC = """
+    openapi: 3.0.0
+    paths:
+      /dogs:
+        post:
+          requestBody:
+            required: true
+            content:
+              application/json:
+                schema:
+                  $ref: '#/components/schemas/Dog'
+          responses:
+            '200':
+              content:
+                application/json:
+                  schema:
+                    $ref: '#/components/schemas/Owner'
+    components:
+      schemas:
+        Entity:
+          type: object
+          required: [ id ]
+          properties:
+            id:
+              type: string
+              format: uuid
+        Pet:
+          allOf:
+            - $ref: '#/components/schemas/Entity'
+            - type: object
+              required: [ name ]
+              properties:
+                name:
+                  type: string
+                  maxLength: 20
+        Dog:
+          allOf:
+            - $ref: '#/components/schemas/Pet'
+          required: [ bark ]
+          properties:
+            bark:
+              type: boolean
+        Tagged:
+          type: object
+          required: [ tag ]
+          properties:
+            tag:
+              type: string
+        Owner:
+          type: object
+          required: [ pets, favourite, contact ]
+          properties:
+            pets:
+              type: array
+              items:
+                allOf:
+                  - $ref: '#/components/schemas/Pet'
+                  - $ref: '#/components/schemas/Tagged'
+            favourite:
+              description: The pet the owner likes best.
+              allOf:
+                - $ref: '#/components/schemas/Pet'
+            contact:
+              oneOf:
+                - $ref: '#/components/schemas/Email'
+                - $ref: '#/components/schemas/Phone'
+        Email:
+          type: object
+          required: [ address ]
+          properties:
+            address:
+              type: string
+        Phone:
+          type: object
+          required: [ number ]
+          properties:
+            number:
+              type: string
+"""
+
+
+def _by_description(rules):
+    return {rule.description: rule for rule in rules}
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_all_of_members_are_merged_into_the_effective_schema(write_spec, lazy):
+    rules = _by_description(analyze_openapi_file(write_spec(SPEC), lazy=lazy))
+
+    inherited = rules["The Dog object MUST contain a 'id' property of type string."]
+    assert inherited.endpoint_entity == "Dog.id"
+    # Required rules point at the schema that lists the property.
+    assert (inherited.start_line, inherited.end_line) == (19, 25)
+    assert "The Dog object MUST contain a 'name' property of type string." in rules
+    assert "The Dog object MUST contain a 'bark' property of type boolean." in rules
+    assert "The 'Dog.name' field MUST be at most 20 characters long." in rules
+
+
+def test_items_merge_every_all_of_member(write_spec):
+    rules = analyze_openapi_file(write_spec(SPEC))
+
+    items_entities = {
+        rule.endpoint_entity for rule in rules if rule.endpoint_entity.startswith("Owner.pets[]")
+    }
+    assert items_entities == {
+        "Owner.pets[]",
+        "Owner.pets[].id",
+        "Owner.pets[].name",
+        "Owner.pets[].tag",
+    }
+
+
+def test_property_composition_expands_like_a_reference(write_spec):
+    rules = _by_description(analyze_openapi_file(write_spec(SPEC)))
+
+    favourite = rules["The Owner object MUST contain a 'favourite' property."]
+    name_length = rules["The 'Owner.favourite.name' field MUST be at most 20 characters long."]
+    assert name_length.depends_on_internal == {favourite.internal_id}
+
+
+def test_one_of_emits_an_alternatives_rule_and_branch_rules(write_spec):
+    rules = analyze_openapi_file(write_spec(SPEC))
+    by_entity = {}
+    for rule in rules:
+        by_entity.setdefault(rule.endpoint_entity, []).append(rule)
+
+    (contact,) = [
+        rule
+        for rule in by_entity["Owner.contact"]
+        if rule.description == "The 'Owner.contact' value MUST match exactly one of: Email, Phone."
+    ]
+    (email,) = by_entity["Owner.contact.oneOf[Email].address"]
+    (phone,) = by_entity["Owner.contact.oneOf[Phone].number"]
+    assert email.depends_on_internal == {contact.internal_id}
+    assert phone.depends_on_internal == {contact.internal_id}
+
+
+def test_any_of_is_described_as_at_least_one(write_spec):
+    spec = write_spec(SPEC)
+    spec.write_text(spec.read_text().replace("oneOf:", "anyOf:"))
+
+    rules = analyze_openapi_file(spec)
+
+    descriptions = {rule.description for rule in rules}
+    assert "The 'Owner.contact' value MUST match at least one of: Email, Phone." in descriptions
+    assert any(rule.endpoint_entity == "Owner.contact.anyOf[Email].address" for rule in rules)
+
+
+def test_schema_graph_contains_composition_edges(write_spec, tmp_path):
+    graph_file = tmp_path / "schemas.dot"
+
+    analyze_openapi_file(write_spec(SPEC), schema_graph_file=graph_file)
+
+    dot = graph_file.read_text()
+    assert '"openapi.yml#/components/schemas/Pet" -> "openapi.yml#/components/schemas/Entity"' in dot
+    assert '[label="oneOf[1]"]' in dot
+    assert '[label="pets[]"]' in dot
+
+
+def test_merged_schemas_are_computed_once_per_run(write_spec, monkeypatch):
+    walked = []
+    original = openapi_analyzer._iter_mapping
+
+    def counting_iter_mapping(node):
+        if isinstance(node.value, dict) and "name" in node.value:
+            walked.append(node.start_line)
+        return original(node)
+
+    monkeypatch.setattr(openapi_analyzer, "_iter_mapping", counting_iter_mapping)
+
+    rules = analyze_openapi_file(write_spec(SPEC))
+
+    # Pet is merged into Dog, the pets items and the favourite property, but
+    # its properties are only walked once.
+    assert len(walked) == 1
+    assert sum(rule.endpoint_entity.endswith(".name") for rule in rules) >= 3
+
+
+def test_all_of_cycles_do_not_recurse(write_spec):
+    spec = write_spec(
+        """
+        openapi: 3.0.0
+        paths:
+          /nodes:
+            post:
+              requestBody:
+                required: true
+                content:
+                  application/json:
+                    schema:
+                      $ref: '#/components/schemas/A'
+        components:
+          schemas:
+            A:
+              allOf:
+                - $ref: '#/components/schemas/B'
+              required: [ a ]
+              properties:
+                a:
+                  type: string
+            B:
+              allOf:
+                - $ref: '#/components/schemas/A'
+              required: [ b ]
+              properties:
+                b:
+                  type: string
+        """
+    )
+
+    rules = analyze_openapi_file(spec)
+
+    assert {rule.endpoint_entity for rule in rules} == {"A", "A.a", "A.b"}
@@ -0,0 +1,137 @@
+import logging
+
+import pytest
+
+from src.analyzers import openapi_documents
+from src.analyzers.endpoint_selection import EndpointSelector
+from src.analyzers.openapi_analyzer import analyze_openapi_file
+from src.config import Config
+from src.orchestrator import orchestrate
+
+
+_SPEC = """
+    openapi: 3.0.0
+    paths:
+      /orders:
+        post:
+          requestBody:
+            required: true
+            content:
+              application/json:
+                schema:
+                  $ref: '#/components/schemas/Order'
+        get:
+          requestBody:
+            required: true
+            content:
+              application/json:
+                schema:
+                  $ref: '#/components/schemas/Order'
+      /orders/{id}/refunds:
+        post:
+          requestBody:
+            required: true
+            content:
+              application/json:
+                schema:
+                  $ref: '#/components/schemas/Refund'
+    components:
+      schemas:
+        Order:
+          type: object
+          required: [ total ]
+          properties:
+            total:
+              type: number
+        Refund:
+          type: object
+          required: [ reason ]
+          properties:
+            reason:
+              type: string
+"""
+
+
+def _endpoints(rules):
+    return [(rule.endpoint, rule.endpoint_entity) for rule in rules]
+
+
+def test_selection_by_glob_and_method(write_spec):
+    spec = write_spec(_SPEC)
+
+    selector = EndpointSelector.build(["/orders"], ["post"])
+    rules = analyze_openapi_file(spec, endpoints=selector)
+
+    full_run = analyze_openapi_file(spec)
+    assert _endpoints(rules) == [
+        entry for entry in _endpoints(full_run) if entry[0] == "/orders [POST]"
+    ]
+    assert rules
+
+
+def test_selection_by_regex(write_spec):
+    spec = write_spec(_SPEC)
+
+    selector = EndpointSelector.build([r"re:/orders/\{id\}/.*"])
+    rules = analyze_openapi_file(spec, endpoints=selector)
+
+    assert {endpoint for endpoint, _ in _endpoints(rules)} == {"/orders/{id}/refunds [POST]"}
+
+
+def test_unselected_endpoints_and_their_schemas_are_not_parsed(write_spec, monkeypatch):
+    spec = write_spec(_SPEC)
+    parsed_first_lines = []
+    original = openapi_documents.parse_yaml_lines
+
+    def recording_parse(lines, *args, **kwargs):
+        parsed_first_lines.append(lines[0].strip())
+        return original(lines, *args, **kwargs)
+
+    monkeypatch.setattr(openapi_documents, "parse_yaml_lines", recording_parse)
+
+    analyze_openapi_file(spec, endpoints=EndpointSelector.build(["/orders"]))
+
+    assert parsed_first_lines == ["/orders:", "Order:"]
+
+
+def test_empty_selection_warns(write_spec, caplog):
+    spec = write_spec(_SPEC)
+    logger = logging.getLogger("selection_test")
+
+    with caplog.at_level(logging.WARNING, logger="selection_test"):
+        rules = analyze_openapi_file(
+            spec, endpoints=EndpointSelector.build(["/customers/*"]), logger=logger
+        )
+
+    assert rules == []
+    assert [record.message for record in caplog.records] == [
+        "No OpenAPI endpoints matched the selection"
+    ]
+
+
+def test_selector_rejects_invalid_filters():
+    assert EndpointSelector.build([], []) is None
+    with pytest.raises(ValueError):
+        EndpointSelector.build(methods=["options"])
+    with pytest.raises(ValueError):
+        EndpointSelector.build(["re:(unclosed"])
+
+
+def test_orchestrate_writes_only_selected_endpoints(write_spec, tmp_path):
+    spec = write_spec(_SPEC)
+    output = tmp_path / "out.csv"
+    config = Config(
+        default_rule_id="RULE-001",
+        openapi_endpoint_entities=[],
+        llm_method="rule-based",
+        llm_model="",
+        llm_url="",
+        llm_api_key="",
+        log_file="",
+        log_level="INFO",
+    )
+
+    rules = orchestrate(spec, output, config, paths=["/orders*"], methods=["get"])
+
+    assert {rule.endpoint for rule in rules} == {"/orders [GET]"}
+    assert "/orders/{id}/refunds" not in output.read_text()
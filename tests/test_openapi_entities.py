@@ -0,0 +1,110 @@
+import logging
+
+import pytest
+
+from src.analyzers import openapi_documents
+from src.analyzers.openapi_analyzer import analyze_openapi_file
+from src.config import Config
+from src.orchestrator import orchestrate
+
+
+SPEC = """
+    openapi: 3.0.0
+    paths:
+      /orders:
+        post:
+          parameters:
+            - name: X-Tenant
+              in: header
+              required: true
+          requestBody:
+            required: true
+            content:
+              application/json:
+                schema:
+                  $ref: '#/components/schemas/OrderRequest'
+          responses:
+            '201':
+              description: Created
+              content:
+                application/json:
+                  schema:
+                    $ref: '#/components/schemas/OrderResponse'
+    components:
+      schemas:
+        OrderRequest:
+          type: object
+          required: [ item ]
+          properties:
+            item:
+              type: string
+        OrderResponse:
+          type: object
+          required: [ id ]
+          properties:
+            id:
+              type: string
+"""
+
+
+@pytest.mark.parametrize(
+    "entities, expected",
+    [
+        (None, ["header.X-Tenant", "OrderRequest", "OrderRequest.item", "OrderResponse.id"]),
+        ([], ["header.X-Tenant", "OrderRequest", "OrderRequest.item", "OrderResponse.id"]),
+        (["requestBody"], ["OrderRequest", "OrderRequest.item"]),
+        (["parameters", "responses"], ["header.X-Tenant", "OrderResponse.id"]),
+    ],
+)
+def test_only_requested_entities_are_analyzed(write_spec, entities, expected):
+    rules = analyze_openapi_file(write_spec(SPEC), entities=entities)
+
+    assert [rule.endpoint_entity for rule in rules] == expected
+
+
+def test_skipped_entities_are_not_parsed(write_spec, monkeypatch):
+    parsed = []
+    original = openapi_documents.parse_yaml_lines
+
+    def recording_parse(lines, *args, **kwargs):
+        parsed.append(lines[0].strip())
+        return original(lines, *args, **kwargs)
+
+    monkeypatch.setattr(openapi_documents, "parse_yaml_lines", recording_parse)
+
+    analyze_openapi_file(write_spec(SPEC), entities=["requestBody"])
+
+    assert "OrderRequest:" in parsed
+    assert "OrderResponse:" not in parsed
+
+
+def test_unknown_entities_are_reported_and_ignored(write_spec, caplog):
+    logger = logging.getLogger("entities_test")
+
+    with caplog.at_level(logging.WARNING, logger="entities_test"):
+        rules = analyze_openapi_file(
+            write_spec(SPEC), entities=["RequestBody", "headers"], logger=logger
+        )
+
+    assert [rule.endpoint_entity for rule in rules] == ["OrderRequest", "OrderRequest.item"]
+    assert [record.message for record in caplog.records] == [
+        "Ignoring unknown OpenAPI endpoint entities: headers"
+    ]
+
+
+def test_orchestrate_passes_configured_entities(write_spec, tmp_path):
+    output = tmp_path / "out.csv"
+    config = Config(
+        default_rule_id="RULE-001",
+        openapi_endpoint_entities=["responses"],
+        llm_method="rule-based",
+        llm_model="",
+        llm_url="",
+        llm_api_key="",
+        log_file="",
+        log_level="INFO",
+    )
+
+    rules = orchestrate(write_spec(SPEC), output, config)
+
+    assert [rule.endpoint_entity for rule in rules] == ["OrderResponse.id"]
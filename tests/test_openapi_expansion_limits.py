@@ -0,0 +1,205 @@
+import logging
+from textwrap import dedent, indent
+
+from src.analyzers import openapi_analyzer
+from src.analyzers.openapi_analyzer import analyze_openapi_file
+from src.logging_utils import attach_summary_handler
+
+
+def _spec(schemas_yaml):
+    return dedent(
+        """
+        openapi: 3.0.0
+        paths:
+          /things:
+            post:
+              requestBody:
+                required: true
+                content:
+                  application/json:
+                    schema:
+                      $ref: '#/components/schemas/Root'
+        components:
+          schemas:
+        """
+    ) + indent(dedent(schemas_yaml), "    ")
+
+
+def _chain_schemas(length):
+    parts = []
+    for level in range(length):
+        name = "Root" if level == 0 else f"Level{level}"
+        parts.append(
+            f"""
+            {name}:
+              type: object
+              required: [ next ]
+              properties:
+                next:
+                  $ref: '#/components/schemas/Level{level + 1}'"""
+        )
+    parts.append(
+        f"""
+            Level{length}:
+              type: object
+              required: [ leaf ]
+              properties:
+                leaf:
+                  type: string
+        """
+    )
+    return "".join(parts)
+
+
+def test_self_referencing_schema_stops_at_back_reference(write_spec):
+    schemas = """
+        Root:
+          type: object
+          required: [ category ]
+          properties:
+            category:
+              $ref: '#/components/schemas/Category'
+        Category:
+          type: object
+          required: [ name, children ]
+          properties:
+            name:
+              type: string
+            children:
+              type: array
+              items:
+                $ref: '#/components/schemas/Category'
+    """
+    spec_path = write_spec(_spec(schemas))
+
+    rules = analyze_openapi_file(spec_path)
+
+    assert [rule.endpoint_entity for rule in rules] == [
+        "Root",
+        "Root.category",
+        "Root.category.name",
+        "Root.category.children",
+        "Root.category.children[]",
+    ]
+
+
+def test_mutually_recursive_schemas_terminate(write_spec):
+    schemas = """
+        Root:
+          type: object
+          required: [ a ]
+          properties:
+            a:
+              $ref: '#/components/schemas/A'
+        A:
+          type: object
+          required: [ b ]
+          properties:
+            b:
+              $ref: '#/components/schemas/B'
+        B:
+          type: object
+          required: [ a ]
+          properties:
+            a:
+              $ref: '#/components/schemas/A'
+    """
+    spec_path = write_spec(_spec(schemas))
+
+    rules = analyze_openapi_file(spec_path)
+
+    assert [rule.endpoint_entity for rule in rules] == ["Root", "Root.a", "Root.a.b", "Root.a.b.a"]
+
+
+def test_depth_limit_truncates_and_warns(write_spec, caplog):
+    spec_path = write_spec(_spec(_chain_schemas(10)))
+    logger = logging.getLogger("depth_limit_test")
+
+    with caplog.at_level(logging.WARNING, logger="depth_limit_test"):
+        rules = analyze_openapi_file(spec_path, max_schema_depth=3, logger=logger)
+
+    assert [rule.endpoint_entity for rule in rules] == [
+        "Root",
+        "Root.next",
+        "Root.next.next",
+        "Root.next.next.next",
+    ]
+    assert any("maximum depth of 3" in record.message for record in caplog.records)
+
+    unlimited = analyze_openapi_file(spec_path, max_schema_depth=0, logger=logger)
+    assert unlimited[-1].endpoint_entity == "Root" + ".next" * 10 + ".leaf"
+
+
+def test_rule_limit_per_endpoint_is_counted_as_warning(write_spec):
+    properties = "".join(
+        f"""
+            field{index}:
+              type: string"""
+        for index in range(50)
+    )
+    required = ", ".join(f"field{index}" for index in range(50))
+    schemas = f"""
+        Root:
+          type: object
+          required: [ {required} ]
+          properties:{properties}
+    """
+    spec_path = write_spec(_spec(schemas))
+    logger = logging.getLogger("rule_limit_test")
+    logger.propagate = False
+    summary = attach_summary_handler(logger)
+    try:
+        rules = analyze_openapi_file(spec_path, max_rules_per_endpoint=10, logger=logger)
+    finally:
+        logger.removeHandler(summary)
+
+    assert len(rules) == 10
+    assert rules[-1].endpoint_entity == "Root.field8"
+    assert summary.warning_count == 1
+
+
+def test_cyclic_expansion_work_is_bounded_by_the_rule_limit(write_spec, monkeypatch):
+    names = ["Root"] + [f"Node{index}" for index in range(6)]
+    schemas = "".join(
+        f"""
+            {name}:
+              type: object
+              required: [ {", ".join(f"to{other}" for other in names)} ]
+              properties:
+                label:
+                  type: string
+                  maxLength: 8"""
+        + "".join(
+            f"""
+                to{other}:
+                  $ref: '#/components/schemas/{other}'"""
+            for other in names
+        )
+        for name in names
+    )
+    spec_path = write_spec(_spec(schemas))
+    built = []
+    original = openapi_analyzer._build_schema_templates
+
+    def counting_build(target, *args):
+        built.append(target.name)
+        return original(target, *args)
+
+    constraints = []
+    original_constraints = openapi_analyzer._constraint_templates
+
+    def counting_constraints(prop_name, prop_node, source_file):
+        constraints.append(prop_name)
+        return original_constraints(prop_name, prop_node, source_file)
+
+    monkeypatch.setattr(openapi_analyzer, "_build_schema_templates", counting_build)
+    monkeypatch.setattr(openapi_analyzer, "_constraint_templates", counting_constraints)
+
+    rules = analyze_openapi_file(spec_path, max_rules_per_endpoint=500)
+
+    assert len(rules) == 500
+    # Every schema built contributes a rule to the endpoint or is cut off by
+    # the limit, and each property is inspected once however often its
+    # schema is rebuilt along different chains.
+    assert len(built) < 500
+    assert len(constraints) <= len(names) * (len(names) + 1)
@@ -0,0 +1,142 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from src.analyzers.json_parser import JsonParseError, parse_json
+from src.analyzers.openapi_analyzer import OpenAPIAnalyzerError, analyze_openapi_file
+from src.analyzers.yaml_parser import YamlNode, parse_yaml
+from src.models import SourceType
+from src.orchestrator import detect_source_type
+
+
+SAMPLE = Path("docs/openapi-spec - sample.yml")
+
+
+def _plain(node):
+    value = node.value if isinstance(node, YamlNode) else node
+    if isinstance(value, dict):
+        return {key: _plain(child) for key, child in value.items()}
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    return value
+
+
+def test_json_spec_yields_the_same_rules_as_yaml(tmp_path):
+    spec = tmp_path / "openapi.json"
+    spec.write_text(json.dumps(_plain(parse_yaml(SAMPLE.read_text())), indent=2))
+
+    from_yaml = analyze_openapi_file(SAMPLE)
+    from_json = analyze_openapi_file(spec)
+
+    assert [(rule.description, rule.endpoint, rule.endpoint_entity) for rule in from_json] == [
+        (rule.description, rule.endpoint, rule.endpoint_entity) for rule in from_yaml
+    ]
+    assert {rule.source_file for rule in from_json} == {"openapi.json"}
+
+
+def test_json_line_numbers():
+    text = "\n".join(
+        [
+            "{",
+            '  "paths": {',
+            '    "/orders": {',
+            '      "post": {}',
+            "    }",
+            "  },",
+            '  "tags": ["a", 1, true, null],',
+            '  "examples": {"x": {',
+            '    "y": [1]}}',
+            "}",
+        ]
+    )
+
+    root = parse_json(text)
+    paths = root.value["paths"]
+    orders = paths.value["/orders"]
+    tags = root.value["tags"]
+    examples = root.value["examples"]
+
+    assert (root.start_line, root.end_line) == (1, 10)
+    assert (paths.start_line, paths.end_line) == (2, 6)
+    assert (orders.start_line, orders.end_line) == (3, 5)
+    assert (orders.value["post"].start_line, orders.value["post"].end_line) == (4, 4)
+    assert [item.value for item in tags.value] == ["a", "1", True, None]
+    assert (examples.start_line, examples.end_line) == (8, 9)
+    assert examples.value == {"x": {"y": ["1"]}}
+
+
+def test_json_repeated_keys_keep_their_lines():
+    root = parse_json('{\n  "a": 1,\n  "a": {\n    "b": "x\\"{"\n  },\n  "c": 2\n}')
+
+    assert (root.value["a"].start_line, root.value["a"].end_line) == (3, 5)
+    assert root.value["a"].value["b"].value == 'x"{'
+    assert (root.value["c"].start_line, root.value["c"].end_line) == (6, 6)
+
+
+def test_json_properties_named_example_are_schemas(tmp_path):
+    spec = tmp_path / "openapi.json"
+    spec.write_text(
+        json.dumps(
+            {
+                "openapi": "3.0.0",
+                "paths": {
+                    "/notes": {
+                        "post": {
+                            "requestBody": {
+                                "required": True,
+                                "content": {
+                                    "application/json": {
+                                        "schema": {"$ref": "#/components/schemas/Note"}
+                                    }
+                                },
+                            }
+                        }
+                    }
+                },
+                "components": {
+                    "schemas": {
+                        "Note": {
+                            "type": "object",
+                            "properties": {"example": {"type": "string", "maxLength": 5}},
+                            "example": {"example": "hello"},
+                        }
+                    }
+                },
+            },
+            indent=2,
+        )
+    )
+
+    rules = analyze_openapi_file(spec)
+
+    assert [rule.description for rule in rules if rule.endpoint_entity.endswith("example")] == [
+        "The 'Note.example' field MUST be at most 5 characters long."
+    ]
+
+
+@pytest.mark.parametrize(
+    "text",
+    ['{"a": }', '{"a": 1,}', "[1 2]", '{"a": 1} {}', "", '{"a": tru}', '{"a": [1}', '{"examples": [1,}', '{"a": NaN}'],
+)
+def test_invalid_json_is_rejected(text):
+    with pytest.raises(JsonParseError):
+        parse_json(text)
+
+
+def test_invalid_json_spec_reports_analyzer_error(tmp_path):
+    spec = tmp_path / "openapi.json"
+    spec.write_text('{"openapi": "3.0.0", "paths": {')
+
+    with pytest.raises(OpenAPIAnalyzerError, match="Unterminated JSON"):
+        analyze_openapi_file(spec)
+
+
+def test_json_specs_are_detected(tmp_path):
+    named = tmp_path / "openapi.json"
+    named.write_text("{}")
+    unnamed = tmp_path / "spec.txt"
+    unnamed.write_text('{\n  "openapi": "3.0.0"\n}')
+
+    assert detect_source_type(named) is SourceType.OPENAPI
+    assert detect_source_type(unnamed) is SourceType.OPENAPI
@@ -0,0 +1,116 @@
+from pathlib import Path
+
+import pytest
+
+from src.analyzers import openapi_documents
+from src.analyzers.openapi_analyzer import OpenAPIAnalyzerError, analyze_openapi_file
+
+
+SAMPLE = Path("docs/openapi-spec - sample.yml")
+
+
+@pytest.mark.parametrize("yaml_parser", ["builtin", "ruamel"])
+def test_lazy_parsing_matches_eager_parsing_on_sample(yaml_parser):
+    if yaml_parser == "ruamel":
+        pytest.importorskip("ruamel.yaml")
+
+    eager = analyze_openapi_file(SAMPLE, yaml_parser=yaml_parser)
+    lazy = analyze_openapi_file(SAMPLE, yaml_parser=yaml_parser, lazy=True)
+
+    assert lazy == eager
+
+
+def test_lazy_parsing_skips_unreferenced_subtrees(write_spec, monkeypatch):
+    spec = write_spec(
+        """
+        openapi: 3.0.0
+        info:
+          title: Orders
+          description: long text
+        paths:
+          /orders:
+            post:
+              requestBody:
+                required: true
+                content:
+                  application/json:
+                    schema:
+                      $ref: '#/components/schemas/Order'
+                    examples:
+                      big:
+                        value: {}
+        components:
+          schemas:
+            Order:
+              type: object
+              required: [ total ]
+              properties:
+                total:
+                  $ref: '#/components/schemas/Money'
+            Unused:
+              type: object
+              required: [ never ]
+            Money:
+              type: object
+              required: [ currency ]
+        """
+    )
+    parsed_first_lines = []
+    original = openapi_documents.parse_yaml_lines
+
+    def recording_parse(lines, parser, *, line_offset=0, logger=None):
+        parsed_first_lines.append(lines[0].strip())
+        return original(lines, parser, line_offset=line_offset, logger=logger)
+
+    monkeypatch.setattr(openapi_documents, "parse_yaml_lines", recording_parse)
+
+    lazy = analyze_openapi_file(spec, lazy=True)
+
+    assert parsed_first_lines == ["/orders:", "Order:", "Money:"]
+    assert lazy == analyze_openapi_file(spec)
+
+
+def test_lazy_parsing_reports_missing_paths(tmp_path):
+    spec = tmp_path / "openapi.yml"
+    spec.write_text("openapi: 3.0.0\ninfo:\n  title: Orders\n")
+
+    with pytest.raises(OpenAPIAnalyzerError, match="paths mapping"):
+        analyze_openapi_file(spec, lazy=True)
+
+
+def test_lazy_parsing_without_components(write_spec, caplog):
+    spec = write_spec(
+        """
+        openapi: 3.0.0
+        paths:
+          /orders:
+            post:
+              requestBody:
+                required: true
+                content:
+                  application/json:
+                    schema:
+                      $ref: '#/definitions/Order'
+          /refunds:
+            post:
+              requestBody:
+                required: true
+                content:
+                  application/json:
+                    schema:
+                      $ref: '#/components/schemas/Refund'
+        definitions:
+          Order:
+            type: object
+            required: [ total ]
+            properties:
+              total:
+                type: number
+        """
+    )
+
+    lazy = analyze_openapi_file(spec, lazy=True)
+
+    assert [rule.endpoint_entity for rule in lazy] == ["Order", "Refund"]
+    assert lazy == analyze_openapi_file(spec)
+    assert "Unresolved schema reference #/components/schemas/Refund" in caplog.text
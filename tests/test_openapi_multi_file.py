@@ -0,0 +1,112 @@
+import logging
+from textwrap import dedent
+
+import pytest
+
+from src.analyzers import openapi_documents
+from src.analyzers.openapi_analyzer import analyze_openapi_file
+
+
+def _write(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(dedent(content).lstrip())
+    return path
+
+
+def _build_split_spec(root):
+    spec = _write(
+        root / "openapi.yml",
+        """
+        openapi: 3.0.0
+        paths:
+          /orders:
+            post:
+              requestBody:
+                required: true
+                content:
+                  application/json:
+                    schema:
+                      $ref: './common/models.yaml#/components/schemas/Order'
+          /refunds:
+            $ref: './paths/refunds.yaml'
+          /legacy:
+            post:
+              requestBody:
+                required: true
+                content:
+                  application/json:
+                    schema:
+                      $ref: './missing.yaml#/components/schemas/Gone'
+        """,
+    )
+    _write(
+        root / "common" / "models.yaml",
+        """
+        components:
+          schemas:
+            Order:
+              type: object
+              required: [ total ]
+              properties:
+                total:
+                  $ref: '#/components/schemas/Money'
+            Money:
+              type: object
+              required: [ currency ]
+              properties:
+                currency:
+                  type: string
+        """,
+    )
+    _write(
+        root / "paths" / "refunds.yaml",
+        """
+        post:
+          requestBody:
+            required: true
+            content:
+              application/json:
+                schema:
+                  $ref: '../common/models.yaml#/components/schemas/Money'
+        """,
+    )
+    return spec
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_external_refs_resolve_relative_to_referencing_file(tmp_path, caplog, lazy):
+    spec = _build_split_spec(tmp_path)
+
+    with caplog.at_level(logging.WARNING, logger="multi_file_test"):
+        rules = analyze_openapi_file(
+            spec, lazy=lazy, logger=logging.getLogger("multi_file_test")
+        )
+
+    summary = [(rule.endpoint, rule.endpoint_entity, rule.source_file) for rule in rules]
+    assert summary == [
+        ("/orders [POST]", "Order", "openapi.yml"),
+        ("/orders [POST]", "Order.total", "common/models.yaml"),
+        ("/orders [POST]", "Order.total.currency", "common/models.yaml"),
+        ("/refunds [POST]", "Money", "paths/refunds.yaml"),
+        ("/refunds [POST]", "Money.currency", "common/models.yaml"),
+        ("/legacy [POST]", "Gone", "openapi.yml"),
+    ]
+    assert [record.message for record in caplog.records] == [
+        "Referenced OpenAPI document not found: ./missing.yaml"
+    ]
+
+
+def test_each_referenced_document_is_parsed_once(tmp_path, monkeypatch):
+    spec = _build_split_spec(tmp_path)
+    parsed = []
+    original = openapi_documents.parse_yaml_lines
+
+    def counting_parse(lines, *args, **kwargs):
+        parsed.append(lines[0])
+        return original(lines, *args, **kwargs)
+
+    monkeypatch.setattr(openapi_documents, "parse_yaml_lines", counting_parse)
+
+    analyze_openapi_file(spec)
+
+    assert sorted(parsed) == ["components:", "openapi: 3.0.0", "post:"]
@@ -0,0 +1,130 @@
+import logging
+import multiprocessing
+from textwrap import dedent
+
+import pytest
+
+from src.analyzers import openapi_analyzer
+from src.analyzers.openapi_analyzer import analyze_openapi_file
+from src.config import Config
+from src.orchestrator import orchestrate
+
+
+def _spec(endpoints=12):
+    lines = ["openapi: 3.0.0", "paths:"]
+    for index in range(endpoints):
+        schema = "'./missing.yaml#/components/schemas/Gone'" if index == 5 else (
+            f"'#/components/schemas/{'Order' if index % 2 else 'Customer'}'"
+        )
+        lines += [
+            f"  /resources/{index}:",
+            "    post:",
+            "      requestBody:",
+            "        required: true",
+            "        content:",
+            "          application/json:",
+            "            schema:",
+            f"              $ref: {schema}",
+        ]
+    lines.append(
+        dedent(
+            """
+            components:
+              schemas:
+                Order:
+                  type: object
+                  required: [ id, customer, lines ]
+                  properties:
+                    id:
+                      type: string
+                    customer:
+                      $ref: '#/components/schemas/Customer'
+                    lines:
+                      type: array
+                      items:
+                        $ref: '#/components/schemas/Customer'
+                Customer:
+                  type: object
+                  required: [ name ]
+                  properties:
+                    name:
+                      type: string
+                    status:
+                      type: string
+                      enum: [ active, closed ]
+            """
+        )
+    )
+    return "\n".join(lines)
+
+
+def _run(spec, caplog, **kwargs):
+    logger = logging.getLogger("parallel_test")
+    caplog.clear()
+    with caplog.at_level(logging.WARNING, logger="parallel_test"):
+        rules = analyze_openapi_file(spec, max_rules_per_endpoint=4, logger=logger, **kwargs)
+    return rules, [record.message for record in caplog.records]
+
+
+def test_parallel_run_matches_sequential_run(write_spec, caplog):
+    spec = write_spec(_spec())
+
+    sequential = _run(spec, caplog)
+    parallel = _run(spec, caplog, jobs=3)
+
+    assert parallel == sequential
+    assert "Referenced OpenAPI document not found: ./missing.yaml" in sequential[1]
+
+
+def test_parallel_run_replays_repeated_warnings(write_spec, caplog, monkeypatch):
+    spec = write_spec(_spec())
+
+    def warn_on_every_endpoint(logger, endpoint, context, budget):
+        logger.warning("Endpoint was truncated")
+
+    monkeypatch.setattr(openapi_analyzer, "_warn_on_truncation", warn_on_every_endpoint)
+
+    sequential = _run(spec, caplog)
+    parallel = _run(spec, caplog, jobs=3)
+
+    assert parallel == sequential
+    assert sequential[1].count("Endpoint was truncated") == 12
+    assert sequential[1].count("Referenced OpenAPI document not found: ./missing.yaml") == 1
+
+
+def test_parallel_run_with_spawned_workers(write_spec, caplog, monkeypatch):
+    spec = write_spec(_spec(endpoints=4))
+    monkeypatch.setattr(
+        openapi_analyzer, "_pool_context", lambda: multiprocessing.get_context("spawn")
+    )
+
+    assert _run(spec, caplog, jobs=2, lazy=True) == _run(spec, caplog)
+
+
+def test_parallel_csv_is_byte_identical(write_spec, tmp_path):
+    spec = write_spec(_spec())
+    outputs = []
+    for jobs in (1, 4):
+        output = tmp_path / f"out-{jobs}.csv"
+        config = Config(
+            default_rule_id="RULE-001",
+            openapi_endpoint_entities=[],
+            llm_method="rule-based",
+            llm_model="",
+            llm_url="",
+            llm_api_key="",
+            log_file="",
+            log_level="INFO",
+            openapi_jobs=jobs,
+        )
+        orchestrate(spec, output, config)
+        outputs.append(output.read_bytes())
+
+    assert outputs[0] == outputs[1]
+
+
+@pytest.mark.parametrize("jobs", [0, 2])
+def test_parallel_run_on_small_spec_falls_back_or_matches(write_spec, caplog, jobs):
+    spec = write_spec(_spec(endpoints=1))
+
+    assert _run(spec, caplog, jobs=jobs) == _run(spec, caplog)
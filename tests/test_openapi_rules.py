@@ -1,6 +1,7 @@
 from pathlib import Path
 from textwrap import dedent
 
+from src.analyzers import openapi_analyzer
 from src.analyzers.openapi_analyzer import analyze_openapi_file
 from src.rule_id_manager import assign_rule_ids
 from src.dependency_resolver import resolve_dependencies
@@ -68,3 +69,70 @@ def test_openapi_rule_dependencies_and_entities(tmp_path):
     assert by_entity["Root.child.tags[].code"].depends_on_ids == {"RULE-103"}
     assert by_entity["Root.child.tags[].kind"].depends_on_ids == {"RULE-103"}
 
+
+_CONSTRAINT_SPEC = """
+    openapi: 3.0.0
+    paths:
+      /pets:
+        post:
+          requestBody:
+            content:
+              application/json:
+                schema:
+                  $ref: '#/components/schemas/Pet'
+            required: true
+    components:
+      schemas:
+        Pet:
+          type: object
+          required: [ name ]
+          properties:
+            name:
+              type: string
+              minLength: 1
+              maxLength: 20
+              pattern: '^[a-z]+$'
+            age:
+              type: integer
+              minimum: 0
+              maximum: 30
+              exclusiveMaximum: true
+            born:
+              type: string
+              format: date
+              nullable: true
+            kind:
+              type: string
+              enum: [ cat, dog ]
+    """
+
+
+def test_openapi_property_constraints_become_rules(write_spec):
+    rules = analyze_openapi_file(write_spec(_CONSTRAINT_SPEC))
+
+    descriptions = [(rule.endpoint_entity, rule.description) for rule in rules]
+
+    assert descriptions[2:] == [
+        ("Pet.name", "The 'Pet.name' field MUST be between 1 and 20 characters long."),
+        ("Pet.name", "The 'Pet.name' field MUST match the pattern '^[a-z]+$'."),
+        ("Pet.age", "The 'Pet.age' field MUST be greater than or equal to 0 and less than 30."),
+        ("Pet.born", "The 'Pet.born' field MUST be a valid date value."),
+        ("Pet.born", "The 'Pet.born' field MAY be null."),
+        ("Pet.kind", "The 'Pet.kind' field MUST be one of: cat, dog. Any other value is invalid."),
+    ]
+
+
+def test_openapi_schema_properties_are_walked_once(write_spec, monkeypatch):
+    walked = []
+    original = openapi_analyzer._iter_mapping
+
+    def recording_iter_mapping(node):
+        if isinstance(node.value, dict) and "name" in node.value:
+            walked.append(node)
+        return original(node)
+
+    monkeypatch.setattr(openapi_analyzer, "_iter_mapping", recording_iter_mapping)
+
+    analyze_openapi_file(write_spec(_CONSTRAINT_SPEC))
+
+    assert len(walked) == 1
@@ -0,0 +1,86 @@
+from textwrap import dedent
+
+from src.analyzers import openapi_analyzer
+from src.analyzers.openapi_analyzer import analyze_openapi_file
+
+
+SPEC = dedent(
+    """
+    openapi: 3.0.0
+    paths:
+      /orders:
+        post:
+          requestBody:
+            required: true
+            content:
+              application/json:
+                schema:
+                  $ref: '#/components/schemas/Order'
+      /refunds:
+        post:
+          requestBody:
+            required: true
+            content:
+              application/json:
+                schema:
+                  $ref: '#/components/schemas/Refund'
+          responses:
+            '200':
+              content:
+                application/json:
+                  schema:
+                    $ref: '#/components/schemas/Order'
+    components:
+      schemas:
+        Order:
+          type: object
+          required: [ total ]
+          properties:
+            total:
+              $ref: '#/components/schemas/Money'
+        Refund:
+          type: object
+          required: [ amount ]
+          properties:
+            amount:
+              $ref: '#/components/schemas/Money'
+        Money:
+          type: object
+          required: [ currency ]
+          properties:
+            currency:
+              type: string
+              enum: [ EUR, USD ]
+    """
+)
+
+
+def test_shared_schemas_are_expanded_once_and_rebased(tmp_path, monkeypatch):
+    spec_path = tmp_path / "spec.yml"
+    spec_path.write_text(SPEC)
+    built = []
+    original = openapi_analyzer._build_schema_templates
+
+    def counting_build(target, *args):
+        built.append(target.name)
+        return original(target, *args)
+
+    monkeypatch.setattr(openapi_analyzer, "_build_schema_templates", counting_build)
+
+    rules = analyze_openapi_file(spec_path)
+
+    assert sorted(built) == ["Money", "Order", "Refund"]
+    by_key = {(rule.endpoint, rule.endpoint_entity): rule for rule in rules}
+    refund_body = by_key[("/refunds [POST]", "Refund")]
+    refund_amount = by_key[("/refunds [POST]", "Refund.amount")]
+    refund_currency = by_key[("/refunds [POST]", "Refund.amount.currency")]
+    order_total = by_key[("/refunds [POST]", "Order.total")]
+    order_currency = by_key[("/refunds [POST]", "Order.total.currency")]
+
+    assert refund_amount.depends_on_internal == {refund_body.internal_id}
+    assert refund_currency.depends_on_internal == {refund_amount.internal_id}
+    assert order_total.depends_on_internal == {refund_body.internal_id}
+    assert order_currency.depends_on_internal == {order_total.internal_id}
+    assert "'Refund.amount.currency' field MUST be one of: EUR, USD" in refund_currency.description
+    assert by_key[("/orders [POST]", "Order.total.currency")].description == order_currency.description
+    assert [rule.internal_id for rule in rules] == list(range(1, len(rules) + 1))
@@ -0,0 +1,152 @@
+import logging
+
+from src.analyzers import openapi_analyzer
+from src.analyzers.openapi_analyzer import analyze_openapi_file
+from src.analyzers.schema_graph import SchemaGraph, SchemaReference
+
+
+SPEC = """
+    openapi: 3.0.0
+    paths:
+      /orders:
+        post:
+          requestBody:
+            required: true
+            content:
+              application/json:
+                schema:
+                  $ref: '#/components/schemas/Order'
+    components:
+      schemas:
+        Order:
+          type: object
+          required: [ customer, lines, note ]
+          properties:
+            customer:
+              $ref: '#/components/schemas/Customer'
+            lines:
+              type: array
+              items:
+                $ref: '#/components/schemas/Line'
+            note:
+              $ref: '#/components/schemas/Missing'
+        Customer:
+          allOf:
+            - $ref: '#/components/schemas/Party'
+          type: object
+          required: [ name ]
+          properties:
+            name:
+              type: string
+        Party:
+          type: object
+        Line:
+          type: object
+          required: [ parent ]
+          properties:
+            parent:
+              $ref: '#/components/schemas/Line'
+        Unused:
+          type: object
+          required: [ id ]
+          properties:
+            id:
+              type: string
+"""
+
+
+def _key(spec, name):
+    return (spec.resolve(), f"/components/schemas/{name}")
+
+
+def test_graph_covers_reachable_schemas_and_reports_unresolved_refs(write_spec, caplog, monkeypatch):
+    spec = write_spec(SPEC)
+    graphs = []
+    original = openapi_analyzer._build_schema_graph
+
+    def recording_build(context, include):
+        graph, targets = original(context, include)
+        graphs.append(graph)
+        return graph, targets
+
+    monkeypatch.setattr(openapi_analyzer, "_build_schema_graph", recording_build)
+    with caplog.at_level(logging.WARNING, logger="schema_graph_test"):
+        analyze_openapi_file(spec, logger=logging.getLogger("schema_graph_test"))
+
+    (graph,) = graphs
+    assert sorted(graph.names.values()) == ["Customer", "Line", "Order", "Party"]
+    assert graph.roots == [_key(spec, "Order")]
+    assert graph.edges[_key(spec, "Order")] == [
+        SchemaReference("property", "customer", _key(spec, "Customer")),
+        SchemaReference("items", "lines", _key(spec, "Line")),
+    ]
+    assert graph.edges[_key(spec, "Customer")] == [
+        SchemaReference("allOf", "0", _key(spec, "Party"))
+    ]
+    assert [record.message for record in caplog.records] == [
+        "Unresolved schema reference #/components/schemas/Missing in openapi.yml at line 23"
+    ]
+
+
+def test_topological_order_and_cycle_detection():
+    graph = SchemaGraph()
+    for name in ("a", "b", "c", "d"):
+        graph.add_schema(("f", name), name, "f")
+    graph.add_edge(("f", "a"), SchemaReference("property", "b", ("f", "b")))
+    graph.add_edge(("f", "b"), SchemaReference("property", "c", ("f", "c")))
+    graph.add_edge(("f", "c"), SchemaReference("property", "b", ("f", "b")))
+    graph.add_edge(("f", "a"), SchemaReference("property", "d", ("f", "d")))
+
+    order = graph.topological_order()
+    heights, cyclic = graph.heights()
+
+    assert order.index(("f", "d")) < order.index(("f", "a"))
+    assert order.index(("f", "b")) < order.index(("f", "a"))
+    assert cyclic == {("f", "a"), ("f", "b"), ("f", "c")}
+    assert heights == {("f", "d"): 1}
+
+
+def test_schema_graph_export_lists_rule_counts(write_spec, tmp_path):
+    spec = write_spec(SPEC)
+    output = tmp_path / "schemas.dot"
+
+    analyze_openapi_file(spec, schema_graph_file=output)
+
+    dot = output.read_text()
+    assert dot.startswith("digraph schemas {")
+    assert '"openapi.yml#/components/schemas/Customer" [label="Customer\\n1 rules"];' in dot
+    assert (
+        '"openapi.yml#/components/schemas/Order" -> "openapi.yml#/components/schemas/Line"'
+        ' [label="lines[]"];'
+    ) in dot
+    assert '"#/components/schemas/Missing" [style=dashed];' in dot
+
+
+def test_long_reference_chains_expand_without_recursion(write_spec):
+    length = 400
+    lines = [
+        "openapi: 3.0.0",
+        "paths:",
+        "  /chain:",
+        "    post:",
+        "      requestBody:",
+        "        required: true",
+        "        content:",
+        "          application/json:",
+        "            schema:",
+        "              $ref: '#/components/schemas/S0'",
+        "components:",
+        "  schemas:",
+    ]
+    for index in range(length):
+        lines += [f"    S{index}:", "      required: [ next ]", "      properties:", "        next:"]
+        if index + 1 < length:
+            lines.append(f"          $ref: '#/components/schemas/S{index + 1}'")
+        else:
+            lines.append("          type: string")
+    spec = write_spec("\n".join(lines), "chain.yml")
+
+    rules = analyze_openapi_file(spec, max_schema_depth=0)
+
+    assert len(rules) == length + 1
+    assert rules[-1].endpoint_entity == "S0" + ".next" * length
@@ -0,0 +1,76 @@
+import logging
+from pathlib import Path
+from textwrap import dedent
+
+import pytest
+
+from src.analyzers import yaml_parser
+from src.analyzers.openapi_analyzer import analyze_openapi_file
+from src.analyzers.yaml_parser import parse_yaml
+from src.csv_writer import write_rules_csv
+from src.dependency_resolver import resolve_dependencies
+from src.rule_id_manager import assign_rule_ids
+
+
+def _csv_for(spec_path, tmp_path, yaml_parser_name):
+    rules = analyze_openapi_file(spec_path, yaml_parser=yaml_parser_name)
+    assign_rule_ids(rules, "RULE-001")
+    resolve_dependencies(rules)
+    output_path = tmp_path / f"{yaml_parser_name}.csv"
+    write_rules_csv(output_path, rules)
+    return output_path.read_text()
+
+
+def test_ruamel_backend_matches_builtin_csv_on_sample(tmp_path):
+    pytest.importorskip("ruamel.yaml")
+    spec_path = Path("docs/openapi-spec - sample.yml")
+
+    assert _csv_for(spec_path, tmp_path, "ruamel") == _csv_for(spec_path, tmp_path, "builtin")
+
+
+def test_ruamel_backend_handles_flow_mappings_and_block_scalars(tmp_path):
+    pytest.importorskip("ruamel.yaml")
+    spec = dedent(
+        """
+        openapi: 3.0.0
+        paths:
+          /items:
+            post:
+              description: |
+                First line.
+                Second line.
+              requestBody: {required: true, content: {application/json: {schema: {$ref: '#/components/schemas/Item'}}}}
+        components:
+          schemas:
+            Item: {type: object, required: [id], properties: {id: {type: string}}}
+        """
+    ).lstrip()
+    spec_path = tmp_path / "flow.yml"
+    spec_path.write_text(spec)
+
+    root = parse_yaml(spec, "ruamel")
+    post = root.value["paths"].value["/items"].value["post"]
+    assert (post.value["description"].start_line, post.value["description"].end_line) == (5, 7)
+
+    rules = analyze_openapi_file(spec_path, yaml_parser="ruamel")
+    assert [rule.endpoint_entity for rule in rules] == ["Item", "Item.id"]
+    assert (rules[0].start_line, rules[0].end_line) == (8, 8)
+
+
+def test_ruamel_request_falls_back_to_builtin_when_unavailable(monkeypatch, caplog):
+    def missing_ruamel(text):
+        raise ImportError("No module named 'ruamel'")
+
+    monkeypatch.setattr(yaml_parser, "_parse_yaml_with_ruamel", missing_ruamel)
+    text = Path("docs/openapi-spec - sample.yml").read_text()
+
+    with caplog.at_level(logging.WARNING, logger="fallback_test"):
+        node = parse_yaml(text, "ruamel", logger=logging.getLogger("fallback_test"))
+
+    assert node == parse_yaml(text, "builtin")
+    assert any("falling back to the builtin YAML parser" in record.message for record in caplog.records)
+
+
+def test_unknown_yaml_parser_is_rejected():
+    with pytest.raises(ValueError):
+        parse_yaml("openapi: 3.0.0", "libfast")
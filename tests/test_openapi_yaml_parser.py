@@ -0,0 +1,192 @@
+from pathlib import Path
+
+from src.analyzers.yaml_parser import (
+    YamlNode,
+    _leading_spaces,
+    _parse_scalar,
+    _parse_yaml_with_lines,
+)
+
+
+# Reference copy of the original recursive parser, kept to pin the iterative
+# scanner to the exact same trees and line spans. List items that start with a
+# key are parsed as complete mappings in both.
+def _legacy_parse(text):
+    lines = text.splitlines()
+    node, _ = _legacy_block(lines, 0, 0)
+    return node
+
+
+def _legacy_block(lines, index, indent):
+    while index < len(lines) and not lines[index].strip():
+        index += 1
+    if index >= len(lines) or _leading_spaces(lines[index]) < indent:
+        return None, index
+    if lines[index].strip().startswith("- "):
+        return _legacy_list(lines, index, indent)
+    return _legacy_mapping(lines, index, indent)
+
+
+def _legacy_list(lines, index, indent):
+    items = []
+    while index < len(lines):
+        stripped = lines[index].strip()
+        if not stripped or stripped in {"}", "]"}:
+            index += 1
+            continue
+        current_indent = _leading_spaces(lines[index])
+        if current_indent < indent or not stripped.startswith("- "):
+            break
+        start_line = index + 1
+        content = stripped[2:]
+        if content == "":
+            child, index = _legacy_block(lines, index + 1, current_indent + 2)
+            if child:
+                child.start_line = start_line
+                items.append(child)
+            continue
+        if ":" in content:
+            # The item is a mapping whose keys align with its first key.
+            key_indent = current_indent + 2 + _leading_spaces(content)
+            lines[index] = " " * key_indent + content.strip()
+            child, index = _legacy_mapping(lines, index, key_indent)
+            items.append(child)
+            continue
+        items.append(_parse_scalar(content, start_line))
+        index += 1
+    start = items[0].start_line if items else index + 1
+    end = items[-1].end_line if items else start
+    return YamlNode(items, start, end), index
+
+
+def _legacy_mapping(lines, index, indent):
+    mapping = {}
+    start_line = index + 1
+    last_line = start_line
+    while index < len(lines):
+        stripped = lines[index].strip()
+        if not stripped or stripped in {"}", "]"}:
+            index += 1
+            continue
+        current_indent = _leading_spaces(lines[index])
+        if current_indent < indent:
+            break
+        if stripped.startswith("- ") and current_indent == indent:
+            break
+        if ":" not in stripped:
+            index += 1
+            continue
+        key, value_part = stripped.split(":", 1)
+        key = key.strip().strip("\"'")
+        line_no = index + 1
+        if value_part.strip() and value_part.strip() not in "{}":
+            value_node = _parse_scalar(value_part.strip(), line_no)
+            mapping[key] = value_node
+            last_line = value_node.end_line
+            index += 1
+        else:
+            child, index = _legacy_block(lines, index + 1, current_indent + 2)
+            if child is None:
+                child = YamlNode(None, line_no, line_no)
+            child.start_line = line_no
+            mapping[key] = child
+            last_line = child.end_line
+    end_line = last_line
+    if mapping:
+        end_line = max(node.end_line for node in mapping.values())
+    return YamlNode(mapping, start_line, end_line), index
+
+
+def _dump(node):
+    value = node.value
+    if isinstance(value, dict):
+        value = {key: _dump(child) for key, child in value.items()}
+    elif isinstance(value, list):
+        value = [_dump(item) if isinstance(item, YamlNode) else item for item in value]
+    return value, node.start_line, node.end_line
+
+
+def test_iterative_parser_matches_legacy_parser_on_sample():
+    text = Path("docs/openapi-spec - sample.yml").read_text()
+
+    assert _dump(_parse_yaml_with_lines(text)) == _dump(_legacy_parse(text))
+
+
+def test_iterative_parser_matches_legacy_parser_on_irregular_layout():
+    text = "\n".join(
+        [
+            "root:",
+            "  - plain",
+            "  - key: value",
+            "  - nested:",
+            "      inner: 1",
+            "",
+            "  -   spaced: [a, b]",
+            "other: {",
+            "  'quoted': \"x\"",
+            "}",
+            "no colon here",
+            "tail:",
+            "last: true",
+        ]
+    )
+
+    assert _dump(_parse_yaml_with_lines(text)) == _dump(_legacy_parse(text))
+
+
+def test_iterative_parser_handles_nesting_beyond_recursion_limit():
+    depth = 3000
+    text = "\n".join(f"{'  ' * level}level{level}:" for level in range(depth))
+    text += f"\n{'  ' * depth}leaf: value"
+
+    node = _parse_yaml_with_lines(text)
+
+    for level in range(depth):
+        node = node.value[f"level{level}"]
+        assert node.start_line == level + 1
+        assert node.end_line == depth + 1
+    assert node.value["leaf"].value == "value"
+
+
+def test_nodes_are_slotted_and_share_keys_and_short_scalars():
+    text = "\n".join(
+        [
+            "first:",
+            "  type: string",
+            "  description: " + "x" * 100,
+            "second:",
+            "  type: string",
+            "  description: " + "x" * 100,
+        ]
+    )
+
+    root = _parse_yaml_with_lines(text)
+    first, second = root.value["first"], root.value["second"]
+
+    assert not hasattr(first, "__dict__")
+    first_key = next(key for key in first.value if key == "type")
+    second_key = next(key for key in second.value if key == "type")
+    assert first_key is second_key
+    assert first.value["type"].value is second.value["type"].value
+    assert first.value["description"].value == second.value["description"].value
+    assert first.value["description"].value is not second.value["description"].value
+
+
+def test_list_items_starting_with_a_key_keep_all_their_keys():
+    text = "\n".join(
+        [
+            "parameters:",
+            "  - name: limit",
+            "    in: query",
+            "    schema:",
+            "      type: integer",
+            "  - name: offset",
+            "    in: query",
+        ]
+    )
+
+    items = _parse_yaml_with_lines(text).value["parameters"].value
+
+    assert [sorted(item.value) for item in items] == [["in", "name", "schema"], ["in", "name"]]
+    assert [(item.start_line, item.end_line) for item in items] == [(2, 5), (6, 7)]
+    assert items[0].value["schema"].value["type"].value == "integer"
@@ -26,12 +26,15 @@ def test_pyproject_has_minimum_metadata():
 
 
 def test_pyproject_dependencies_include_required_runtime_packages():
-    """Verify runtime dependencies include the YAML and dotenv libraries mandated by the SDD."""
+    """Verify runtime dependencies include dotenv and the ruamel backend is an optional extra."""
     project = _load_pyproject().get("project", {})
     dependencies = [dependency.lower() for dependency in project.get("dependencies", [])]
+    ruamel_extra = [dependency.lower() for dependency in project["optional-dependencies"]["ruamel"]]
 
-    assert any(dep.startswith("ruamel.yaml") for dep in dependencies)
     assert any(dep.startswith("python-dotenv") for dep in dependencies)
+    assert not any(dep.startswith("ruamel") for dep in dependencies)
+    assert any(dep.startswith("ruamel.yaml.clib") for dep in ruamel_extra)
+    assert any(dep.startswith("ruamel.yaml") and "clib" not in dep for dep in ruamel_extra)
 
 
 def test_console_script_entrypoint_exposes_cli():
@@ -0,0 +1,83 @@
+import pytest
+
+from src.models import SourceType
+from src.orchestrator import detect_source_type
+from src.source_files import SourceBuffer, TextLines, _LineIndex
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "",
+        "single line",
+        "first\nsecond\n",
+        "first\r\nsecond\r\n\r\nlast",
+        "\n\ntrailing blank\n\n",
+        "unicode: café ✓\n",
+    ],
+)
+def test_source_buffer_lines_match_splitlines(tmp_path, content):
+    path = tmp_path / "input.txt"
+    path.write_bytes(content.encode("utf-8"))
+
+    with SourceBuffer(path) as buffer:
+        assert len(buffer) == len(content.splitlines())
+        assert list(buffer) == content.splitlines()
+        assert buffer[1:3] == content.splitlines()[1:3]
+        if content:
+            assert buffer[-1] == content.splitlines()[-1]
+
+
+@pytest.mark.parametrize(
+    "content",
+    ["", "first\nsecond\n", "first\r\nsecond\r\n\r\nlast", "\n\ntrailing blank\n\n"],
+)
+def test_text_lines_and_spans_match_splitlines(content):
+    lines = TextLines(content)
+    expected = content.splitlines()
+
+    assert list(lines) == expected
+    span = lines.span(1, 3)
+    assert list(span) == expected[1:3]
+    assert len(span) == len(expected[1:3])
+    if len(expected) > 2:
+        assert (span[0], span[-1], span[1:]) == (expected[1], expected[2], expected[2:3])
+    assert list(lines.span(len(expected) - 1, len(expected) + 5)) == expected[-1:]
+
+
+def test_detection_reads_the_shared_buffer(tmp_path, monkeypatch):
+    path = tmp_path / "spec.txt"
+    path.write_text("OpenAPI: 3.0.0\npaths: {}\n")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("input must not be read as text")
+
+    monkeypatch.setattr("pathlib.Path.read_text", fail)
+
+    assert detect_source_type(path) is SourceType.OPENAPI
+
+
+def test_detection_matches_package_prefix_case_insensitively(tmp_path):
+    path = tmp_path / "Main"
+    path.write_text("PACKAGE com.example\n\nclass Main\n")
+
+    assert detect_source_type(path) is SourceType.KOTLIN
+
+
+def test_find_lines_matches_raw_bytes_within_range(tmp_path):
+    path = tmp_path / "spec.yml"
+    path.write_text("paths:\n  /a:\n    get: {}\n  /b:\ncomponents:\n")
+
+    with SourceBuffer(path) as buffer:
+        assert buffer.find_lines(rb"^ {0,2}[^ \r\n]") == [0, 1, 3, 4]
+        assert buffer.find_lines(rb"^  /", 2, 4) == [3]
+        assert buffer.find_lines(rb"^", 4, 4) == []
+
+
+def test_line_index_subclass_must_provide_content_and_decode():
+    class Incomplete(_LineIndex):
+        def _content(self) -> str:
+            return ""
+
+    with pytest.raises(TypeError):
+        Incomplete()